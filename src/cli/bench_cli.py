@@ -0,0 +1,685 @@
+from timeit import Timer
+from typing import Callable, Optional
+import click
+
+
+def _scan_get_country(q: str):
+    """The pre-index `get_country` linear scan, kept as a benchmark baseline."""
+    from pycountry import countries
+
+    from pfman.utils.geo import Country
+    from pfman.utils.string import is_int
+
+    country = next(
+        (
+            country
+            for country in countries
+            if any(
+                [
+                    q.lower() == country.name.lower(),  # type: ignore
+                    (
+                        hasattr(country, "official_name")
+                        and country.official_name  # type: ignore
+                        and q.lower() == country.official_name.lower()  # type: ignore
+                    ),
+                    q.lower() == country.alpha_2.lower(),  # type: ignore
+                    q.lower() == country.alpha_3.lower(),  # type: ignore
+                    is_int(q) and q == country.numeric,  # type: ignore
+                ]
+            )
+        ),
+        None,
+    )
+
+    if not country:
+        return None
+
+    return Country(**dict(country))  # type: ignore
+
+
+COUNTRY_QUERIES = [
+    "US",
+    "USA",
+    "United States",
+    "united states of america",
+    "GB",
+    "GBR",
+    "United Kingdom",
+    "UK",
+    "de",
+    "France",
+    "840",
+    "Zimbabwe",
+    "Atlantis",
+]
+
+
+STREET_NAMES = [
+    "Main",
+    "Park",
+    "Pennsylvania",
+    "Downing",
+    "Martin Luther King Jr",
+    "Old Mill",
+    "Mt Pleasant",
+    "St Andrews",
+    "Lake Shore",
+    "Ft Washington",
+]
+
+STREET_SUFFIXES = ["St", "Ave", "Blvd", "Rd", "Dr", "Ln", "Ct", "Pkwy", "Street", ""]
+
+STREET_DIRECTIONALS = ["", "N", "S", "E", "W", "NW", "SE"]
+
+
+def _street_corpus() -> list[str]:
+    """A deterministic corpus of US-style street names with common abbreviations."""
+    return [
+        " ".join(part for part in (directional, name, suffix) if part)
+        for name in STREET_NAMES
+        for suffix in STREET_SUFFIXES
+        for directional in STREET_DIRECTIONALS
+    ]
+
+
+CITIES = [
+    ("Springfield", "IL", "USA"),
+    ("New York", "NY", "US"),
+    ("Washington", "DC", "United States"),
+    ("Westminster", "England", "UK"),
+    ("Chicago", "Illinois", "USA"),
+    ("Austin", "TX", "US"),
+    ("Toronto", "ON", "Canada"),
+    ("Paris", "75", "France"),
+]
+
+
+def _address_rows(count: int, seed: int = 0) -> list[dict[str, str]]:
+    """Synthetic mapped CSV rows with the value repetition of a real portfolio."""
+    import random
+
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        city, state, country = rng.choice(CITIES)
+        rows.append(
+            {
+                "address_line": f"{rng.randint(1, 2000)} {rng.choice(STREET_NAMES)} {rng.choice(STREET_SUFFIXES)}".strip(),
+                "city": city,
+                "state": state,
+                "country": country,
+                "postal_code": f"{rng.randint(10000, 99999)}",
+                "latitude": f"{rng.uniform(-60, 60):.6f}",
+                "longitude": f"{rng.uniform(-170, 170):.6f}",
+            }
+        )
+    return rows
+
+
+def _time(fn: Callable[[], object], number: int, repeat: int) -> float:
+    """Returns the best per-call time in microseconds."""
+    timer = Timer(fn)
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def _report(label: str, per_call_us: float, baseline_us: Optional[float] = None):
+    line = f"{label:<40} {per_call_us:>12.2f} us/call"
+    if baseline_us:
+        line += f"  ({baseline_us / per_call_us:.1f}x)"
+    click.echo(line)
+
+
+@click.group()
+def cli():
+    """Micro-benchmarks for hot paths in address validation."""
+    pass
+
+
+@cli.command("country")
+@click.option("--number", default=200, help="Calls per timing run.")
+@click.option("--repeat", default=5, help="Number of timing runs.")
+def bench_country(number: int, repeat: int):
+    """
+    Compare the indexed `get_country` against the previous linear scan.
+
+    Parameters:
+    number (int): Calls per timing run.
+    repeat (int): Number of timing runs, the best run is reported.
+
+    Returns:
+    None: Prints the per-call time of each implementation.
+    """
+    from pfman.utils.geo import get_country
+
+    memoized_get_country = get_country
+    get_country = get_country.__wrapped__  # type: ignore
+
+    for q in COUNTRY_QUERIES:
+        scanned = _scan_get_country(q)
+        indexed = get_country(q=q)
+        if (scanned and scanned.alpha_2) != (indexed and indexed.alpha_2):
+            raise click.ClickException(f"Result mismatch for {q!r}")
+
+    # Warm the index so its one-off build cost is not attributed to a lookup.
+    get_country(q="US")
+
+    def run_scan():
+        for q in COUNTRY_QUERIES:
+            _scan_get_country(q)
+
+    def run_indexed():
+        for q in COUNTRY_QUERIES:
+            get_country(q=q)
+
+    calls = len(COUNTRY_QUERIES)
+    baseline = _time(run_scan, number, repeat) / calls
+    _report("get_country (linear scan)", baseline)
+    _report("get_country (index)", _time(run_indexed, number, repeat) / calls, baseline)
+
+    def run_memoized():
+        for q in COUNTRY_QUERIES:
+            memoized_get_country(q=q)
+
+    _report("get_country (memoized)", _time(run_memoized, number, repeat) / calls, baseline)
+
+
+@cli.command("street")
+@click.option("--number", default=20, help="Passes over the corpus per timing run.")
+@click.option("--repeat", default=5, help="Number of timing runs.")
+def bench_street(number: int, repeat: int):
+    """
+    Compare the single-scan `normalize_street_name` against applying one
+    substitution per street abbreviation.
+
+    Parameters:
+    number (int): Passes over the corpus per timing run.
+    repeat (int): Number of timing runs, the best run is reported.
+
+    Returns:
+    None: Prints the per-street time of each implementation.
+    """
+    import re
+
+    from pfman.utils.geocoding import (
+        STREET_ABBREVIATIONS,
+        normalize,
+        normalize_street_name,
+    )
+
+    memoized_street_name = normalize_street_name
+    normalize_street_name = normalize_street_name.__wrapped__  # type: ignore
+
+    patterns = {
+        re.compile(rf"\b{abbreviation}\b"): expansion
+        for abbreviation, expansion in STREET_ABBREVIATIONS.items()
+    }
+
+    def sequential_street_name(name: str) -> str:
+        normalized = normalize(name)
+        for pattern, replacement in patterns.items():
+            normalized = pattern.sub(replacement, normalized)
+        return normalized.strip()
+
+    corpus = _street_corpus()
+    for street in corpus:
+        if sequential_street_name(street) != normalize_street_name(street):
+            raise click.ClickException(f"Result mismatch for {street!r}")
+
+    def run_sequential():
+        for street in corpus:
+            sequential_street_name(street)
+
+    def run_single_scan():
+        for street in corpus:
+            normalize_street_name(street)
+
+    calls = len(corpus)
+    click.echo(f"{calls} streets")
+    baseline = _time(run_sequential, number, repeat) / calls
+    _report("normalize_street_name (per-pattern)", baseline)
+    _report(
+        "normalize_street_name (single scan)",
+        _time(run_single_scan, number, repeat) / calls,
+        baseline,
+    )
+
+    def run_memoized():
+        for street in corpus:
+            memoized_street_name(street)
+
+    _report(
+        "normalize_street_name (memoized)",
+        _time(run_memoized, number, repeat) / calls,
+        baseline,
+    )
+
+
+@cli.command("batch")
+@click.option("--rows", default=100_000, help="Number of rows to validate.")
+def bench_batch(rows: int):
+    """
+    Compare validating rows one `Address` at a time against `AddressBatch`.
+
+    Parameters:
+    rows (int): Number of synthetic rows to validate.
+
+    Returns:
+    None: Prints the throughput of each approach in rows per second.
+    """
+    from time import perf_counter
+
+    from pfman.models import Address, AddressBatch
+
+    data = _address_rows(rows)
+
+    start = perf_counter()
+    addresses = [Address(**row) for row in data]
+    per_row = perf_counter() - start
+
+    start = perf_counter()
+    batch = AddressBatch.from_rows(data)
+    columnar = perf_counter() - start
+
+    for row in range(0, rows, max(rows // 1000, 1)):
+        if batch.address(row).model_dump() != addresses[row].model_dump():
+            raise click.ClickException(f"Result mismatch for row {row}")
+
+    click.echo(f"Address per row   {rows / per_row:>12,.0f} rows/s")
+    click.echo(
+        f"AddressBatch      {rows / columnar:>12,.0f} rows/s  ({per_row / columnar:.1f}x)"
+    )
+
+
+@cli.command("h3")
+@click.option("--rows", default=100_000, help="Number of coordinates to index.")
+def bench_h3(rows: int):
+    """
+    Compare per-row string H3 indexing at each resolution against the batch
+    integer indexer.
+
+    Parameters:
+    rows (int): Number of random coordinates to index.
+
+    Returns:
+    None: Prints the throughput of each approach in rows per second.
+    """
+    import random
+    from time import perf_counter
+
+    import h3
+
+    from pfman.utils.spatial import DEFAULT_H3_RESOLUTIONS, latlng_to_cells
+
+    rng = random.Random(0)
+    latitudes = [rng.uniform(-60, 60) for _ in range(rows)]
+    longitudes = [rng.uniform(-170, 170) for _ in range(rows)]
+
+    start = perf_counter()
+    for resolution in DEFAULT_H3_RESOLUTIONS:
+        [
+            h3.latlng_to_cell(latitude, longitude, resolution)
+            for latitude, longitude in zip(latitudes, longitudes)
+        ]
+    per_row = perf_counter() - start
+
+    start = perf_counter()
+    latlng_to_cells(latitudes, longitudes, DEFAULT_H3_RESOLUTIONS)
+    batched = perf_counter() - start
+
+    click.echo(f"resolutions {DEFAULT_H3_RESOLUTIONS}")
+    click.echo(f"per row, string cells   {rows / per_row:>12,.0f} rows/s")
+    click.echo(
+        f"batch, integer cells    {rows / batched:>12,.0f} rows/s  ({per_row / batched:.1f}x)"
+    )
+
+
+@cli.command("subset")
+@click.option("--rows", default=2_000, help="Number of addresses to project.")
+def bench_subset(rows: int):
+    """
+    Compare `Address.pick_subset` against re-validating each projection
+    through the `Address` constructor, for every level of the geographic
+    hierarchy.
+
+    Parameters:
+    rows (int): Number of synthetic addresses to project.
+
+    Returns:
+    None: Prints the cost per projection of each approach.
+    """
+    from time import perf_counter
+
+    from pfman.models import Address
+    from pfman.models import GeocodingAttributes as attributes
+
+    levels = [
+        attributes.COUNTRY_ATTRIBUTES,
+        attributes.STATE_ATTRIBUTES,
+        attributes.COUNTY_ATTRIBUTES,
+        attributes.CITY_ATTRIBUTES,
+        attributes.NEIGHBORHOOD_ATTRIBUTES,
+        attributes.STREET_ATTRIBUTES,
+        attributes.PROPERTY_ATTRIBUTES,
+        attributes.UNIT_ATTRIBUTES,
+    ]
+    addresses = [Address(**row) for row in _address_rows(rows)]
+
+    def revalidated(address: Address, attrs) -> Address:
+        return Address(
+            **{
+                attr: getattr(address, attr)
+                for attr in attrs
+                if getattr(address, attr) is not None
+            }
+        )
+
+    for address in addresses[:200]:
+        for attrs in levels:
+            if (
+                address.pick_subset(attrs).model_dump()
+                != revalidated(address, attrs).model_dump()
+            ):
+                raise click.ClickException(f"Result mismatch for {attrs}")
+
+    projections = rows * len(levels)
+
+    start = perf_counter()
+    for address in addresses:
+        for attrs in levels:
+            revalidated(address, attrs)
+    baseline = (perf_counter() - start) / projections * 1e6
+
+    start = perf_counter()
+    for address in addresses:
+        for attrs in levels:
+            address.pick_subset(attrs)
+    trusted = (perf_counter() - start) / projections * 1e6
+
+    _report("pick_subset (re-validated)", baseline)
+    _report("pick_subset (trusted)", trusted, baseline)
+
+
+@cli.command("duplicates")
+@click.option("--rows", default=500_000, help="Number of rows to deduplicate.")
+@click.option("--duplicates", default=0.1, help="Fraction of rows that repeat an earlier property.")
+def bench_duplicates(rows: int, duplicates: float):
+    """
+    Time blocking-based duplicate detection on a synthetic portfolio in which
+    a fraction of the rows repeat an earlier property with a different
+    spelling of its street and slightly moved coordinates.
+
+    Parameters:
+    rows (int): Number of synthetic rows.
+    duplicates (float): Fraction of rows that repeat an earlier property.
+
+    Returns:
+    None: Prints the validation and detection times and the clusters found.
+    """
+    import random
+    from time import perf_counter
+
+    from pfman.models import AddressBatch
+
+    rng = random.Random(1)
+    data = _address_rows(rows)
+    for row in range(1, rows):
+        if rng.random() < duplicates:
+            original = data[rng.randrange(row)]
+            data[row] = {
+                **original,
+                "address_line": original["address_line"].replace("Street", "St"),
+                "latitude": f"{float(original['latitude']) + 0.000001:.6f}",
+            }
+
+    start = perf_counter()
+    batch = AddressBatch.from_rows(data)
+    validated = perf_counter() - start
+
+    start = perf_counter()
+    clusters = batch.duplicates()
+    detected = perf_counter() - start
+
+    click.echo(f"validation   {validated:>8.2f} s")
+    click.echo(f"detection    {detected:>8.2f} s  ({rows / detected:,.0f} rows/s)")
+    click.echo(
+        f"{len(clusters):,} clusters covering {sum(map(len, clusters)):,} rows"
+    )
+
+
+@cli.command("parallel")
+@click.option("--rows", default=500_000, help="Number of rows to validate.")
+@click.option("--workers", default=4, help="Number of validation worker processes.")
+def bench_parallel(rows: int, workers: int):
+    """
+    Compare validating rows in-process against sharding them across warm
+    worker processes with `ParallelRowValidationCache`.
+
+    Parameters:
+    rows (int): Number of synthetic rows to validate.
+    workers (int): Number of worker processes.
+
+    Returns:
+    None: Prints the throughput of each approach in rows per second.
+    """
+    from time import perf_counter
+
+    from pfman.models import RowValidationCache
+    from pfman.validation import ParallelRowValidationCache
+
+    data = _address_rows(rows)
+
+    start = perf_counter()
+    sequential = RowValidationCache(0).validate(data)
+    in_process = perf_counter() - start
+
+    cache = ParallelRowValidationCache(0)
+    start = perf_counter()
+    cache.start(workers)
+    startup = perf_counter() - start
+    try:
+        start = perf_counter()
+        parallel = cache.validate(data)
+        sharded = perf_counter() - start
+    finally:
+        cache.stop()
+
+    if parallel.errors != sequential.errors or any(
+        (a.model_dump() if a else None) != (b.model_dump() if b else None)
+        for a, b in zip(parallel.addresses[::997], sequential.addresses[::997])
+    ):
+        raise click.ClickException("Parallel validation differs from in-process validation")
+
+    click.echo(f"in-process        {rows / in_process:>12,.0f} rows/s")
+    click.echo(
+        f"{workers} workers         {rows / sharded:>12,.0f} rows/s  ({in_process / sharded:.1f}x, "
+        f"{startup:.1f}s startup)"
+    )
+
+
+@cli.command("profile")
+@click.option("--rows", default=1_000_000, help="Number of CSV rows to profile.")
+@click.option("--sample-size", default=10_000, help="Rows in the reservoir sample.")
+def bench_profile(rows: int, sample_size: int):
+    """
+    Time profiling the columns of a synthetic CSV file streamed in 64 KiB
+    chunks, over every row and over a reservoir sample.
+
+    Parameters:
+    rows (int): Number of synthetic CSV rows.
+    sample_size (int): Number of rows whose value kinds are profiled when sampling.
+
+    Returns:
+    None: Prints the throughput of each run in rows per second.
+    """
+    import csv
+    import io
+    from time import perf_counter
+
+    from pfman.mapping import ColumnProfiler
+    from pfman.utils.csv_stream import CsvStreamDecoder
+
+    data = _address_rows(min(rows, 100_000))
+    text = io.StringIO()
+    writer = csv.DictWriter(text, fieldnames=[*data[0], "unit"])
+    writer.writeheader()
+    for row in range(rows):
+        writer.writerow({**data[row % len(data)], "unit": str(row) if row % 10 == 0 else ""})
+    content = text.getvalue().encode()
+
+    for label, size in [("every row", 0), (f"sample of {sample_size:,}", sample_size)]:
+        start = perf_counter()
+        decoder = CsvStreamDecoder()
+        profiler = ColumnProfiler(sample_size=size, seed=0)
+        for offset in range(0, len(content), 1 << 16):
+            profiler.add(decoder.feed(content[offset : offset + (1 << 16)]))
+        profiler.add(decoder.close())
+        profile = profiler.finish()
+        elapsed = perf_counter() - start
+        click.echo(f"{label:<20} {elapsed:>8.2f} s  ({profile.rows / elapsed:>10,.0f} rows/s)")
+
+    for column in profile.columns:
+        click.echo(
+            f"  {column.name:<14} null {column.null_rate:>6.1%}  distinct ~{column.distinct:>9,}  "
+            f"{', '.join(column.hints)}"
+        )
+
+
+@cli.command("gazetteer")
+@click.option("--entries", default=200_000, help="Number of synthetic gazetteer cities.")
+@click.option("--rows", default=100_000, help="Number of addresses to geocode.")
+def bench_gazetteer(entries: int, rows: int):
+    """
+    Time loading a synthetic gazetteer, geocoding addresses without
+    coordinates through it and reverse geocoding points.
+
+    Parameters:
+    entries (int): Number of synthetic cities in the gazetteer.
+    rows (int): Number of addresses to geocode and points to reverse geocode.
+
+    Returns:
+    None: Prints the load time and the throughput of each lookup.
+    """
+    import random
+    from time import perf_counter
+
+    from pfman.geocoders import BatchGeocoder, Gazetteer, GazetteerProvider
+    from pfman.models import AddressBatch
+
+    rng = random.Random(0)
+    cities = [
+        {
+            "country_code": "US",
+            "state": rng.choice(["IL", "NY", "CA", "GA", "PA", "TX"]),
+            "city": f"Town {index}",
+            "postal_code": "",
+            "latitude": f"{rng.uniform(25, 49):.4f}",
+            "longitude": f"{rng.uniform(-124, -67):.4f}",
+        }
+        for index in range(entries)
+    ]
+
+    start = perf_counter()
+    gazetteer = Gazetteer(cities)
+    loaded = perf_counter() - start
+
+    addresses = list(
+        AddressBatch.from_rows(
+            {
+                "address_line": f"{index} Main St",
+                "city": cities[index % entries]["city"],
+                "state": cities[index % entries]["state"],
+                "country_code": "US",
+            }
+            for index in range(rows)
+        ).addresses()
+    )
+    geocoder = BatchGeocoder(GazetteerProvider(gazetteer))
+    start = perf_counter()
+    _, geocoded = geocoder.fill_coordinates(addresses)
+    forward = perf_counter() - start
+    geocoder.stop()
+
+    points = [(rng.uniform(25, 49), rng.uniform(-124, -67)) for _ in range(rows)]
+    start = perf_counter()
+    found = sum(gazetteer.reverse(latitude, longitude) is not None for latitude, longitude in points)
+    reverse = perf_counter() - start
+
+    click.echo(f"load         {loaded:>8.2f} s  ({entries / loaded:,.0f} entries/s)")
+    click.echo(f"geocode      {forward:>8.2f} s  ({rows / forward:,.0f} rows/s, {geocoded:,} geocoded)")
+    click.echo(f"reverse      {reverse:>8.2f} s  ({rows / reverse:,.0f} points/s, {found:,} found)")
+
+
+@cli.command("geocode")
+@click.option("--rows", default=100_000, help="Number of addresses to geocode.")
+@click.option("--distinct", default=20_000, help="Number of distinct addresses among them.")
+@click.option("--latency", default=0.05, help="Seconds the fake provider takes per batch.")
+@click.option("--batch-size", default=100, help="Addresses per provider request.")
+@click.option("--concurrency", default=8, help="Provider requests sent at a time.")
+@click.option("--failure-rate", default=0.05, help="Share of provider requests that fail.")
+def bench_geocode(
+    rows: int,
+    distinct: int,
+    latency: float,
+    batch_size: int,
+    concurrency: int,
+    failure_rate: float,
+):
+    """
+    Time geocoding addresses through the fake provider, first with a cold cache
+    and then with the results of the first run cached.
+
+    Parameters:
+    rows (int): Number of addresses to geocode.
+    distinct (int): Number of distinct addresses among them.
+    latency (float): Seconds the fake provider takes per batch.
+    batch_size (int): Addresses per provider request.
+    concurrency (int): Provider requests sent at a time.
+    failure_rate (float): Share of provider requests that fail and are retried.
+
+    Returns:
+    None: Prints the throughput and request counts of each run.
+    """
+    from time import perf_counter
+
+    from pfman.geocoders import BatchGeocoder, FakeGeocodingProvider, InProcessGeocodeCache
+    from pfman.models import AddressBatch
+
+    addresses = list(
+        AddressBatch.from_rows(
+            {
+                "address_line": f"{index % distinct} Main St",
+                "city": f"Town {index % distinct % 500}",
+                "postal_code": f"{10000 + index % distinct % 500}",
+                "country_code": "US",
+            }
+            for index in range(rows)
+        ).addresses()
+    )
+    provider = FakeGeocodingProvider(
+        latency=latency, batch_size=batch_size, failure_rate=failure_rate, seed=0
+    )
+    geocoder = BatchGeocoder(
+        provider, cache=InProcessGeocodeCache(), concurrency=concurrency, backoff=0.01
+    )
+
+    for run in ("cold", "warm"):
+        calls = provider.calls
+        start = perf_counter()
+        results = geocoder.geocode(addresses)
+        elapsed = perf_counter() - start
+        found = sum(result is not None for result in results)
+        click.echo(
+            f"{run:<6} {elapsed:>8.2f} s  ({rows / elapsed:,.0f} rows/s, {found:,} geocoded, "
+            f"{provider.calls - calls:,} requests)"
+        )
+    geocoder.stop()
+
+    stats = geocoder.stats
+    click.echo(
+        f"{stats.batches:,} batches, {stats.retries:,} retries, {stats.failed:,} failed, "
+        f"hit rate {stats.hit_rate:.2%}"
+    )
+
+
+if __name__ == "__main__":
+    cli()
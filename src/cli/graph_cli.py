@@ -113,5 +113,61 @@ def reset(connection_string: Optional[str]):
 
     click.echo("Database reset successfully.")
 
+
+@cli.command("load-test")
+@click.option("--rows", default=10_000, help="Number of synthetic properties to write.")
+@click.option(
+    "--batch-size",
+    "batch_sizes",
+    multiple=True,
+    type=int,
+    default=[250, 1000, 5000],
+    help="Batch size to measure, can be repeated.",
+)
+@click.option("--connection-string", help="Neo4j connection string.")
+def load_test(rows: int, batch_sizes: tuple[int, ...], connection_string: Optional[str]):
+    """
+    Write a synthetic portfolio with each batch size and report the throughput, to tune GRAPH_BATCH_SIZE.
+
+    Parameters:
+    rows (int): Number of synthetic properties to write.
+    batch_sizes (tuple[int, ...]): The batch sizes to measure.
+    connection_string (str): Neo4j connection string. If not provided, it will use the one from the configuration.
+
+    Returns:
+    None: This function does not return anything. It prints the throughput of each batch size. The test portfolios are deleted afterwards.
+    """
+    from uuid import uuid4
+
+    from cli.bench_cli import _address_rows
+    from pfman.Env import config
+    from pfman.graph.Writer import GraphWriter
+    from pfman.models import RowValidationCache
+
+    driver = get_driver(connection_string or config.NEO4J_CONNECTION_STRING)
+    addresses = RowValidationCache(0).validate(_address_rows(rows)).addresses
+
+    for batch_size in batch_sizes:
+        writer = GraphWriter(driver, batch_size=batch_size)
+        portfolio_id = f"load-test-{uuid4().hex}"
+        writer.portfolio_writer(portfolio_id, "Load test", None)(range(rows), addresses)
+
+        stats = writer.stats
+        click.echo(
+            f"batch size {batch_size:>6}  {stats.nodes_per_second:>10,.0f} nodes/s  "
+            f"({stats.nodes} nodes, {stats.batches} batches, {stats.retries} retries)"
+        )
+
+        with driver.session() as session:
+            session.run(
+                "MATCH (portfolio:Portfolio {portfolio_id: $portfolio_id}) "
+                "OPTIONAL MATCH (portfolio)-[:INCLUDES]->(property:Property) "
+                "DETACH DELETE portfolio, property",
+                portfolio_id=portfolio_id,
+            ).consume()
+
+    driver.close()
+
+
 if __name__ == "__main__":
     cli()
\ No newline at end of file
@@ -0,0 +1,125 @@
+import click
+
+
+@click.group()
+def cli():
+    """Command line interface for background import jobs."""
+    pass
+
+
+@cli.command("worker")
+@click.option("--threads", default=1, help="Number of jobs run concurrently.")
+def worker(threads: int):
+    """
+    Run import jobs queued in Redis until interrupted.
+
+    Parameters:
+    threads (int): Number of worker threads, each running one job at a time.
+
+    Returns:
+    None: This function does not return anything. It runs until interrupted.
+    """
+    from threading import Event
+
+    from redis import Redis
+
+    from pfman.Env import config
+    from pfman.geocoders import (
+        BatchGeocoder,
+        FakeGeocodingProvider,
+        Gazetteer,
+        GazetteerProvider,
+        InProcessGeocodeCache,
+        RedisGeocodeCache,
+    )
+    from pfman.graph.Writer import GraphWriter
+    from pfman.jobs import RedisJobQueue
+    from pfman.jobs.CacheInvalidation import PORTFOLIO_CACHE_PREFIX, invalidating_writer
+    from pfman.utils.cache import configure_caches
+    from pfman.utils.neo4j import get_driver
+    from pfman.utils.redis_cache import CacheInvalidator
+    from pfman.validation import ParallelRowValidationCache
+
+    configure_caches(config.NORMALIZATION_CACHE_SIZE)
+    cache = ParallelRowValidationCache(
+        config.ROW_VALIDATION_CACHE_SIZE,
+        min_rows=config.PARALLEL_VALIDATION_MIN_ROWS,
+        normalization_cache_size=config.NORMALIZATION_CACHE_SIZE,
+    )
+    cache.start(config.VALIDATION_WORKERS)
+
+    driver = get_driver(config.NEO4J_CONNECTION_STRING, **config.neo4j_driver_config())
+    writer = GraphWriter(
+        driver,
+        batch_size=config.GRAPH_BATCH_SIZE,
+        max_retries=config.GRAPH_WRITE_RETRIES,
+    )
+    portfolio_writer = writer.portfolio_writer
+    if config.PORTFOLIO_CACHE_TTL > 0:
+        # Bumps the versions of the portfolio reads cached by the API processes
+        portfolio_writer = invalidating_writer(
+            portfolio_writer,
+            CacheInvalidator(
+                Redis.from_url(config.REDIS_URL, password=config.REDIS_PASSWORD),
+                PORTFOLIO_CACHE_PREFIX,
+            ),
+        )
+
+    geocoder = None
+    if config.GEOCODING_PROVIDER == "gazetteer":
+        geocoder = BatchGeocoder(
+            GazetteerProvider(Gazetteer.from_csv(config.GAZETTEER_PATH)),
+            concurrency=config.GEOCODING_CONCURRENCY,
+            max_retries=config.GEOCODING_RETRIES,
+        )
+    elif config.GEOCODING_PROVIDER == "fake":
+        geocoder = BatchGeocoder(
+            FakeGeocodingProvider(),
+            cache=(
+                InProcessGeocodeCache()
+                if config.GEOCODING_CACHE_BACKEND == "memory"
+                else RedisGeocodeCache(
+                    Redis.from_url(config.REDIS_URL, password=config.REDIS_PASSWORD),
+                    ttl=config.GEOCODING_CACHE_TTL,
+                )
+            ),
+            concurrency=config.GEOCODING_CONCURRENCY,
+            max_retries=config.GEOCODING_RETRIES,
+        )
+
+    queue = RedisJobQueue(
+        Redis.from_url(config.REDIS_URL, password=config.REDIS_PASSWORD),
+        cache=cache,
+        writer=portfolio_writer,
+        chunk_size=config.IMPORT_CHUNK_SIZE,
+        max_errors=config.IMPORT_MAX_ERRORS,
+        ttl=config.IMPORT_JOB_TTL,
+        stale_after=config.IMPORT_JOB_STALE_AFTER,
+        geocoder=geocoder,
+    )
+
+    click.echo(f"Running {threads} import job workers, press Ctrl+C to stop...")
+
+    if threads <= 1:
+        try:
+            queue.work(Event())
+        except KeyboardInterrupt:
+            pass
+    else:
+        queue.start(threads)
+        try:
+            Event().wait()
+        except KeyboardInterrupt:
+            queue.stop()
+
+    cache.stop()
+    if geocoder:
+        geocoder.stop()
+    driver.close()
+    click.echo(
+        f"Workers stopped, wrote {writer.stats.nodes} nodes at {writer.stats.nodes_per_second:,.0f} nodes/s."
+    )
+
+
+if __name__ == "__main__":
+    cli()
@@ -89,11 +89,100 @@ class Env:
         self.NEO4J_USERNAME = Env.get("NEO4J_USERNAME", "neo4j")
         self.NEO4J_PASSWORD = Env.get("NEO4J_PASSWORD")
         self.NEO4J_CONNECTION_STRING = Env.get("NEO4J_CONNECTION_STRING")
+        # Connection pool of the process-wide Neo4j drivers
+        self.NEO4J_POOL_SIZE = int(Env.get("NEO4J_POOL_SIZE", "100"))
+        # Seconds to wait for a pooled connection before failing
+        self.NEO4J_ACQUISITION_TIMEOUT = float(Env.get("NEO4J_ACQUISITION_TIMEOUT", "60"))
+        # Seconds after which pooled connections are closed and replaced
+        self.NEO4J_CONNECTION_LIFETIME = float(Env.get("NEO4J_CONNECTION_LIFETIME", "3600"))
+        # Seconds the app waits at startup for Neo4j to be reachable
+        self.NEO4J_STARTUP_TIMEOUT = float(Env.get("NEO4J_STARTUP_TIMEOUT", "30"))
+
         self.REDIS_URL = Env.get("REDIS_URL")
         self.REDIS_PASSWORD = Env.get("REDIS_PASSWORD")
         self.SESSION_SECRET = Env.get("SESSION_SECRET")
         self.SITE_URL = Env.get("SITE_URL")
 
+        # Per-function size of the normalization and country/state lookup caches
+        self.NORMALIZATION_CACHE_SIZE = int(Env.get("NORMALIZATION_CACHE_SIZE", "10000"))
+        # Number of distinct raw import rows whose validation outcome is cached
+        self.ROW_VALIDATION_CACHE_SIZE = int(Env.get("ROW_VALIDATION_CACHE_SIZE", "100000"))
+        # Worker processes validating large inputs in parallel, started by every API
+        # and jobs worker process. Defaults to 0, validating in-process.
+        self.VALIDATION_WORKERS = int(Env.get("VALIDATION_WORKERS", "0"))
+        # Inputs with fewer rows are validated in-process even with workers
+        self.PARALLEL_VALIDATION_MIN_ROWS = int(
+            Env.get("PARALLEL_VALIDATION_MIN_ROWS", "2000")
+        )
+        # Number of distinct CSV header sets whose column mapping suggestion is cached
+        self.MAPPING_CACHE_SIZE = int(Env.get("MAPPING_CACHE_SIZE", "1000"))
+        # Number of sample rows whose values are used to suggest a column mapping
+        self.MAPPING_SAMPLE_ROWS = int(Env.get("MAPPING_SAMPLE_ROWS", "200"))
+        # Rows of an uploaded CSV whose value kinds are profiled, 0 to profile every row
+        self.PROFILE_SAMPLE_SIZE = int(Env.get("PROFILE_SAMPLE_SIZE", "10000"))
+        # CSV gazetteer of city and postal code centroids, used by the gazetteer
+        # geocoding provider
+        self.GAZETTEER_PATH = Env.get("GAZETTEER_PATH", "")
+        # Geocoder of imported rows without coordinates: "gazetteer", "fake" for
+        # tests and benchmarks, or "none"
+        self.GEOCODING_PROVIDER: Literal["gazetteer", "fake", "none"] = Env.get(
+            "GEOCODING_PROVIDER", "gazetteer" if self.GAZETTEER_PATH else "none"
+        )  # type: ignore
+        # Geocoding requests sent at a time
+        self.GEOCODING_CONCURRENCY = int(Env.get("GEOCODING_CONCURRENCY", "8"))
+        # Times a failed geocoding request is retried
+        self.GEOCODING_RETRIES = int(Env.get("GEOCODING_RETRIES", "3"))
+        # Where geocoding results are cached: "redis", or "memory" for tests
+        self.GEOCODING_CACHE_BACKEND: Literal["redis", "memory"] = Env.get(
+            "GEOCODING_CACHE_BACKEND", "memory" if self.TEST else "redis"
+        )  # type: ignore
+        # Seconds geocoding results are cached in Redis
+        self.GEOCODING_CACHE_TTL = int(Env.get("GEOCODING_CACHE_TTL", str(30 * 24 * 3600)))
+        # Number of CSV rows validated at a time during an import
+        self.IMPORT_CHUNK_SIZE = int(Env.get("IMPORT_CHUNK_SIZE", "5000"))
+        # Number of invalid rows reported in detail by an import
+        self.IMPORT_MAX_ERRORS = int(Env.get("IMPORT_MAX_ERRORS", "1000"))
+        # Where import jobs are queued: "redis", or "memory" for tests
+        self.IMPORT_JOB_BACKEND: Literal["redis", "memory"] = Env.get(
+            "IMPORT_JOB_BACKEND", "memory" if self.TEST else "redis"
+        )  # type: ignore
+        # Import job worker threads run by the API process, 0 to leave jobs to `jobs worker`
+        self.IMPORT_JOB_WORKERS = int(Env.get("IMPORT_JOB_WORKERS", "2"))
+        # Seconds import job state is kept after its last update
+        self.IMPORT_JOB_TTL = int(Env.get("IMPORT_JOB_TTL", "86400"))
+        # Seconds without progress after which a running job is considered
+        # abandoned by a crashed worker, and queued again
+        self.IMPORT_JOB_STALE_AFTER = int(Env.get("IMPORT_JOB_STALE_AFTER", "600"))
+        # Seconds a blocking import request waits for an identical import in
+        # flight before answering with the unfinished job
+        self.IMPORT_JOB_WAIT_TIMEOUT = int(Env.get("IMPORT_JOB_WAIT_TIMEOUT", "60"))
+        # Number of properties written to the graph per transaction
+        self.GRAPH_BATCH_SIZE = int(Env.get("GRAPH_BATCH_SIZE", "1000"))
+        # Number of times a failed graph write batch is retried
+        self.GRAPH_WRITE_RETRIES = int(Env.get("GRAPH_WRITE_RETRIES", "3"))
+        # Number of items returned by a page when the client does not ask for a size
+        self.PAGE_SIZE = int(Env.get("PAGE_SIZE", "100"))
+        # Largest page size a client can ask for
+        self.MAX_PAGE_SIZE = int(Env.get("MAX_PAGE_SIZE", "1000"))
+        # Where validation sessions are kept: "redis", or "memory" for tests
+        self.VALIDATION_SESSION_BACKEND: Literal["redis", "memory"] = Env.get(
+            "VALIDATION_SESSION_BACKEND", "memory" if self.TEST else "redis"
+        )  # type: ignore
+        # Seconds a validation session is kept after its last use
+        self.VALIDATION_SESSION_TTL = int(Env.get("VALIDATION_SESSION_TTL", "3600"))
+        # Seconds portfolio reads are cached in Redis, 0 to disable the cache
+        self.PORTFOLIO_CACHE_TTL = int(
+            Env.get("PORTFOLIO_CACHE_TTL", "0" if self.TEST else "300")
+        )
+        # Seconds other requests wait for a cached portfolio read being loaded
+        self.PORTFOLIO_CACHE_LOCK_TIMEOUT = float(
+            Env.get("PORTFOLIO_CACHE_LOCK_TIMEOUT", "10")
+        )
+        # Number of records pulled from Neo4j at a time by streaming exports
+        self.EXPORT_FETCH_SIZE = int(Env.get("EXPORT_FETCH_SIZE", "1000"))
+        # Size in bytes of the chunks sent by streaming exports
+        self.EXPORT_CHUNK_SIZE = int(Env.get("EXPORT_CHUNK_SIZE", "65536"))
+
         self.NEO4J_LOG_LEVEL = logging.getLevelNamesMapping().get(
             Env.get("NEO4J_LOG_LEVEL", "ERROR").upper(), "ERROR"
         )
@@ -110,6 +199,14 @@ class Env:
 
         logger.info(f"Initialized environment variables for {env} environment")
 
+    def neo4j_driver_config(self) -> dict:
+        """The connection pool configuration of the Neo4j drivers"""
+        return {
+            "max_connection_pool_size": self.NEO4J_POOL_SIZE,
+            "connection_acquisition_timeout": self.NEO4J_ACQUISITION_TIMEOUT,
+            "max_connection_lifetime": self.NEO4J_CONNECTION_LIFETIME,
+        }
+
     def validate(self, raise_on_fail: bool = True) -> List[str]:
         errors = []
         if not self.NEO4J_URL:
@@ -123,6 +220,15 @@ class Env:
         if not self.NEO4J_CONNECTION_STRING:
             errors.append("Neo4j connection string is not set")
 
+        if self.NEO4J_POOL_SIZE < 1:
+            errors.append("NEO4J_POOL_SIZE must be positive")
+        if self.NEO4J_ACQUISITION_TIMEOUT <= 0:
+            errors.append("NEO4J_ACQUISITION_TIMEOUT must be positive")
+        if self.NEO4J_CONNECTION_LIFETIME <= 0:
+            errors.append("NEO4J_CONNECTION_LIFETIME must be positive")
+        if self.NEO4J_STARTUP_TIMEOUT < 0:
+            errors.append("NEO4J_STARTUP_TIMEOUT must not be negative")
+
         if not self.REDIS_URL:
             errors.append("REDIS_URL is not set")
         if not self.REDIS_PASSWORD:
@@ -133,6 +239,69 @@ class Env:
         if not self.SITE_URL:
             errors.append("SITE_URL is not set")
 
+        if self.NORMALIZATION_CACHE_SIZE < 0:
+            errors.append("NORMALIZATION_CACHE_SIZE must not be negative")
+        if self.ROW_VALIDATION_CACHE_SIZE < 0:
+            errors.append("ROW_VALIDATION_CACHE_SIZE must not be negative")
+        if self.VALIDATION_WORKERS < 0:
+            errors.append("VALIDATION_WORKERS must not be negative")
+        if self.PARALLEL_VALIDATION_MIN_ROWS < 0:
+            errors.append("PARALLEL_VALIDATION_MIN_ROWS must not be negative")
+        if self.MAPPING_CACHE_SIZE < 0:
+            errors.append("MAPPING_CACHE_SIZE must not be negative")
+        if self.MAPPING_SAMPLE_ROWS < 0:
+            errors.append("MAPPING_SAMPLE_ROWS must not be negative")
+        if self.PROFILE_SAMPLE_SIZE < 0:
+            errors.append("PROFILE_SAMPLE_SIZE must not be negative")
+        if self.GAZETTEER_PATH and not os.path.isfile(self.GAZETTEER_PATH):
+            errors.append("GAZETTEER_PATH is not a file")
+        if self.GEOCODING_PROVIDER not in ["gazetteer", "fake", "none"]:
+            errors.append("GEOCODING_PROVIDER must be 'gazetteer', 'fake' or 'none'")
+        if self.GEOCODING_PROVIDER == "gazetteer" and not self.GAZETTEER_PATH:
+            errors.append("GEOCODING_PROVIDER 'gazetteer' requires GAZETTEER_PATH")
+        if self.GEOCODING_CONCURRENCY < 1:
+            errors.append("GEOCODING_CONCURRENCY must be positive")
+        if self.GEOCODING_RETRIES < 0:
+            errors.append("GEOCODING_RETRIES must not be negative")
+        if self.GEOCODING_CACHE_BACKEND not in ["redis", "memory"]:
+            errors.append("GEOCODING_CACHE_BACKEND must be 'redis' or 'memory'")
+        if self.GEOCODING_CACHE_TTL < 1:
+            errors.append("GEOCODING_CACHE_TTL must be positive")
+        if self.IMPORT_CHUNK_SIZE < 1:
+            errors.append("IMPORT_CHUNK_SIZE must be positive")
+        if self.IMPORT_MAX_ERRORS < 0:
+            errors.append("IMPORT_MAX_ERRORS must not be negative")
+        if self.IMPORT_JOB_BACKEND not in ["redis", "memory"]:
+            errors.append("IMPORT_JOB_BACKEND must be 'redis' or 'memory'")
+        if self.IMPORT_JOB_WORKERS < 0:
+            errors.append("IMPORT_JOB_WORKERS must not be negative")
+        if self.IMPORT_JOB_TTL < 1:
+            errors.append("IMPORT_JOB_TTL must be positive")
+        if self.IMPORT_JOB_STALE_AFTER < 1:
+            errors.append("IMPORT_JOB_STALE_AFTER must be positive")
+        if self.IMPORT_JOB_WAIT_TIMEOUT < 0:
+            errors.append("IMPORT_JOB_WAIT_TIMEOUT must not be negative")
+        if self.GRAPH_BATCH_SIZE < 1:
+            errors.append("GRAPH_BATCH_SIZE must be positive")
+        if self.GRAPH_WRITE_RETRIES < 0:
+            errors.append("GRAPH_WRITE_RETRIES must not be negative")
+        if self.MAX_PAGE_SIZE < 1:
+            errors.append("MAX_PAGE_SIZE must be positive")
+        if not 1 <= self.PAGE_SIZE <= self.MAX_PAGE_SIZE:
+            errors.append("PAGE_SIZE must be between 1 and MAX_PAGE_SIZE")
+        if self.VALIDATION_SESSION_BACKEND not in ["redis", "memory"]:
+            errors.append("VALIDATION_SESSION_BACKEND must be 'redis' or 'memory'")
+        if self.VALIDATION_SESSION_TTL < 1:
+            errors.append("VALIDATION_SESSION_TTL must be positive")
+        if self.PORTFOLIO_CACHE_TTL < 0:
+            errors.append("PORTFOLIO_CACHE_TTL must not be negative")
+        if self.PORTFOLIO_CACHE_LOCK_TIMEOUT <= 0:
+            errors.append("PORTFOLIO_CACHE_LOCK_TIMEOUT must be positive")
+        if self.EXPORT_FETCH_SIZE < 1:
+            errors.append("EXPORT_FETCH_SIZE must be positive")
+        if self.EXPORT_CHUNK_SIZE < 1:
+            errors.append("EXPORT_CHUNK_SIZE must be positive")
+
         if self.ENV and self.ENV not in ["dev", "prod", "test"]:
             errors.append("ENV must be 'dev', 'prod', or 'test'")
 
@@ -8,9 +8,30 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from loguru import logger
 from pathlib import Path
+from typing import Optional
 from pfman.Env import config
+from pfman.geocoders import (
+    BatchGeocoder,
+    FakeGeocodingProvider,
+    Gazetteer,
+    GazetteerProvider,
+    GeocodeCache,
+    InProcessGeocodeCache,
+    RedisGeocodeCache,
+)
+from pfman.graph.Writer import GraphWriter
+from pfman.jobs import InProcessJobQueue, JobQueue, RedisJobQueue
+from pfman.jobs.CacheInvalidation import PORTFOLIO_CACHE_PREFIX, invalidating_writer
+from pfman.jobs.JobQueue import PortfolioWriter
 from pfman.logging import configure_log_level, configure_neo4j_log_level
 from pfman.routes.api import api_router
+from pfman.routes.portfolio import row_validation_cache
+from pfman.utils.neo4j import get_async_driver, get_driver, warm_async_driver
+from pfman.utils.cache import cache_stats, configure_caches
+from pfman.utils.redis_cache import CacheInvalidator, ReadThroughCache
+from pfman.validation import InProcessSessionStore, RedisSessionStore, SessionStore
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
 from starlette.middleware.sessions import SessionMiddleware
 import os
 
@@ -21,19 +42,140 @@ logger.info(f"Configuring logging, setting level to {config.LOG_LEVEL}")
 configure_log_level(config.LOG_LEVEL)
 logger.info(f"Configuring Neo4j logging, setting level to {config.NEO4J_LOG_LEVEL}")
 configure_neo4j_log_level(config.NEO4J_LOG_LEVEL)
+logger.info(f"Configuring normalization caches, size {config.NORMALIZATION_CACHE_SIZE}")
+configure_caches(config.NORMALIZATION_CACHE_SIZE)
 
 root = Path(__file__).parent.parent
 
 templates = Jinja2Templates(directory=f"{root}/client/dist")
 
 
+def create_geocoder() -> Optional[BatchGeocoder]:
+    if config.GEOCODING_PROVIDER == "none":
+        return None
+
+    # The gazetteer is local and answers faster than a cache would
+    cache: Optional[GeocodeCache] = None
+    if config.GEOCODING_PROVIDER == "gazetteer":
+        provider = GazetteerProvider(Gazetteer.from_csv(config.GAZETTEER_PATH))
+    else:
+        provider = FakeGeocodingProvider()
+        if config.GEOCODING_CACHE_BACKEND == "memory":
+            cache = InProcessGeocodeCache()
+        else:
+            client = Redis.from_url(config.REDIS_URL, password=config.REDIS_PASSWORD)
+            cache = RedisGeocodeCache(client, ttl=config.GEOCODING_CACHE_TTL)
+
+    return BatchGeocoder(
+        provider,
+        cache=cache,
+        concurrency=config.GEOCODING_CONCURRENCY,
+        max_retries=config.GEOCODING_RETRIES,
+    )
+
+
+def create_job_queue(writer: PortfolioWriter, geocoder: Optional[BatchGeocoder]) -> JobQueue:
+    options = dict(
+        cache=row_validation_cache,
+        writer=writer,
+        chunk_size=config.IMPORT_CHUNK_SIZE,
+        max_errors=config.IMPORT_MAX_ERRORS,
+        geocoder=geocoder,
+        stale_after=config.IMPORT_JOB_STALE_AFTER,
+        wait_timeout=config.IMPORT_JOB_WAIT_TIMEOUT,
+    )
+    if config.IMPORT_JOB_BACKEND == "memory":
+        return InProcessJobQueue(**options)
+
+    client = Redis.from_url(config.REDIS_URL, password=config.REDIS_PASSWORD)
+    return RedisJobQueue(client, ttl=config.IMPORT_JOB_TTL, **options)
+
+
+def create_validation_sessions() -> SessionStore:
+    options = dict(
+        cache=row_validation_cache,
+        chunk_size=config.IMPORT_CHUNK_SIZE,
+        ttl=config.VALIDATION_SESSION_TTL,
+    )
+    if config.VALIDATION_SESSION_BACKEND == "memory":
+        return InProcessSessionStore(**options)
+
+    client = Redis.from_url(config.REDIS_URL, password=config.REDIS_PASSWORD)
+    return RedisSessionStore(client, **options)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("Starting up...")
-    # Startup code here
+    app.state.graph_driver = get_async_driver(
+        config.NEO4J_CONNECTION_STRING, **config.neo4j_driver_config()
+    )
+    logger.info("Checking Neo4j connectivity")
+    try:
+        await warm_async_driver(app.state.graph_driver, config.NEO4J_STARTUP_TIMEOUT)
+    except Exception:
+        await app.state.graph_driver.close()
+        raise
+
+    logger.info(f"Starting {config.VALIDATION_WORKERS} validation worker processes")
+    row_validation_cache.start(config.VALIDATION_WORKERS)
+
+    logger.info(
+        f"Starting {config.IMPORT_JOB_WORKERS} {config.IMPORT_JOB_BACKEND} import job workers"
+    )
+    # Job workers are threads, so graph writes go through a blocking driver
+    graph_driver = get_driver(
+        config.NEO4J_CONNECTION_STRING, **config.neo4j_driver_config()
+    )
+    graph_writer = GraphWriter(
+        graph_driver,
+        batch_size=config.GRAPH_BATCH_SIZE,
+        max_retries=config.GRAPH_WRITE_RETRIES,
+    )
+    portfolio_writer: PortfolioWriter = graph_writer.portfolio_writer
+
+    app.state.portfolio_cache = ReadThroughCache(
+        AsyncRedis.from_url(config.REDIS_URL, password=config.REDIS_PASSWORD),
+        prefix=PORTFOLIO_CACHE_PREFIX,
+        ttl=config.PORTFOLIO_CACHE_TTL,
+        lock_timeout=config.PORTFOLIO_CACHE_LOCK_TIMEOUT,
+    )
+    if config.PORTFOLIO_CACHE_TTL > 0:
+        logger.info(f"Caching portfolio reads for {config.PORTFOLIO_CACHE_TTL}s")
+        portfolio_writer = invalidating_writer(
+            portfolio_writer,
+            CacheInvalidator(
+                Redis.from_url(config.REDIS_URL, password=config.REDIS_PASSWORD),
+                PORTFOLIO_CACHE_PREFIX,
+            ),
+        )
+
+    geocoder = create_geocoder()
+    if geocoder:
+        logger.info(f"Geocoding imports with the {geocoder.provider.name} provider")
+        geocoder.start()
+    app.state.job_queue = create_job_queue(portfolio_writer, geocoder)
+    app.state.validation_sessions = create_validation_sessions()
+    app.state.job_queue.start(config.IMPORT_JOB_WORKERS)
     yield
     logger.info("Shutting down...")
-    # Shutdown code here
+    app.state.job_queue.stop()
+    row_validation_cache.stop()
+    if geocoder:
+        geocoder.stop()
+        logger.info(f"Geocoding: {geocoder.stats} hit_rate={geocoder.stats.hit_rate:.2%}")
+    stats = graph_writer.stats
+    logger.info(
+        f"Graph writes: {stats.nodes} nodes in {stats.batches} batches, "
+        f"{stats.nodes_per_second:,.0f} nodes/s, {stats.retries} retries"
+    )
+    graph_driver.close()
+    await app.state.graph_driver.close()
+    info = app.state.portfolio_cache.info()
+    logger.info(f"Portfolio read cache: {info} hit_rate={info.hit_rate:.2%}")
+    await app.state.portfolio_cache.client.aclose()
+    for name, info in cache_stats().items():
+        logger.info(f"Cache {name}: {info} hit_rate={info.hit_rate:.2%}")
 
 
 app = FastAPI(
@@ -0,0 +1,216 @@
+import asyncio
+import random
+from dataclasses import dataclass
+from threading import Lock, Thread
+from typing import Any, Coroutine, Optional, Sequence, TypeVar
+from loguru import logger
+from pfman.models import Address
+from .GeocodeCache import GeocodeCache
+from .GeocodingProvider import GeocodeResult, GeocodingError, GeocodingProvider, geocode_key
+
+DEFAULT_GEOCODING_CONCURRENCY = 8
+
+DEFAULT_GEOCODING_RETRIES = 3
+
+# Seconds before the first retry of a failed batch, doubled on every retry
+DEFAULT_GEOCODING_BACKOFF = 0.5
+
+# Seconds a provider is given to answer a batch before it is retried
+DEFAULT_GEOCODING_TIMEOUT = 30.0
+
+T = TypeVar("T")
+
+# Marks the addresses of a batch that failed, which are not cached
+_FAILED: Any = object()
+
+
+@dataclass
+class GeocodingStats:
+    addresses: int = 0
+    """The distinct addresses looked up"""
+    cache_hits: int = 0
+    requested: int = 0
+    """The addresses sent to the provider"""
+    batches: int = 0
+    retries: int = 0
+    failed: int = 0
+    """The addresses of batches that failed after their retries"""
+
+    @property
+    def hit_rate(self) -> float:
+        return self.cache_hits / self.addresses if self.addresses else 0.0
+
+
+class BatchGeocoder:
+    """
+    Geocodes addresses through a `GeocodingProvider` in batches, with a cache in
+    front of it.
+
+    Addresses are keyed with `geocode_key`, so each distinct address is looked
+    up once per call. Keys missing from the cache are grouped into batches of
+    the provider's `batch_size`, which are sent concurrently, at most
+    `concurrency` at a time. Batches failing with a retryable `GeocodingError`
+    or timing out are retried up to `max_retries` times with jittered
+    exponential backoff. Their addresses are otherwise left without a result
+    and are not cached, so a later import asks for them again.
+
+    Requests run on an event loop in a thread of their own, started by `start`,
+    so the concurrency limit holds across all the threads of the process and
+    providers can keep connections between calls. `geocode` and
+    `fill_coordinates` are called from other threads, such as job workers.
+    """
+
+    def __init__(
+        self,
+        provider: GeocodingProvider,
+        cache: Optional[GeocodeCache] = None,
+        concurrency: int = DEFAULT_GEOCODING_CONCURRENCY,
+        max_retries: int = DEFAULT_GEOCODING_RETRIES,
+        backoff: float = DEFAULT_GEOCODING_BACKOFF,
+        timeout: float = DEFAULT_GEOCODING_TIMEOUT,
+    ):
+        self.provider = provider
+        self.cache = cache
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.stats = GeocodingStats()
+        self._semaphore = asyncio.Semaphore(max(concurrency, 1))
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[Thread] = None
+        self._lock = Lock()
+
+    def start(self) -> None:
+        """Starts the event loop thread requests run on"""
+        with self._lock:
+            if self._loop is not None:
+                return
+            self._loop = asyncio.new_event_loop()
+            self._thread = Thread(
+                target=self._loop.run_forever, name="geocoder", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Closes the provider and stops the event loop thread, after running requests finish"""
+        with self._lock:
+            loop, thread, self._loop, self._thread = self._loop, self._thread, None, None
+        if loop is None or thread is None:
+            return
+
+        asyncio.run_coroutine_threadsafe(self.provider.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+    def geocode(self, addresses: Sequence[Optional[Address]]) -> list[Optional[GeocodeResult]]:
+        """
+        Geocodes addresses, from the cache where possible.
+
+        Args:
+          addresses (Sequence[Optional[Address]]): The addresses, None for rows to skip.
+
+        Returns:
+          list[Optional[GeocodeResult]]: The result of each address, None if it was not found or its batch failed.
+        """
+        keys = [geocode_key(address) if address else None for address in addresses]
+        pending: dict[str, Address] = {}
+        for key, address in zip(keys, addresses):
+            if key is not None and key not in pending:
+                pending[key] = address  # type: ignore
+
+        name = self.provider.name
+        results = self.cache.get_many(name, list(pending)) if self.cache else {}
+        missing = [key for key in pending if key not in results]
+        with self._lock:
+            self.stats.addresses += len(pending)
+            self.stats.cache_hits += len(results)
+
+        if missing:
+            fetched = self._run(self._fetch([pending[key] for key in missing]))
+            found = {
+                key: result for key, result in zip(missing, fetched) if result is not _FAILED
+            }
+            if self.cache:
+                self.cache.set_many(name, found)
+            results.update(found)
+
+        return [results.get(key) if key is not None else None for key in keys]
+
+    def fill_coordinates(
+        self, addresses: Sequence[Optional[Address]]
+    ) -> tuple[list[Optional[Address]], int]:
+        """
+        Fills in coordinates for the addresses without them.
+
+        Addresses are not changed, as they may be shared through the row
+        validation cache: geocoded addresses are replaced by updated copies.
+
+        Args:
+          addresses (Sequence[Optional[Address]]): The validated addresses, None for invalid rows.
+
+        Returns:
+          tuple[list[Optional[Address]], int]: The addresses, and the number of them geocoded.
+        """
+        positions = [
+            position
+            for position, address in enumerate(addresses)
+            if address is not None
+            and (address.latitude is None or address.longitude is None)
+        ]
+        filled: list[Optional[Address]] = list(addresses)
+        geocoded = 0
+        results = self.geocode([addresses[position] for position in positions])
+        for position, result in zip(positions, results):
+            if result is not None:
+                filled[position] = addresses[position].model_copy(  # type: ignore
+                    update={"latitude": result.latitude, "longitude": result.longitude}
+                )
+                geocoded += 1
+        return filled, geocoded
+
+    def _run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()  # type: ignore
+
+    async def _fetch(self, addresses: list[Address]) -> list[Optional[GeocodeResult]]:
+        size = max(self.provider.batch_size, 1)
+        batches = await asyncio.gather(
+            *(
+                self._request(addresses[start : start + size])
+                for start in range(0, len(addresses), size)
+            )
+        )
+        return [result for batch in batches for result in batch]
+
+    async def _request(self, batch: list[Address]) -> list[Optional[GeocodeResult]]:
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._semaphore:
+                    with self._lock:
+                        self.stats.batches += 1
+                        self.stats.requested += len(batch)
+                    results = await asyncio.wait_for(
+                        self.provider.geocode_batch(batch), self.timeout
+                    )
+                if len(results) != len(batch):
+                    raise GeocodingError(
+                        f"{self.provider.name} returned {len(results)} results for {len(batch)} addresses",
+                        retryable=False,
+                    )
+                return results
+            except (GeocodingError, TimeoutError) as e:
+                retryable = not isinstance(e, GeocodingError) or e.retryable
+                if not retryable or attempt == self.max_retries:
+                    logger.warning(
+                        f"Geocoding a batch of {len(batch)} addresses with {self.provider.name} "
+                        f"failed after {attempt + 1} attempts: {e!r}"
+                    )
+                    with self._lock:
+                        self.stats.failed += len(batch)
+                    return [_FAILED] * len(batch)
+
+                with self._lock:
+                    self.stats.retries += 1
+                await asyncio.sleep(self.backoff * 2**attempt * (1 + random.random()))
+        return [_FAILED] * len(batch)
@@ -0,0 +1,64 @@
+import asyncio
+import hashlib
+import random
+from typing import Optional, Sequence
+from pfman.models import Address
+from .GeocodingProvider import (
+    DEFAULT_PROVIDER_BATCH_SIZE,
+    GeocodeResult,
+    GeocodingError,
+    GeocodingProvider,
+    geocode_key,
+)
+
+
+class FakeGeocodingProvider(GeocodingProvider):
+    """
+    A local stand-in for a geocoding service, to measure throughput and cache
+    behavior offline.
+
+    Each batch takes `latency` seconds and fails with a retryable error with
+    probability `failure_rate`. Addresses are placed at coordinates derived from
+    a hash of their `geocode_key`, so the same address always gets the same
+    result. `calls` and `geocoded` count the batches and addresses requested.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        batch_size: int = DEFAULT_PROVIDER_BATCH_SIZE,
+        failure_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.batch_size = max(batch_size, 1)
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self.geocoded = 0
+        self._random = random.Random(seed)
+
+    async def geocode_batch(
+        self, addresses: Sequence[Address]
+    ) -> list[Optional[GeocodeResult]]:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if self._random.random() < self.failure_rate:
+            raise GeocodingError("Fake rate limit exceeded")
+
+        self.geocoded += len(addresses)
+        return [self._locate(address) for address in addresses]
+
+    @staticmethod
+    def _locate(address: Address) -> Optional[GeocodeResult]:
+        key = geocode_key(address)
+        if key is None:
+            return None
+
+        digest = hashlib.sha1(key.encode()).digest()
+        return GeocodeResult(
+            latitude=round(int.from_bytes(digest[:4]) / 2**32 * 120 - 55, 6),
+            longitude=round(int.from_bytes(digest[4:8]) / 2**32 * 360 - 180, 6),
+            precision="address" if address.normalized_street else "city",
+        )
@@ -0,0 +1,238 @@
+import csv
+import math
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Iterable, Mapping, Optional
+from h3.api import basic_int as h3_int
+from loguru import logger
+from pfman.models import Address
+from pfman.utils.geo import get_state
+from pfman.utils.geocoding import (
+    normalize,
+    normalize_city_name,
+    normalize_postal_code,
+    normalize_state_name,
+)
+from pfman.utils.string import parse_float
+from .GeocodingProvider import GEOCODE_PRECISION, GeocodeResult
+
+# The columns of a gazetteer file. Rows with a postal code are postal code
+# centroids, the others are city centroids.
+GAZETTEER_FIELDS = ("country_code", "state", "city", "postal_code", "latitude", "longitude")
+
+# The H3 resolution of the reverse index
+REVERSE_RESOLUTION = 5
+
+# The shortest cell edge at `REVERSE_RESOLUTION`, in kilometers. Cells are at
+# least sqrt(3) edges across, so a point and everything within d km of it are
+# at most ceil(d / (sqrt(3) * edge)) + 1 rings of cells apart.
+REVERSE_MIN_EDGE_KM = 7.0
+
+# Marks a key shared by entries in different places, which is not guessed
+_AMBIGUOUS = -1
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+@dataclass(frozen=True)
+class GazetteerEntry:
+    country_code: str
+    state: Optional[str]
+    city: Optional[str]
+    postal_code: Optional[str]
+    latitude: float
+    longitude: float
+
+
+def _state_keys(state: Optional[str], country_code: str) -> set[str]:
+    """The normalized names and codes a state can be looked up by"""
+    if not state:
+        return set()
+
+    keys = {normalize_state_name(state), normalize(state)}
+    subdivision = get_state(q=state, country_code=country_code)
+    if subdivision:
+        keys.add(normalize_state_name(subdivision.name))
+        keys.add(normalize(subdivision.state_code))  # type: ignore
+    return keys - {""}
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """The great-circle distance between two points, in kilometers"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (
+        math.sin((phi2 - phi1) / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+class Gazetteer:
+    """
+    An offline geocoder over a local gazetteer of city and postal code
+    centroids.
+
+    Entries are kept in flat arrays, one slot per entry. Forward lookups go
+    through a dictionary from normalized keys to slots: the country code and
+    postal code, the country code, state and city, and the country code and
+    city alone when that city name is not shared by another state. Names are
+    normalized with the same functions as `Address`, so a validated address
+    looks up the keys it was normalized to. Reverse lookups go through the
+    slots sorted by their H3 cell at `REVERSE_RESOLUTION`.
+
+    Imports use it through the `GazetteerProvider`.
+    """
+
+    def __init__(self, rows: Iterable[Mapping[str, Optional[str]]]):
+        self.latitudes = array("d")
+        self.longitudes = array("d")
+        self.country_codes: list[str] = []
+        self.states: list[Optional[str]] = []
+        self.cities: list[Optional[str]] = []
+        self.postal_codes: list[Optional[str]] = []
+        self.keys: dict[str, int] = {}
+        self.skipped = 0
+
+        for row in rows:
+            self._add(row)
+
+        cells = [
+            h3_int.latlng_to_cell(latitude, longitude, REVERSE_RESOLUTION)
+            for latitude, longitude in zip(self.latitudes, self.longitudes)
+        ]
+        order = sorted(range(len(cells)), key=cells.__getitem__)
+        self._reverse_cells = array("q", (cells[slot] for slot in order))
+        self._reverse_slots = array("l", order)
+
+    @classmethod
+    def from_csv(cls, path: str) -> "Gazetteer":
+        """Loads a gazetteer file with a header of `GAZETTEER_FIELDS`"""
+        with open(path, newline="", encoding="utf-8-sig") as file:
+            reader = csv.DictReader(file)
+            columns = reader.fieldnames or ()
+            if missing := [field for field in GAZETTEER_FIELDS if field not in columns]:
+                raise ValueError(f"Gazetteer columns missing from {path}: {', '.join(missing)}")
+            gazetteer = cls(reader)
+
+        logger.info(
+            f"Loaded {len(gazetteer):,} gazetteer entries and {len(gazetteer.keys):,} keys "
+            f"from {path}, skipped {gazetteer.skipped:,} rows"
+        )
+        return gazetteer
+
+    def __len__(self) -> int:
+        return len(self.latitudes)
+
+    def entry(self, slot: int) -> GazetteerEntry:
+        return GazetteerEntry(
+            country_code=self.country_codes[slot],
+            state=self.states[slot],
+            city=self.cities[slot],
+            postal_code=self.postal_codes[slot],
+            latitude=self.latitudes[slot],
+            longitude=self.longitudes[slot],
+        )
+
+    def geocode(self, address: Address) -> Optional[GeocodeResult]:
+        """
+        Looks up the approximate coordinates of an address, from its postal code
+        or else its city.
+
+        Args:
+          address (Address): The validated address.
+
+        Returns:
+          Optional[GeocodeResult]: The coordinates found, None if the country or the place is unknown.
+        """
+        country = address.normalized_country_code
+        if not country:
+            return None
+
+        keys: list[tuple[str, GEOCODE_PRECISION]] = []
+        if address.normalized_postal_code:
+            keys.append((f"{country}|{address.normalized_postal_code}", "postal_code"))
+        if address.normalized_city:
+            city = address.normalized_city
+            for state in (address.normalized_state_code, address.normalized_state):
+                if state:
+                    keys.append((f"{country}|{state}|{city}", "city"))
+            keys.append((f"{country}||{city}", "city"))
+
+        for key, precision in keys:
+            slot = self.keys.get(key, _AMBIGUOUS)
+            if slot != _AMBIGUOUS:
+                return GeocodeResult(self.latitudes[slot], self.longitudes[slot], precision)
+        return None
+
+    def reverse(
+        self, latitude: float, longitude: float, max_distance_km: float = 10.0
+    ) -> Optional[GazetteerEntry]:
+        """
+        Finds the entry nearest to a point.
+
+        Args:
+          latitude (float): The latitude, in degrees.
+          longitude (float): The longitude, in degrees.
+          max_distance_km (float): The largest distance to an entry, in kilometers. Defaults to 10.
+
+        Returns:
+          Optional[GazetteerEntry]: The nearest entry within `max_distance_km`, None if there is none.
+        """
+        cell = h3_int.latlng_to_cell(latitude, longitude, REVERSE_RESOLUTION)
+        rings = math.ceil(max_distance_km / (math.sqrt(3) * REVERSE_MIN_EDGE_KM)) + 1
+        nearest: Optional[int] = None
+        nearest_distance = max_distance_km
+        for candidate in h3_int.grid_disk(cell, rings):
+            start = bisect_left(self._reverse_cells, candidate)
+            end = bisect_right(self._reverse_cells, candidate, lo=start)
+            for slot in self._reverse_slots[start:end]:
+                distance = haversine_km(
+                    latitude, longitude, self.latitudes[slot], self.longitudes[slot]
+                )
+                if distance <= nearest_distance:
+                    nearest, nearest_distance = slot, distance
+        return self.entry(nearest) if nearest is not None else None
+
+    def _add(self, row: Mapping[str, Optional[str]]) -> None:
+        country = normalize(row.get("country_code") or "")
+        latitude = parse_float(row.get("latitude") or "")
+        longitude = parse_float(row.get("longitude") or "")
+        if (
+            not country
+            or latitude is None
+            or longitude is None
+            or not (-90 <= latitude <= 90 and -180 <= longitude <= 180)
+        ):
+            self.skipped += 1
+            return
+
+        state = (row.get("state") or "").strip() or None
+        city = (row.get("city") or "").strip() or None
+        postal_code = (row.get("postal_code") or "").strip() or None
+        if not city and not postal_code:
+            self.skipped += 1
+            return
+
+        slot = len(self.latitudes)
+        self.latitudes.append(latitude)
+        self.longitudes.append(longitude)
+        self.country_codes.append(sys.intern(country))
+        self.states.append(sys.intern(state) if state else None)
+        self.cities.append(city)
+        self.postal_codes.append(postal_code)
+
+        if postal_code:
+            self.keys.setdefault(f"{country}|{normalize_postal_code(postal_code)}", slot)
+            return
+
+        name = normalize_city_name(city)  # type: ignore
+        for state_key in _state_keys(state, country):
+            self.keys.setdefault(f"{country}|{state_key}|{name}", slot)
+
+        # A city is found by name alone only if no other state has a city of that name
+        key = f"{country}||{name}"
+        other = self.keys.setdefault(key, slot)
+        if other not in (slot, _AMBIGUOUS) and self.states[other] != state:
+            self.keys[key] = _AMBIGUOUS
@@ -0,0 +1,23 @@
+from typing import Optional, Sequence
+from pfman.models import Address
+from .Gazetteer import Gazetteer
+from .GeocodingProvider import GeocodeResult, GeocodingProvider
+
+
+class GazetteerProvider(GeocodingProvider):
+    """
+    Geocodes addresses offline through a `Gazetteer`, to the centroid of their
+    postal code or city. Lookups are in memory, so batches are large and there
+    is nothing worth caching.
+    """
+
+    name = "gazetteer"
+    batch_size = 10_000
+
+    def __init__(self, gazetteer: Gazetteer):
+        self.gazetteer = gazetteer
+
+    async def geocode_batch(
+        self, addresses: Sequence[Address]
+    ) -> list[Optional[GeocodeResult]]:
+        return [self.gazetteer.geocode(address) for address in addresses]
@@ -0,0 +1,33 @@
+import hashlib
+from abc import ABC, abstractmethod
+from typing import Mapping, Optional, Sequence
+from .GeocodingProvider import GeocodeResult
+
+# Seconds geocoding results are kept, as places rarely move
+DEFAULT_GEOCODE_CACHE_TTL = 30 * 24 * 60 * 60
+
+
+def hash_key(key: str) -> str:
+    """A fixed-size digest of a geocoding key, which may be long"""
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+class GeocodeCache(ABC):
+    """
+    Caches geocoding results by provider and by the `geocode_key` of the
+    addresses, including addresses a provider could not locate, so neither is
+    requested again. Failed requests are not cached.
+
+    Backends implement how results are stored.
+    """
+
+    @abstractmethod
+    def get_many(
+        self, provider: str, keys: Sequence[str]
+    ) -> dict[str, Optional[GeocodeResult]]:
+        """Returns the cached results of the keys found, None for addresses known not to be found"""
+        pass
+
+    @abstractmethod
+    def set_many(self, provider: str, results: Mapping[str, Optional[GeocodeResult]]) -> None:
+        pass
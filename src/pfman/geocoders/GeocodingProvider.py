@@ -0,0 +1,77 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Literal, Optional, Sequence
+from pfman.models import Address
+from pfman.utils.geocoding import normalize
+
+GEOCODE_PRECISION = Literal["address", "street", "postal_code", "city"]
+
+DEFAULT_PROVIDER_BATCH_SIZE = 100
+
+
+@dataclass(frozen=True)
+class GeocodeResult:
+    latitude: float
+    longitude: float
+    precision: GEOCODE_PRECISION
+    """What the coordinates locate, from the address itself to its city"""
+
+
+class GeocodingError(Exception):
+    """A failed geocoding request, retried when `retryable`, such as on a rate limit or timeout"""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+def geocode_key(address: Address) -> Optional[str]:
+    """
+    Keys an address on the normalized fields a geocoder locates it by, so
+    spellings that normalize alike share one request and one cached result.
+
+    Returns:
+      Optional[str]: The key, None if the address has no place to locate.
+    """
+    if not (address.city or address.postal_code or address.formatted_address):
+        return None
+
+    street = address.normalized_street or (
+        normalize(address.address_line) if address.address_line else None
+    )
+    return "|".join(
+        value or ""
+        for value in (
+            address.normalized_country_code or address.normalized_country,
+            address.normalized_state_code or address.normalized_state,
+            address.normalized_city,
+            address.normalized_postal_code,
+            street,
+            address.normalized_house_number,
+            normalize(address.formatted_address) if address.formatted_address else None,
+        )
+    )
+
+
+class GeocodingProvider(ABC):
+    """
+    A geocoding backend, called with batches of addresses.
+
+    `geocode_batch` receives at most `batch_size` addresses and returns a
+    result for each of them, None for those it cannot locate. Failures raise
+    `GeocodingError`, which callers retry when it is retryable. Providers are
+    called concurrently from one event loop.
+    """
+
+    name: str = "provider"
+    batch_size: int = DEFAULT_PROVIDER_BATCH_SIZE
+
+    @abstractmethod
+    async def geocode_batch(
+        self, addresses: Sequence[Address]
+    ) -> list[Optional[GeocodeResult]]:
+        pass
+
+    async def aclose(self) -> None:
+        """Releases the resources of the provider, such as its HTTP connections"""
+        pass
@@ -0,0 +1,33 @@
+from typing import Mapping, Optional, Sequence
+from pfman.utils.cache import LRUCache
+from .GeocodeCache import GeocodeCache
+from .GeocodingProvider import GeocodeResult
+
+DEFAULT_GEOCODE_CACHE_SIZE = 100_000
+
+_MISSING = object()
+
+
+class InProcessGeocodeCache(GeocodeCache):
+    """
+    Keeps the most recently used results in memory in this process. Results are
+    lost on restart and are not shared between processes, so this backend is
+    meant for tests and development.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_GEOCODE_CACHE_SIZE):
+        self.cache = LRUCache(maxsize)
+
+    def get_many(
+        self, provider: str, keys: Sequence[str]
+    ) -> dict[str, Optional[GeocodeResult]]:
+        found = {}
+        for key in keys:
+            result = self.cache.get((provider, key), _MISSING)
+            if result is not _MISSING:
+                found[key] = result
+        return found  # type: ignore
+
+    def set_many(self, provider: str, results: Mapping[str, Optional[GeocodeResult]]) -> None:
+        for key, result in results.items():
+            self.cache.set((provider, key), result)
@@ -0,0 +1,67 @@
+import json
+from dataclasses import asdict
+from typing import Mapping, Optional, Sequence
+from loguru import logger
+from redis import Redis
+from redis.exceptions import RedisError
+from .GeocodeCache import DEFAULT_GEOCODE_CACHE_TTL, GeocodeCache, hash_key
+from .GeocodingProvider import GeocodeResult
+
+
+class RedisGeocodeCache(GeocodeCache):
+    """
+    Stores results in Redis as JSON strings keyed on the provider and a hash of
+    the geocoding key, so every process and import shares them. A batch of
+    keys is read with one MGET and written in one pipeline.
+
+    Redis errors are logged rather than raised: reads then miss and writes are
+    dropped, so imports keep geocoding without the cache.
+    """
+
+    def __init__(
+        self,
+        client: Redis,
+        ttl: int = DEFAULT_GEOCODE_CACHE_TTL,
+        prefix: str = "pfman:geocode",
+    ):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _key(self, provider: str, key: str) -> str:
+        return f"{self.prefix}:{provider}:{hash_key(key)}"
+
+    def get_many(
+        self, provider: str, keys: Sequence[str]
+    ) -> dict[str, Optional[GeocodeResult]]:
+        if not keys:
+            return {}
+
+        try:
+            values = self.client.mget([self._key(provider, key) for key in keys])
+        except RedisError as e:
+            logger.warning(f"Geocode cache lookup failed, geocoding without it: {e}")
+            return {}
+
+        found: dict[str, Optional[GeocodeResult]] = {}
+        for key, data in zip(keys, values):  # type: ignore
+            if data is not None:
+                result = json.loads(data)
+                found[key] = GeocodeResult(**result) if result else None
+        return found
+
+    def set_many(self, provider: str, results: Mapping[str, Optional[GeocodeResult]]) -> None:
+        if not results:
+            return
+
+        pipeline = self.client.pipeline(transaction=False)
+        for key, result in results.items():
+            pipeline.set(
+                self._key(provider, key),
+                json.dumps(asdict(result) if result else None),
+                ex=self.ttl,
+            )
+        try:
+            pipeline.execute()
+        except RedisError as e:
+            logger.warning(f"Geocode cache update failed, results are not cached: {e}")
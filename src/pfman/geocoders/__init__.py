@@ -0,0 +1,24 @@
+from .BatchGeocoder import BatchGeocoder, GeocodingStats
+from .FakeGeocodingProvider import FakeGeocodingProvider
+from .Gazetteer import Gazetteer, GazetteerEntry
+from .GazetteerProvider import GazetteerProvider
+from .GeocodeCache import GeocodeCache
+from .GeocodingProvider import GeocodeResult, GeocodingError, GeocodingProvider, geocode_key
+from .InProcessGeocodeCache import InProcessGeocodeCache
+from .RedisGeocodeCache import RedisGeocodeCache
+
+__all__ = [
+    "BatchGeocoder",
+    "FakeGeocodingProvider",
+    "Gazetteer",
+    "GazetteerEntry",
+    "GazetteerProvider",
+    "GeocodeCache",
+    "GeocodeResult",
+    "GeocodingError",
+    "GeocodingProvider",
+    "GeocodingStats",
+    "InProcessGeocodeCache",
+    "RedisGeocodeCache",
+    "geocode_key",
+]
@@ -0,0 +1,214 @@
+from typing import Any, AsyncIterator, Optional, Sequence
+from neo4j import AsyncManagedTransaction, AsyncSession
+from pydantic import BaseModel
+from pfman.models import Address
+from pfman.models.Address import EMPTY_ADDRESS
+from pfman.utils.pagination import projection
+from .Schema import Portfolio, Property
+from .Writer import PROPERTY_FIELDS
+
+# The address fields set from the name and code of each hierarchy level
+LEVEL_FIELDS: dict[str, tuple[str, Optional[str]]] = {
+    "Country": ("country", "country_code"),
+    "State": ("state", "state_code"),
+    "County": ("county", None),
+    "City": ("city", None),
+    "Neighborhood": ("neighborhood", None),
+    "Street": ("street", None),
+}
+
+# The property fields read from the IN relationships of a property to its
+# hierarchy levels, by field: the level and the relationship property
+HIERARCHY_READ_FIELDS: dict[str, tuple[str, str]] = {
+    field: (level, attribute)
+    for level, (name_field, code_field) in reversed(LEVEL_FIELDS.items())
+    for field, attribute in ((name_field, "name"), (code_field, "code"))
+    if field
+}
+
+# The fields of each node type that can be read, in their output order. Each
+# node type is paged on its first field, which has a unique index.
+PORTFOLIO_READ_FIELDS = tuple(Portfolio.defined_properties(aliases=False, rels=False))
+PROPERTY_READ_FIELDS = tuple(Property.defined_properties(aliases=False, rels=False)) + tuple(
+    HIERARCHY_READ_FIELDS
+)
+
+# The hierarchy levels of a property `n`, with its own names and codes for them
+LEVELS_PATTERN = (
+    "[(n)-[r:IN]->(level) | {label: head(labels(level)), name: r.name, code: r.code}]"
+)
+
+
+def property_projection(fields: Sequence[str]) -> str:
+    """
+    Builds the map projection of a property `n`, reading its hierarchy fields
+    from its IN relationships, which hold its own spelling of each level.
+    """
+    entries = [
+        f"{field}: head([(n)-[r:IN]->(:{HIERARCHY_READ_FIELDS[field][0]}) "
+        f"| r.{HIERARCHY_READ_FIELDS[field][1]}])"
+        if field in HIERARCHY_READ_FIELDS
+        else f".{field}"
+        for field in fields
+    ]
+    return f"n {{{', '.join(entries)}}}"
+
+
+def property_prefix(portfolio_id: str) -> str:
+    """The prefix shared by the IDs of the properties of a portfolio, see `Writer.property_id`"""
+    return f"{portfolio_id}:"
+
+
+async def read_portfolios(
+    session: AsyncSession,
+    after: Optional[str],
+    limit: int,
+    fields: Sequence[str] = PORTFOLIO_READ_FIELDS,
+) -> list[dict[str, Any]]:
+    """
+    Reads a page of portfolios ordered by ID.
+
+    The page starts right after the `after` ID with a range seek on the
+    unique index of `portfolio_id`, which also provides the order, so the
+    cost of a page does not depend on how many portfolios come before it.
+
+    Args:
+      session (AsyncSession): The session to read with.
+      after (Optional[str]): The ID of the last portfolio of the previous page, None for the first page.
+      limit (int): The number of portfolios to read.
+      fields (Sequence[str]): The fields to read, from PORTFOLIO_READ_FIELDS.
+
+    Returns:
+      list[dict[str, Any]]: The projected portfolios.
+    """
+    query = (
+        "MATCH (p:Portfolio) WHERE p.portfolio_id > $after "
+        f"RETURN {projection('p', fields)} AS item "
+        "ORDER BY p.portfolio_id LIMIT $limit"
+    )
+
+    async def work(tx: AsyncManagedTransaction) -> list[dict[str, Any]]:
+        result = await tx.run(query, after=after or "", limit=limit)
+        return [record["item"] async for record in result]
+
+    return await session.execute_read(work)
+
+
+async def read_portfolio_properties(
+    session: AsyncSession,
+    portfolio_id: str,
+    after: Optional[str],
+    limit: int,
+    fields: Sequence[str] = PROPERTY_READ_FIELDS,
+) -> Optional[tuple[dict[str, Any], list[dict[str, Any]]]]:
+    """
+    Reads a portfolio and a page of its properties ordered by ID.
+
+    Property IDs are prefixed with the ID of their portfolio, so the page is
+    read with a range seek on the unique index of `property_id` bounded by
+    that prefix instead of expanding and sorting every INCLUDES relationship
+    of the portfolio. The cost of a page is the same at any depth.
+
+    Args:
+      session (AsyncSession): The session to read with.
+      portfolio_id (str): The ID of the portfolio.
+      after (Optional[str]): The ID of the last property of the previous page, None for the first page.
+      limit (int): The number of properties to read.
+      fields (Sequence[str]): The property fields to read, from PROPERTY_READ_FIELDS.
+
+    Returns:
+      Optional[tuple[dict[str, Any], list[dict[str, Any]]]]: The portfolio and the projected properties, None if the portfolio does not exist.
+    """
+    prefix = property_prefix(portfolio_id)
+    portfolio_query = (
+        "MATCH (p:Portfolio {portfolio_id: $portfolio_id}) "
+        f"RETURN {projection('p', PORTFOLIO_READ_FIELDS)} AS portfolio"
+    )
+    properties_query = (
+        "MATCH (n:Property) "
+        "WHERE n.property_id > $after AND n.property_id STARTS WITH $prefix "
+        f"RETURN {property_projection(fields)} AS item "
+        "ORDER BY n.property_id LIMIT $limit"
+    )
+
+    async def work(
+        tx: AsyncManagedTransaction,
+    ) -> Optional[tuple[dict[str, Any], list[dict[str, Any]]]]:
+        record = await (await tx.run(portfolio_query, portfolio_id=portfolio_id)).single()
+        if record is None:
+            return None
+
+        result = await tx.run(
+            properties_query,
+            after=max(after or "", prefix),
+            prefix=prefix,
+            limit=limit,
+        )
+        return record["portfolio"], [record["item"] async for record in result]
+
+    return await session.execute_read(work)
+
+
+async def portfolio_exists(session: AsyncSession, portfolio_id: str) -> bool:
+    """Whether a portfolio with the given ID exists"""
+
+    async def work(tx: AsyncManagedTransaction) -> bool:
+        result = await tx.run(
+            "MATCH (p:Portfolio {portfolio_id: $portfolio_id}) RETURN count(p) > 0 AS found",
+            portfolio_id=portfolio_id,
+        )
+        record = await result.single()
+        return bool(record and record["found"])
+
+    return await session.execute_read(work)
+
+
+def property_address(
+    property: dict[str, Any], levels: Sequence[dict[str, Any]]
+) -> Address:
+    """Builds the address of a property node from its fields and the hierarchy levels it is in"""
+    values: dict[str, Any] = {"id": property.get("property_id")}
+    for field in PROPERTY_FIELDS:
+        values[field] = property.get(field)
+    for level in levels:
+        name_field, code_field = LEVEL_FIELDS[level["label"]]
+        values[name_field] = level["name"]
+        if code_field:
+            values[code_field] = level["code"]
+    # The values were validated on import, so the address is built without validation
+    return BaseModel.model_copy(EMPTY_ADDRESS, update=values)
+
+
+async def stream_portfolio_addresses(
+    session: AsyncSession, portfolio_id: str
+) -> AsyncIterator[Address]:
+    """
+    Streams the addresses of the properties of a portfolio ordered by ID.
+
+    Records are pulled from the server `fetch_size` records at a time, as
+    configured on the session, so memory use does not grow with the size of
+    the portfolio. The hierarchy of each property is read from its IN
+    relationships, which hold the names and codes of its own row, with a
+    pattern comprehension rather than an aggregation, so the index order of
+    the properties is kept and nothing has to be sorted before the first
+    record.
+
+    Args:
+      session (AsyncSession): The session to read with, used for one transaction until the stream ends.
+      portfolio_id (str): The ID of the portfolio.
+
+    Returns:
+      AsyncIterator[Address]: The addresses, with the property ID as their ID.
+    """
+    prefix = property_prefix(portfolio_id)
+    query = (
+        "MATCH (n:Property) "
+        "WHERE n.property_id > $prefix AND n.property_id STARTS WITH $prefix "
+        f"RETURN {projection('n', ('property_id',) + PROPERTY_FIELDS)} AS property, "
+        f"{LEVELS_PATTERN} AS levels "
+        "ORDER BY n.property_id"
+    )
+    async with await session.begin_transaction() as tx:
+        result = await tx.run(query, prefix=prefix)
+        async for record in result:
+            yield property_address(record["property"], record["levels"])
@@ -9,5 +9,66 @@ from neomodel import (
     RelationshipFrom,
 )
 
+# The geographic hierarchy. Each node is keyed on the normalized names of its
+# full path, e.g. a city on its country, state, county and name, and is linked
+# with an IN relationship to its nearest known parent, e.g. a city to its
+# county, or to its state when the county is unknown. Properties are linked
+# with an IN relationship to every level of their address, holding the name
+# and code of the level as spelled by the property's row.
+
+
+class Country(StructuredNode):
+    key = StringProperty(unique_index=True)
+    name = StringProperty()
+    code = StringProperty()
+
+
+class State(StructuredNode):
+    key = StringProperty(unique_index=True)
+    name = StringProperty()
+    code = StringProperty()
+
+
+class County(StructuredNode):
+    key = StringProperty(unique_index=True)
+    name = StringProperty()
+
+
+class City(StructuredNode):
+    key = StringProperty(unique_index=True)
+    name = StringProperty()
+
+
+class Neighborhood(StructuredNode):
+    key = StringProperty(unique_index=True)
+    name = StringProperty()
+
+
+class Street(StructuredNode):
+    key = StringProperty(unique_index=True)
+    name = StringProperty()
+
+
 class Property(StructuredNode):
     property_id = StringProperty(unique_index=True)
+    name = StringProperty()
+    unit = StringProperty()
+    house_number = StringProperty()
+    address_line = StringProperty()
+    postal_code = StringProperty()
+    formatted_address = StringProperty()
+    latitude = FloatProperty()
+    longitude = FloatProperty()
+
+    # Integer H3 cells of the property location, one per DEFAULT_H3_RESOLUTIONS
+    h3_res7 = IntegerProperty(index=True)
+    h3_res9 = IntegerProperty(index=True)
+    h3_res15 = IntegerProperty(index=True)
+
+
+class Portfolio(StructuredNode):
+    portfolio_id = StringProperty(unique_index=True)
+    title = StringProperty(required=True)
+    description = StringProperty()
+
+    properties = RelationshipTo(Property, "INCLUDES")
@@ -0,0 +1,315 @@
+import time
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Optional, Sequence
+from loguru import logger
+from neo4j import Driver, ManagedTransaction
+from neo4j.exceptions import DriverError, Neo4jError
+from pfman.models import Address
+from pfman.utils.spatial import DEFAULT_H3_RESOLUTIONS, latlng_to_cells
+
+DEFAULT_GRAPH_BATCH_SIZE = 1_000
+
+DEFAULT_GRAPH_WRITE_RETRIES = 3
+
+# Seconds before the first retry of a failed batch, doubled on every retry
+RETRY_BACKOFF = 0.5
+
+# The levels of the geographic hierarchy, from the top. Each level is keyed on
+# the normalized values of its full path, the levels named by KEY_LEVELS, so a
+# node has one parent: the first of its PARENT_LEVELS present on the address.
+HIERARCHY_LEVELS = ("Country", "State", "County", "City", "Neighborhood", "Street")
+
+KEY_LEVELS: dict[str, tuple[str, ...]] = {
+    "Country": ("Country",),
+    "State": ("Country", "State"),
+    "County": ("Country", "State", "County"),
+    "City": ("Country", "State", "County", "City"),
+    "Neighborhood": ("Country", "State", "County", "City", "Neighborhood"),
+    "Street": ("Country", "State", "County", "City", "Street"),
+}
+
+PARENT_LEVELS: dict[str, tuple[str, ...]] = {
+    "Country": (),
+    "State": ("Country",),
+    "County": ("State", "Country"),
+    "City": ("County", "State", "Country"),
+    "Neighborhood": ("City", "County", "State", "Country"),
+    "Street": ("City", "County", "State", "Country"),
+}
+
+PROPERTY_FIELDS = (
+    "name",
+    "unit",
+    "house_number",
+    "address_line",
+    "postal_code",
+    "formatted_address",
+    "latitude",
+    "longitude",
+)
+
+
+def property_id(portfolio_id: str, row: int) -> str:
+    """The ID of the property imported from a row of a portfolio"""
+    return f"{portfolio_id}:{row}"
+
+
+def hierarchy_levels(address: Address) -> dict[str, tuple[str, dict[str, Any]]]:
+    """
+    Returns the key and properties of each hierarchy level present on an
+    address. The properties are the address's own spelling of the level,
+    which is set on the level node when it is created and on the IN
+    relationship of the property to it.
+    """
+    values = {
+        "Country": address.normalized_country_code or address.normalized_country,
+        "State": address.normalized_state_code or address.normalized_state,
+        "County": address.normalized_county,
+        "City": address.normalized_city,
+        "Neighborhood": address.normalized_neighborhood,
+        "Street": address.normalized_street,
+    }
+    properties: dict[str, dict[str, Any]] = {
+        "Country": {"name": address.country, "code": address.country_code},
+        "State": {"name": address.state, "code": address.state_code},
+        "County": {"name": address.county},
+        "City": {"name": address.city},
+        "Neighborhood": {"name": address.neighborhood},
+        "Street": {"name": address.street},
+    }
+    return {
+        level: (
+            "|".join(values[part] or "" for part in KEY_LEVELS[level]),
+            properties[level],
+        )
+        for level in HIERARCHY_LEVELS
+        if values[level]
+    }
+
+
+def _parent(levels: dict[str, tuple[str, dict[str, Any]]], level: str) -> Optional[tuple[str, str]]:
+    """Returns the label and key of the nearest parent of a level present on an address"""
+    parent = next((parent for parent in PARENT_LEVELS[level] if parent in levels), None)
+    return (parent, levels[parent][0]) if parent else None
+
+
+@dataclass
+class WriteStats:
+    batches: int = 0
+    retries: int = 0
+    nodes: int = 0
+    """The number of nodes merged"""
+    nodes_created: int = 0
+    relationships_created: int = 0
+    seconds: float = 0.0
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+    def add(self, other: "WriteStats"):
+        self.batches += other.batches
+        self.retries += other.retries
+        self.nodes += other.nodes
+        self.nodes_created += other.nodes_created
+        self.relationships_created += other.relationships_created
+        self.seconds += other.seconds
+
+
+class GraphWriter:
+    """
+    Writes portfolios, their properties and the geographic hierarchy of the
+    properties to Neo4j in batches.
+
+    Each batch is written in one managed transaction of parameterized
+    `UNWIND ... MERGE` statements, one per node label and relationship type,
+    so a batch of any size costs a handful of round trips.
+
+    Hierarchy nodes are shared by every property in them and linked to their
+    parent level. Each property is linked to every level of its address, and
+    its IN relationships hold the names and codes of its own row, so reading
+    a property back does not depend on how other rows spelled its places. Batches failing
+    with a retryable error are retried up to `max_retries` times with
+    exponential backoff, on top of the driver's own transaction retries.
+    """
+
+    def __init__(
+        self,
+        driver: Driver,
+        batch_size: int = DEFAULT_GRAPH_BATCH_SIZE,
+        max_retries: int = DEFAULT_GRAPH_WRITE_RETRIES,
+    ):
+        self.driver = driver
+        self.batch_size = max(batch_size, 1)
+        self.max_retries = max_retries
+        self.stats = WriteStats()
+        self._lock = Lock()
+
+    def portfolio_writer(
+        self, portfolio_id: str, title: str, description: Optional[str]
+    ) -> Callable[[Sequence[int], Sequence[Optional[Address]]], int]:
+        """Writes a portfolio node and returns a writer for the chunks of its properties"""
+        self._execute(
+            [
+                (
+                    "MERGE (portfolio:Portfolio {portfolio_id: $portfolio_id}) "
+                    "SET portfolio.title = $title, portfolio.description = $description",
+                    {"portfolio_id": portfolio_id, "title": title, "description": description},
+                )
+            ]
+        )
+        stats = WriteStats()
+
+        def write(rows: Sequence[int], addresses: Sequence[Optional[Address]]) -> int:
+            written = self.write(portfolio_id, rows, addresses, stats)
+            logger.info(
+                f"Portfolio {portfolio_id}: wrote {stats.nodes} nodes in {stats.batches} batches, "
+                f"{stats.nodes_per_second:,.0f} nodes/s, {stats.retries} retries"
+            )
+            return written
+
+        return write
+
+    def write(
+        self,
+        portfolio_id: str,
+        rows: Sequence[int],
+        addresses: Sequence[Optional[Address]],
+        stats: Optional[WriteStats] = None,
+    ) -> int:
+        """
+        Writes the valid addresses of a chunk of rows as properties of a portfolio.
+
+        Args:
+          portfolio_id (str): The ID of the written portfolio.
+          rows (Sequence[int]): The row index of each address in the import.
+          addresses (Sequence[Optional[Address]]): The validated addresses, None for invalid rows.
+          stats (Optional[WriteStats]): Statistics to add the writes to, on top of the writer's totals.
+
+        Returns:
+          int: The number of properties written.
+        """
+        valid = [(row, address) for row, address in zip(rows, addresses) if address]
+        for start in range(0, len(valid), self.batch_size):
+            batch_stats = self._write_batch(portfolio_id, valid[start : start + self.batch_size])
+            with self._lock:
+                self.stats.add(batch_stats)
+            if stats is not None:
+                stats.add(batch_stats)
+        return len(valid)
+
+    def _write_batch(
+        self, portfolio_id: str, batch: Sequence[tuple[int, Address]]
+    ) -> WriteStats:
+        cells = latlng_to_cells(
+            [address.latitude for _, address in batch],  # type: ignore
+            [address.longitude for _, address in batch],  # type: ignore
+            DEFAULT_H3_RESOLUTIONS,
+        )
+
+        nodes: dict[str, dict[str, dict[str, Any]]] = {level: {} for level in HIERARCHY_LEVELS}
+        links: dict[tuple[str, str], dict[tuple[str, str], None]] = {}
+        properties = []
+        property_links: dict[str, list[dict[str, Any]]] = {}
+
+        for position, (row, address) in enumerate(batch):
+            levels = hierarchy_levels(address)
+            for level, (key, values) in levels.items():
+                if key in nodes[level]:
+                    continue
+                nodes[level][key] = {"key": key, "properties": values}
+                if parent := _parent(levels, level):
+                    links.setdefault((level, parent[0]), {})[(key, parent[1])] = None
+
+            pid = property_id(portfolio_id, row)
+            values = {field: getattr(address, field) for field in PROPERTY_FIELDS}
+            if values["house_number"] is not None:
+                values["house_number"] = str(values["house_number"])
+            for resolution in DEFAULT_H3_RESOLUTIONS:
+                values[f"h3_res{resolution}"] = cells[resolution][position]
+            properties.append({"property_id": pid, "properties": values})
+
+            for level, (key, values) in levels.items():
+                property_links.setdefault(level, []).append(
+                    {"child": pid, "parent": key, "properties": values}
+                )
+
+        statements: list[tuple[str, dict[str, Any]]] = []
+        for level in HIERARCHY_LEVELS:
+            if nodes[level]:
+                statements.append(
+                    (
+                        f"UNWIND $nodes AS node MERGE (n:{level} {{key: node.key}}) "
+                        "ON CREATE SET n += node.properties",
+                        {"nodes": list(nodes[level].values())},
+                    )
+                )
+        for (child, parent), pairs in links.items():
+            statements.append(
+                (
+                    "UNWIND $links AS link "
+                    f"MATCH (child:{child} {{key: link.child}}) "
+                    f"MATCH (parent:{parent} {{key: link.parent}}) "
+                    "MERGE (child)-[:IN]->(parent)",
+                    {"links": [{"child": key, "parent": parent} for key, parent in pairs]},
+                )
+            )
+        statements.append(
+            (
+                "MATCH (portfolio:Portfolio {portfolio_id: $portfolio_id}) "
+                "UNWIND $properties AS property "
+                "MERGE (n:Property {property_id: property.property_id}) "
+                "SET n += property.properties "
+                "MERGE (portfolio)-[:INCLUDES]->(n)",
+                {"portfolio_id": portfolio_id, "properties": properties},
+            )
+        )
+        for parent, pairs in property_links.items():
+            statements.append(
+                (
+                    "UNWIND $links AS link "
+                    "MATCH (n:Property {property_id: link.child}) "
+                    f"MATCH (parent:{parent} {{key: link.parent}}) "
+                    "MERGE (n)-[r:IN]->(parent) "
+                    "SET r += link.properties",
+                    {"links": pairs},
+                )
+            )
+
+        stats = self._execute(statements)
+        stats.nodes = len(properties) + sum(map(len, nodes.values()))
+
+        logger.debug(
+            f"Wrote a batch of {stats.nodes} nodes in {stats.seconds:.3f}s "
+            f"({stats.nodes_per_second:,.0f} nodes/s)"
+        )
+        return stats
+
+    def _execute(self, statements: list[tuple[str, dict[str, Any]]]) -> WriteStats:
+        """Runs statements in one managed write transaction, retrying retryable failures"""
+
+        def work(tx: ManagedTransaction) -> list:
+            return [tx.run(query, parameters).consume().counters for query, parameters in statements]
+
+        stats = WriteStats(batches=1)
+        start = time.perf_counter()
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self.driver.session() as session:
+                    counters = session.execute_write(work)
+                break
+            except (Neo4jError, DriverError) as e:
+                if attempt >= self.max_retries or not e.is_retryable():
+                    raise
+                stats.retries += 1
+                delay = RETRY_BACKOFF * 2**attempt
+                logger.warning(f"Graph write failed, retrying in {delay}s: {e}")
+                time.sleep(delay)
+
+        stats.seconds = time.perf_counter() - start
+        stats.nodes_created = sum(counter.nodes_created for counter in counters)
+        stats.relationships_created = sum(
+            counter.relationships_created for counter in counters
+        )
+        return stats
@@ -0,0 +1,33 @@
+from typing import Optional
+from pfman.utils.redis_cache import CacheInvalidator
+from .JobQueue import PortfolioWriter
+
+# The Redis key prefix of the portfolio read cache
+PORTFOLIO_CACHE_PREFIX = "pfman:portfolio-cache"
+
+# The cache namespace of the portfolio list, invalidated when a portfolio is created
+PORTFOLIOS_NAMESPACE = "portfolios"
+
+
+def portfolio_namespace(portfolio_id: str) -> str:
+    """The cache namespace of a portfolio, invalidated whenever it changes"""
+    return f"portfolio:{portfolio_id}"
+
+
+def invalidating_writer(
+    writer: PortfolioWriter, invalidator: CacheInvalidator
+) -> PortfolioWriter:
+    """Wraps a portfolio writer to invalidate the cached reads of what it writes"""
+
+    def portfolio_writer(portfolio_id: str, title: str, description: Optional[str]):
+        write = writer(portfolio_id, title, description)
+        invalidator.invalidate(PORTFOLIOS_NAMESPACE, portfolio_namespace(portfolio_id))
+
+        def write_chunk(rows, addresses) -> int:
+            written = write(rows, addresses)
+            invalidator.invalidate(portfolio_namespace(portfolio_id))
+            return written
+
+        return write_chunk
+
+    return portfolio_writer
@@ -0,0 +1,70 @@
+import hashlib
+import json
+from tempfile import SpooledTemporaryFile
+from typing import Mapping, Optional
+from pfman.models import GEOCODING_ATTRIBUTE, PortfolioImport
+from pfman.utils.csv_stream import CsvStreamDecoder
+from .JobQueue import import_key
+
+# Bytes of an upload kept in memory before it is spooled to disk
+DEFAULT_UPLOAD_MEMORY = 16 * 1024 * 1024
+
+
+class CsvUpload:
+    """
+    Receives the CSV file of an import as it is uploaded, and builds the
+    payload of its import job.
+
+    The payload is a JSON line with the title, description and column mapping,
+    followed by the file as it was received. It is spooled to disk past
+    `max_memory` bytes. The file is hashed as it arrives, for the import key,
+    and decoded to check its header against the mapping and count its rows,
+    so malformed uploads are rejected before a job is created.
+    """
+
+    def __init__(
+        self,
+        title: str,
+        description: Optional[str],
+        mapping: Mapping[str, GEOCODING_ATTRIBUTE],
+        max_memory: int = DEFAULT_UPLOAD_MEMORY,
+    ):
+        self.mapping = dict(mapping)
+        self.rows = 0
+        self._importer = PortfolioImport(mapping)
+        self._decoder = CsvStreamDecoder()
+        self._digest = hashlib.sha256()
+        self._header: Optional[list[str]] = None
+        self._file = SpooledTemporaryFile(max_size=max_memory)
+        header = {"title": title, "description": description, "mapping": self.mapping}
+        self._file.write(json.dumps(header).encode() + b"\n")
+
+    def add(self, data: bytes) -> None:
+        """Adds the next chunk of the file"""
+        self._digest.update(data)
+        self._file.write(data)
+        self._count(self._decoder.feed(data))
+
+    def finish(self) -> None:
+        """Decodes the end of the file, once every chunk was added"""
+        self._count(self._decoder.close())
+        if self._header is None:
+            raise ValueError("The CSV file is empty.")
+
+    @property
+    def import_key(self) -> str:
+        return import_key(self._digest.digest(), self.mapping)
+
+    def payload(self) -> bytes:
+        self._file.seek(0)
+        return self._file.read()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def _count(self, records: list[list[str]]) -> None:
+        if records and self._header is None:
+            self._header = records[0]
+            self._importer.map_header(self._header)
+            self.rows -= 1
+        self.rows += len(records)
@@ -0,0 +1,69 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Optional
+from pfman.models import ImportJob
+from .JobQueue import JobQueue
+
+
+class InProcessJobQueue(JobQueue):
+    """
+    Keeps jobs in memory and runs them on a thread pool of this process. Jobs
+    are lost on restart, so this backend is meant for tests and development.
+    Jobs submitted before `start` run once the workers start.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._jobs: dict[str, ImportJob] = {}
+        self._keys: dict[str, str] = {}
+        self._lock = Lock()
+        self._pending: list[tuple[str, bytes]] = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def get(self, job_id: str) -> Optional[ImportJob]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job.model_copy(deep=True) if job else None
+
+    def save(self, job: ImportJob) -> None:
+        with self._lock:
+            self._jobs[job.id] = job.model_copy(deep=True)
+
+    def delete(self, job_id: str) -> None:
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+    def claim_key(self, key: str, job_id: str) -> Optional[str]:
+        with self._lock:
+            return self._keys.setdefault(key, job_id)
+
+    def take_over_key(
+        self, key: str, job_id: str, holder_id: str, holder: Optional[ImportJob]
+    ) -> bool:
+        with self._lock:
+            if self._keys.get(key) != holder_id or self._jobs.get(holder_id) != holder:
+                return False
+            self._keys[key] = job_id
+            return True
+
+    def push(self, job_id: str, data: bytes) -> None:
+        with self._lock:
+            if self._executor is None:
+                self._pending.append((job_id, data))
+            else:
+                self._executor.submit(self.run, job_id, data)
+
+    def start(self, workers: int) -> None:
+        with self._lock:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max(workers, 1), thread_name_prefix="import-job"
+            )
+            for job_id, data in self._pending:
+                self._executor.submit(self.run, job_id, data)
+            self._pending.clear()
+
+    def stop(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=True)
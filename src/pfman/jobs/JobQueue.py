@@ -0,0 +1,336 @@
+import hashlib
+import json
+import time
+from abc import ABC, abstractmethod
+from datetime import timedelta
+from typing import Any, Callable, Iterator, Mapping, Optional, Sequence
+from uuid import uuid4
+from loguru import logger
+from pfman.geocoders import BatchGeocoder
+from pfman.models import (
+    GEOCODING_ATTRIBUTE,
+    Address,
+    CreatePortfolioPayload,
+    ImportJob,
+    PortfolioImport,
+    RowValidationCache,
+)
+from pfman.models.ImportJob import utcnow
+from pfman.models.PortfolioImport import (
+    DEFAULT_IMPORT_CHUNK_SIZE,
+    DEFAULT_MAX_IMPORT_ERRORS,
+    normalize_header,
+)
+from pfman.utils.csv_stream import CsvStreamDecoder
+
+# Writes the validated addresses of a chunk of rows, returning the number written
+ChunkWriter = Callable[[Sequence[int], Sequence[Optional[Address]]], int]
+
+# Creates a portfolio from its ID, title and description, returning its chunk writer
+PortfolioWriter = Callable[[str, str, Optional[str]], ChunkWriter]
+
+# Seconds without progress after which a running job is considered abandoned
+DEFAULT_STALE_AFTER = 600
+
+# Bytes of a CSV payload decoded at a time by a job
+CSV_READ_SIZE = 1024 * 1024
+
+# Seconds between checks of an in-flight job a blocking submission waits for
+WAIT_POLL_INTERVAL = 0.5
+
+# Seconds a blocking submission waits for an identical import in flight before
+# returning it unfinished
+DEFAULT_WAIT_TIMEOUT = 60
+
+
+def import_key(content_digest: bytes, mapping: Optional[Mapping[str, str]] = None) -> str:
+    """
+    Keys an import on the SHA-256 digest of its content and on its column
+    mapping, leaving out its title and description, so the same file uploaded
+    again with the same mapping gets the same key. Mapped columns are
+    normalized and sorted, so the order of the mapping does not matter.
+    """
+    key = hashlib.sha256(content_digest)
+    if mapping is not None:
+        columns = {normalize_header(column): field for column, field in mapping.items()}
+        key.update(json.dumps(columns, sort_keys=True).encode())
+    return key.hexdigest()
+
+
+def properties_digest(properties: Sequence[Mapping[str, Any]]) -> bytes:
+    """The SHA-256 digest of rows already mapped to address fields, whatever the order of their keys"""
+    content = json.dumps(properties, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(content.encode()).digest()
+
+
+class JobQueue(ABC):
+    """
+    Runs portfolio imports in background workers and tracks their progress.
+
+    `submit` stores a queued `ImportJob` and hands its payload to the
+    backend. A worker then runs the job with `run`, validating the properties
+    in chunks through the `RowValidationCache`, writing each chunk with the
+    portfolio writer and saving the job progress after every chunk. With a
+    `BatchGeocoder`, valid rows without coordinates are geocoded before they
+    are written. Rows are validated by the job only, so submitting is cheap
+    and invalid rows are reported with the job rather than rejected.
+
+    A payload is a JSON line with the `title` and `description` of the
+    portfolio, then either its `properties` already mapped to address fields,
+    or a `mapping` from CSV columns to address fields followed, after the
+    line, by the CSV file, which the job decodes and maps chunk by chunk.
+
+    Imports are idempotent: each job claims the `import_key` of its content,
+    and submitting an import whose key is held by a job in flight or completed
+    returns that job instead of creating another. A blocking submission waits
+    for that job for up to `wait_timeout` seconds. The key of a failed job is
+    taken over by the next submission, so the import can be retried.
+
+    A running job saving no progress for `stale_after` seconds is considered
+    abandoned by a crashed worker, and its import key can be taken over. A job
+    taking over a key writes the portfolio of the job it replaces.
+
+    Backends implement how job state is stored and how payloads reach workers.
+    """
+
+    def __init__(
+        self,
+        cache: RowValidationCache,
+        writer: PortfolioWriter,
+        chunk_size: int = DEFAULT_IMPORT_CHUNK_SIZE,
+        max_errors: int = DEFAULT_MAX_IMPORT_ERRORS,
+        geocoder: Optional[BatchGeocoder] = None,
+        stale_after: float = DEFAULT_STALE_AFTER,
+        wait_timeout: float = DEFAULT_WAIT_TIMEOUT,
+    ):
+        self.cache = cache
+        self.writer = writer
+        self.chunk_size = max(chunk_size, 1)
+        self.max_errors = max_errors
+        self.geocoder = geocoder
+        self.stale_after = timedelta(seconds=stale_after)
+        self.wait_timeout = wait_timeout
+
+    def submit(self, payload: CreatePortfolioPayload, background: bool = True) -> ImportJob:
+        """
+        Creates the import job of a portfolio, unless an identical import is in
+        flight or completed.
+
+        Args:
+          payload (CreatePortfolioPayload): The portfolio to import.
+          background (bool): Whether to queue the job for the workers rather than run it now. Defaults to True.
+
+        Returns:
+          ImportJob: The queued job, or the finished job when not run in the background. For an identical import, its job, once finished or after `wait_timeout` when not in the background.
+        """
+        return self.submit_payload(
+            payload.model_dump_json(round_trip=True, exclude_none=True).encode(),
+            import_key(properties_digest(payload.properties)),
+            len(payload.properties),
+            background,
+        )
+
+    def submit_payload(
+        self, data: bytes, key: str, total_rows: int, background: bool = True
+    ) -> ImportJob:
+        """
+        Creates an import job from its serialized payload, unless an import with
+        the same key is in flight or completed.
+
+        Args:
+          data (bytes): The payload, the JSON of a `CreatePortfolioPayload` or a `CsvUpload` payload.
+          key (str): The import key of the payload.
+          total_rows (int): The number of rows of the payload.
+          background (bool): Whether to queue the job for the workers rather than run it now. Defaults to True.
+
+        Returns:
+          ImportJob: The job, as returned by `submit`.
+        """
+        job = ImportJob(
+            id=uuid4().hex,
+            portfolio_id=uuid4().hex,
+            total_rows=total_rows,
+            import_key=key,
+        )
+        # Saved before its key is claimed, so a job holding a key can always be read
+        self.save(job)
+
+        existing = self._claim(job)
+        if existing is not None:
+            # The job lost its key before anyone could see it
+            self.delete(job.id)
+            logger.info(f"Import {job.import_key} is held by job {existing.id}, attaching to it")
+            return existing if background else self.wait(existing.id) or existing
+
+        if not background:
+            return self.run(job.id, data) or job
+
+        self.push(job.id, data)
+        return job
+
+    def run(self, job_id: str, data: bytes) -> Optional[ImportJob]:
+        """Runs a queued job from its payload, returning its final state"""
+        job = self.get(job_id)
+        if job is None:
+            logger.warning(f"Import job {job_id} expired before it ran")
+            return None
+
+        job.status = "running"
+        job.started_at = job.updated_at = utcnow()
+        self.save(job)
+
+        try:
+            header, _, content = data.partition(b"\n")
+            payload = json.loads(header)
+            write = self.writer(job.portfolio_id, payload["title"], payload.get("description"))
+
+            if "mapping" in payload:
+                chunks = self._csv_chunks(payload["mapping"], content)
+            else:
+                rows = payload["properties"]
+                chunks = (
+                    (start, rows[start : start + self.chunk_size])
+                    for start in range(0, len(rows), self.chunk_size)
+                )
+
+            for start, chunk in chunks:
+                validation = self.cache.validate(chunk)
+                addresses = validation.addresses
+                if self.geocoder:
+                    addresses, geocoded = self.geocoder.fill_coordinates(addresses)
+                    job.geocoded_rows += geocoded
+                write(range(start, start + len(chunk)), addresses)
+
+                job.add_chunk(start, len(chunk), validation, self.max_errors)
+                job.updated_at = utcnow()
+                self.save(job)
+
+            job.status = "completed"
+        except Exception as e:
+            logger.exception(f"Import job {job_id} failed")
+            job.status = "failed"
+            job.failure = str(e)
+
+        job.finished_at = job.updated_at = utcnow()
+        self.save(job)
+        return job
+
+    def _csv_chunks(
+        self, mapping: Mapping[str, GEOCODING_ATTRIBUTE], content: bytes
+    ) -> Iterator[tuple[int, list[dict[str, Any]]]]:
+        """Decodes and maps the CSV file of a payload, yielding chunks of rows with their offset"""
+        importer = PortfolioImport(mapping, self.chunk_size)
+        decoder = CsvStreamDecoder()
+        start = 0
+        for offset in range(0, len(content), CSV_READ_SIZE):
+            for chunk in importer.add(decoder.feed(content[offset : offset + CSV_READ_SIZE])):
+                yield start, chunk
+                start += len(chunk)
+        for chunk in importer.add(decoder.close()) + importer.finish():
+            yield start, chunk
+            start += len(chunk)
+
+    def is_stale(self, job: ImportJob) -> bool:
+        """Whether a job is running without having saved progress for `stale_after`"""
+        return job.status == "running" and utcnow() - job.updated_at > self.stale_after
+
+    def wait(self, job_id: str) -> Optional[ImportJob]:
+        """
+        Waits for a job to complete or fail, for up to `wait_timeout` seconds.
+
+        Returns:
+          Optional[ImportJob]: The final state of the job, its state in flight if it did not finish in time, None if it expired.
+        """
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            job = self.get(job_id)
+            if (
+                job is None
+                or job.status in ("completed", "failed")
+                or time.monotonic() >= deadline
+            ):
+                return job
+            time.sleep(WAIT_POLL_INTERVAL)
+
+    def _claim(self, job: ImportJob) -> Optional[ImportJob]:
+        """
+        Claims the import key of a saved job, returning the live job holding it if any.
+
+        A holder that failed, expired or was abandoned is taken over. The job
+        then writes the portfolio of the holder again rather than a new one:
+        properties are merged on their portfolio ID and row, so the rows the
+        holder wrote are not duplicated.
+        """
+        key: str = job.import_key  # type: ignore
+        while True:
+            holder = self.claim_key(key, job.id)
+            if holder == job.id:
+                return None
+            if holder is None:
+                continue
+
+            existing = self.get(holder)
+            if existing is not None and existing.status != "failed" and not self.is_stale(existing):
+                return existing
+
+            if existing is not None and job.portfolio_id != existing.portfolio_id:
+                job.portfolio_id = existing.portfolio_id
+                self.save(job)
+            if self.take_over_key(key, job.id, holder, existing):
+                return None
+
+    @abstractmethod
+    def claim_key(self, key: str, job_id: str) -> Optional[str]:
+        """
+        Records a job as the holder of an import key, unless another job holds it.
+
+        Returns:
+          Optional[str]: The ID of the job holding the key, `job_id` if claimed, None if the holder just released it.
+        """
+        pass
+
+    @abstractmethod
+    def take_over_key(
+        self, key: str, job_id: str, holder_id: str, holder: Optional[ImportJob]
+    ) -> bool:
+        """
+        Records a job as the holder of an import key in place of `holder_id`, as
+        one atomic change, so a worker recovering the holder does not run it too.
+
+        Args:
+          key (str): The import key.
+          job_id (str): The job taking the key over.
+          holder_id (str): The job holding the key.
+          holder (Optional[ImportJob]): The state of the holder that was read, None if it expired.
+
+        Returns:
+          bool: Whether the key was taken over, False if it changed hands or the holder changed state since it was read.
+        """
+        pass
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[ImportJob]:
+        """Returns the current state of a job, None if it is unknown or expired"""
+        pass
+
+    @abstractmethod
+    def save(self, job: ImportJob) -> None:
+        pass
+
+    @abstractmethod
+    def delete(self, job_id: str) -> None:
+        """Forgets a job that was never queued"""
+        pass
+
+    @abstractmethod
+    def push(self, job_id: str, data: bytes) -> None:
+        """Hands the payload of a saved job to the workers"""
+        pass
+
+    def start(self, workers: int) -> None:
+        """Starts `workers` worker threads in this process"""
+        pass
+
+    def stop(self) -> None:
+        """Stops the worker threads, letting running jobs finish"""
+        pass
@@ -0,0 +1,230 @@
+import time
+from threading import Event, Thread
+from typing import Optional
+from loguru import logger
+from pfman.models import ImportJob
+from pfman.models.ImportJob import utcnow
+from redis import Redis
+from redis.client import Pipeline
+from .JobQueue import JobQueue
+
+DEFAULT_JOB_TTL = 24 * 60 * 60
+
+# Seconds a worker blocks waiting for a job before checking whether to stop
+POLL_TIMEOUT = 1
+
+# Seconds between a worker's checks for jobs abandoned by crashed workers
+RECOVERY_INTERVAL = 60
+
+
+class RedisJobQueue(JobQueue):
+    """
+    Stores jobs in Redis and queues their payloads on a Redis list, so jobs can
+    be run by worker threads of the API process or by separate `jobs worker`
+    processes, and their state is visible to every API process. Job state,
+    payloads and import keys expire after `ttl` seconds.
+
+    A worker moves the ID of the job it takes to a processing list, and keeps
+    its payload until the job finishes. Workers periodically queue again the
+    jobs of that list that made no progress for `stale_after`, so the jobs of
+    a crashed worker are run by another one, unless a new submission of the
+    same import took it over first.
+    """
+
+    def __init__(
+        self,
+        client: Redis,
+        *args,
+        ttl: int = DEFAULT_JOB_TTL,
+        prefix: str = "pfman:import",
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.client = client
+        self.ttl = ttl
+        self.queue_key = f"{prefix}:queue"
+        self.processing_key = f"{prefix}:processing"
+        self.prefix = prefix
+        self._stopping = Event()
+        self._workers: list[Thread] = []
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self.prefix}:job:{job_id}"
+
+    def _payload_key(self, job_id: str) -> str:
+        return f"{self.prefix}:payload:{job_id}"
+
+    def _import_key(self, key: str) -> str:
+        return f"{self.prefix}:key:{key}"
+
+    def claim_key(self, key: str, job_id: str) -> Optional[str]:
+        name = self._import_key(key)
+        if self.client.set(name, job_id, nx=True, ex=self.ttl):
+            return job_id
+        holder = self.client.get(name)
+        return holder.decode() if holder else None  # type: ignore
+
+    def take_over_key(
+        self, key: str, job_id: str, holder_id: str, holder: Optional[ImportJob]
+    ) -> bool:
+        name = self._import_key(key)
+        job_key = self._job_key(holder_id)
+
+        def replace_if_unchanged(pipeline: Pipeline) -> bool:
+            current = pipeline.get(name)
+            state = pipeline.get(job_key)
+            pipeline.multi()
+            if current is None or current.decode() != holder_id:  # type: ignore
+                return False
+            if (ImportJob.model_validate_json(state) if state else None) != holder:  # type: ignore
+                return False
+            pipeline.set(name, job_id, ex=self.ttl)
+            return True
+
+        # Watching the state of the holder makes this exclusive with its recovery
+        return self.client.transaction(
+            replace_if_unchanged, name, job_key, value_from_callable=True
+        )
+
+    def get(self, job_id: str) -> Optional[ImportJob]:
+        data = self.client.get(self._job_key(job_id))
+        return ImportJob.model_validate_json(data) if data else None  # type: ignore
+
+    def save(self, job: ImportJob) -> None:
+        self.client.set(self._job_key(job.id), job.model_dump_json(), ex=self.ttl)
+
+    def delete(self, job_id: str) -> None:
+        self.client.delete(self._job_key(job_id))
+
+    def push(self, job_id: str, data: bytes) -> None:
+        pipeline = self.client.pipeline()
+        pipeline.set(self._payload_key(job_id), data, ex=self.ttl)
+        pipeline.lpush(self.queue_key, job_id)
+        pipeline.execute()
+
+    def work(self, stop: Event) -> None:
+        """Runs queued jobs one at a time until `stop` is set"""
+        recovered_at = 0.0
+        while not stop.is_set():
+            try:
+                if time.monotonic() - recovered_at >= RECOVERY_INTERVAL:
+                    recovered_at = time.monotonic()
+                    self.recover()
+
+                item = self.client.blmove(
+                    self.queue_key, self.processing_key, POLL_TIMEOUT, "RIGHT", "LEFT"
+                )
+                if not item:
+                    continue
+
+                job_id = item.decode()  # type: ignore
+                data = self.client.get(self._payload_key(job_id))
+            except Exception:
+                logger.exception("Failed to fetch an import job from Redis")
+                stop.wait(POLL_TIMEOUT)
+                continue
+
+            if data is None:
+                logger.warning(f"Payload of import job {job_id} expired before it ran")
+            else:
+                self.run(job_id, data)  # type: ignore
+            self._finish(job_id)
+
+    def recover(self) -> int:
+        """
+        Queues again the jobs taken by workers that made no progress for
+        `stale_after`, and forgets those that finished or expired.
+
+        Returns:
+          int: The number of jobs queued again.
+        """
+        requeued = 0
+        for item in self.client.lrange(self.processing_key, 0, -1):  # type: ignore
+            job_id = item.decode()
+            job = self.get(job_id)
+            if job is not None and job.status in ("queued", "running"):
+                if utcnow() - job.updated_at > self.stale_after and self._requeue(job):
+                    requeued += 1
+            else:
+                self._finish(job_id)
+        return requeued
+
+    def _requeue(self, job: ImportJob) -> bool:
+        """
+        Queues an abandoned job again, unless it saved progress or was recovered
+        since it was read. A job whose import key was taken over by another
+        submission fails instead, as that job writes its portfolio.
+        """
+        job_key = self._job_key(job.id)
+        watched = [job_key]
+        if job.import_key:
+            watched.append(self._import_key(job.import_key))
+
+        def requeue(pipeline: Pipeline) -> Optional[str]:
+            state = pipeline.get(job_key)
+            holder = pipeline.get(watched[1]) if job.import_key else None
+            pipeline.multi()
+            if state is None or ImportJob.model_validate_json(state) != job:  # type: ignore
+                return None
+
+            pipeline.lrem(self.processing_key, 1, job.id)
+            taken_over_by = holder.decode() if holder is not None else job.id  # type: ignore
+            if taken_over_by != job.id:
+                failed = job.model_copy(
+                    update={
+                        "status": "failed",
+                        "failure": f"Abandoned, its import was taken over by job {taken_over_by}",
+                        "finished_at": utcnow(),
+                        "updated_at": utcnow(),
+                    }
+                )
+                pipeline.set(job_key, failed.model_dump_json(), ex=self.ttl)
+                pipeline.delete(self._payload_key(job.id))
+                return taken_over_by
+
+            fresh = ImportJob(
+                id=job.id,
+                portfolio_id=job.portfolio_id,
+                total_rows=job.total_rows,
+                import_key=job.import_key,
+                created_at=job.created_at,
+            )
+            pipeline.set(job_key, fresh.model_dump_json(), ex=self.ttl)
+            if job.import_key:
+                # Claims the key again, in case it expired
+                pipeline.set(watched[1], job.id, ex=self.ttl)
+            pipeline.lpush(self.queue_key, job.id)
+            return job.id
+
+        # Watching the job and its import key makes this exclusive with other
+        # recoveries, progress saved by a live worker and take-overs
+        outcome = self.client.transaction(requeue, *watched, value_from_callable=True)
+        if outcome == job.id:
+            logger.warning(f"Import job {job.id} was abandoned, queuing it again")
+        elif outcome is not None:
+            logger.warning(f"Import job {job.id} was abandoned and taken over by job {outcome}")
+        return outcome == job.id
+
+    def _finish(self, job_id: str) -> None:
+        pipeline = self.client.pipeline()
+        pipeline.lrem(self.processing_key, 1, job_id)
+        pipeline.delete(self._payload_key(job_id))
+        pipeline.execute()
+
+    def start(self, workers: int) -> None:
+        self._stopping.clear()
+        for index in range(workers):
+            worker = Thread(
+                target=self.work,
+                args=(self._stopping,),
+                name=f"import-job-{index}",
+                daemon=True,
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def stop(self) -> None:
+        self._stopping.set()
+        for worker in self._workers:
+            worker.join()
+        self._workers.clear()
@@ -0,0 +1,12 @@
+from .CsvUpload import CsvUpload
+from .InProcessJobQueue import InProcessJobQueue
+from .JobQueue import JobQueue, PortfolioWriter
+from .RedisJobQueue import RedisJobQueue
+
+__all__ = [
+    "CsvUpload",
+    "InProcessJobQueue",
+    "JobQueue",
+    "PortfolioWriter",
+    "RedisJobQueue",
+]
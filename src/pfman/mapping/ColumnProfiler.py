@@ -0,0 +1,230 @@
+import math
+import random
+import re
+from collections import Counter
+from itertools import product, zip_longest
+from typing import Iterable, Optional
+from pfman.models import ColumnProfile, CsvProfile
+from pfman.models.ColumnProfile import COLUMN_HINT, VALUE_KIND
+from pfman.models.PortfolioImport import normalize_header
+from pfman.utils.cardinality import CardinalityEstimator
+from pfman.utils.geo import get_country
+from pfman.utils.string import FLOAT_REGEX, INT_REGEX
+
+# Values standing for a missing value, in any case
+NULL_TOKENS = ("", "-", "n/a", "na", "nan", "none", "null")
+
+# Every spelling of the null tokens, and blank values, so the nulls of a chunk
+# are found with one set intersection
+NULL_VALUES = frozenset(
+    {
+        "".join(spelling)
+        for token in NULL_TOKENS
+        for spelling in product(*({char.lower(), char.upper()} for char in token))
+    }
+    | {" " * width for width in range(1, 9)}
+    | {"\t"}
+)
+
+# Share of the profiled values a column needs of a kind to be hinted as such
+HINT_SHARE = 0.9
+
+# Number of distinct values whose kind is remembered during a profile
+_KIND_CACHE_SIZE = 100_000
+
+# Postal codes that are not plain integers: ZIP+4 and other separated digit
+# groups, British, Canadian and Dutch codes
+_POSTAL_CODE = re.compile(
+    r"\d{3,5}[ -]\d{3,4}"
+    r"|[a-z]{1,2}\d[a-z\d]? ?\d[a-z]{2}"
+    r"|[a-z]\d[a-z] ?\d[a-z]\d"
+    r"|\d{4} ?[a-z]{2}",
+    re.IGNORECASE,
+)
+
+ValueKind = tuple[VALUE_KIND, Optional[float]]
+
+
+def value_kind(value: str) -> ValueKind:
+    """
+    Classifies a non-null CSV value without parsing it more than needed.
+
+    Args:
+      value (str): The value.
+
+    Returns:
+      ValueKind: The kind of the value, and its number if it is numeric.
+    """
+    value = value.strip()
+    if INT_REGEX.fullmatch(value):
+        return "integer", float(value)
+    if FLOAT_REGEX.fullmatch(value):
+        number = float(value)
+        return ("decimal", number) if math.isfinite(number) else ("text", None)
+    if value.endswith("%") and FLOAT_REGEX.fullmatch(value[:-1]):
+        return "percentage", None
+    if len(value) in (2, 3) and value.isascii() and value.isalpha():
+        if get_country(code=value) is not None:
+            return "country_code", None
+    if _POSTAL_CODE.fullmatch(value):
+        return "postal_code", None
+    return "text", None
+
+
+class _Column:
+    def __init__(self, name: str):
+        self.name = name
+        self.nulls = 0
+        self.distinct = CardinalityEstimator()
+        self.kinds: Counter[VALUE_KIND] = Counter()
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add_kind(self, kind: ValueKind, count: int) -> None:
+        self.kinds[kind[0]] += count
+        number = kind[1]
+        if number is not None:
+            self.min = number if self.min is None else min(self.min, number)
+            self.max = number if self.max is None else max(self.max, number)
+
+    def profile(self, rows: int) -> ColumnProfile:
+        profiled = sum(self.kinds.values())
+        non_null = rows - self.nulls
+        distinct = self.distinct.count()
+
+        def share(*kinds: VALUE_KIND) -> float:
+            return sum(self.kinds[kind] for kind in kinds) / profiled if profiled else 0.0
+
+        hints: list[COLUMN_HINT] = []
+        if rows and self.nulls / rows >= HINT_SHARE:
+            hints.append("mostly_empty")
+        if share("integer", "decimal") >= HINT_SHARE:
+            hints.append("numeric")
+            if share("decimal") >= 0.5 and self.min is not None and self.max is not None:
+                if -90 <= self.min and self.max <= 90:
+                    hints.append("latitude")
+                if -180 <= self.min and self.max <= 180:
+                    hints.append("longitude")
+        if share("country_code") >= HINT_SHARE:
+            hints.append("country_code")
+        if share("postal_code") >= HINT_SHARE:
+            hints.append("postal_code")
+        if non_null > 1 and distinct >= 0.99 * non_null:
+            hints.append("unique")
+
+        return ColumnProfile(
+            name=self.name,
+            nulls=self.nulls,
+            null_rate=self.nulls / rows if rows else 0.0,
+            distinct=distinct,
+            distinct_exact=self.distinct.exact,
+            types=dict(self.kinds),
+            min=self.min,
+            max=self.max,
+            hints=hints,
+        )
+
+
+class ColumnProfiler:
+    """
+    Profiles the columns of a CSV file in one pass over its records, as they are
+    read.
+
+    The first record is the header. Records are transposed a chunk at a time,
+    and each column's values are counted, so work is done once per distinct
+    value of a chunk rather than once per cell. Nulls and distinct values are
+    counted over every row, distinct values exactly up to a limit and estimated
+    beyond it. Value kinds and numeric ranges are profiled over every row, or
+    with `sample_size` over a reservoir sample of that many rows, kept with
+    Algorithm L so rows outside the sample cost nothing.
+    """
+
+    def __init__(self, sample_size: int = 0, seed: Optional[int] = None):
+        self.sample_size = max(sample_size, 0)
+        self.rows = 0
+        self._random = random.Random(seed)
+        self._columns: Optional[list[_Column]] = None
+        self._kinds: dict[str, ValueKind] = {}
+        self._reservoir: list[list[str]] = []
+        self._weight = 1.0
+        self._next = 0
+
+    def add(self, records: Iterable[list[str]]) -> None:
+        """Profiles records, the first one being the header"""
+        records = iter(records)
+        if self._columns is None:
+            header = next(records, None)
+            if header is None:
+                return
+            self._columns = [_Column(normalize_header(name)) for name in header]
+
+        rows = list(records)
+        if not rows:
+            return
+
+        transposed = list(zip_longest(*rows, fillvalue=""))
+        for index, column in enumerate(self._columns):
+            counts = Counter(transposed[index] if index < len(transposed) else ())
+            missing = len(rows) - counts.total()
+            if missing:
+                counts[""] += missing
+
+            for value in counts.keys() & NULL_VALUES:
+                column.nulls += counts.pop(value)
+            column.distinct.update(counts.keys())
+            if not self.sample_size:
+                for value, count in counts.items():
+                    column.add_kind(self._kind(value), count)
+
+        if self.sample_size:
+            self._sample(rows)
+        self.rows += len(rows)
+
+    def finish(self) -> CsvProfile:
+        """Profiles the reservoir sample, if any, and returns the profile of every column"""
+        if self._columns is None:
+            raise ValueError("The CSV file is empty.")
+
+        for row in self._reservoir:
+            for index, column in enumerate(self._columns):
+                value = row[index] if index < len(row) else ""
+                if value not in NULL_VALUES:
+                    column.add_kind(self._kind(value), 1)
+
+        return CsvProfile(
+            rows=self.rows,
+            sampled_rows=len(self._reservoir) if self.sample_size else None,
+            columns=[column.profile(self.rows) for column in self._columns],
+        )
+
+    def _kind(self, value: str) -> ValueKind:
+        kind = self._kinds.get(value)
+        if kind is None:
+            kind = value_kind(value)
+            if len(self._kinds) < _KIND_CACHE_SIZE:
+                self._kinds[value] = kind
+        return kind
+
+    def _log_random(self) -> float:
+        return math.log(self._random.random() or 5e-324)
+
+    def _skip(self) -> int:
+        """The number of rows to pass over before the next one enters the sample"""
+        return math.floor(self._log_random() / math.log1p(-self._weight))
+
+    def _sample(self, rows: list[list[str]]) -> None:
+        size = self.sample_size
+        start = self.rows
+        if len(self._reservoir) < size:
+            fill = min(size - len(self._reservoir), len(rows))
+            self._reservoir.extend(rows[:fill])
+            if len(self._reservoir) < size:
+                return
+            self._weight = math.exp(self._log_random() / size)
+            self._next = start + fill + self._skip()
+
+        end = start + len(rows)
+        while self._next < end:
+            self._reservoir[self._random.randrange(size)] = rows[self._next - start]
+            self._weight *= math.exp(self._log_random() / size)
+            self._next += self._skip() + 1
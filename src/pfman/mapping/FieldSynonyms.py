@@ -0,0 +1,145 @@
+from typing import Dict, Tuple
+from pfman.models import GEOCODING_ATTRIBUTE
+
+# Column headers commonly used for each address field. The field name itself is
+# always a synonym of the field.
+FIELD_SYNONYMS: Dict[GEOCODING_ATTRIBUTE, Tuple[str, ...]] = {
+    "id": (
+        "identifier",
+        "prop id",
+        "property id",
+        "asset id",
+        "asset",
+        "asset number",
+        "building id",
+        "site id",
+        "location id",
+        "reference",
+        "ref",
+    ),
+    "name": (
+        "building name",
+        "property name",
+        "asset name",
+        "site name",
+        "location name",
+        "title",
+    ),
+    "unit": (
+        "unit number",
+        "unit no",
+        "suite",
+        "apartment",
+        "apt",
+        "flat",
+        "floor",
+    ),
+    "house_number": (
+        "house no",
+        "houseno",
+        "number",
+        "street number",
+        "street no",
+        "building no",
+        "building number",
+        "bldg no",
+        "civic number",
+    ),
+    "street": (
+        "street name",
+        "road",
+        "rd",
+        "avenue",
+        "ave",
+        "boulevard",
+        "blvd",
+        "drive",
+        "lane",
+        "way",
+        "thoroughfare",
+    ),
+    "address_line": (
+        "address",
+        "address 1",
+        "address line 1",
+        "addr",
+        "addr 1",
+        "addr line 1",
+        "line 1",
+        "street address",
+        "address line",
+    ),
+    "neighborhood": (
+        "neighbourhood",
+        "district",
+        "area",
+        "suburb",
+        "quarter",
+    ),
+    "city": (
+        "town",
+        "locality",
+        "municipality",
+        "city name",
+        "place",
+    ),
+    "county": (
+        "parish",
+        "borough",
+        "county name",
+    ),
+    "state": (
+        "province",
+        "region",
+        "territory",
+        "state name",
+        "state province",
+        "prefecture",
+    ),
+    "state_code": (
+        "state abbreviation",
+        "state abbr",
+        "province code",
+        "region code",
+    ),
+    "country": (
+        "nation",
+        "country name",
+    ),
+    "country_code": (
+        "iso country",
+        "country iso",
+        "iso code",
+        "iso2",
+        "iso3",
+    ),
+    "postal_code": (
+        "zip",
+        "zip code",
+        "zipcode",
+        "postcode",
+        "post code",
+        "postal",
+        "pin code",
+    ),
+    "formatted_address": (
+        "full address",
+        "complete address",
+        "address full",
+        "full addr",
+    ),
+    "latitude": (
+        "lat",
+        "y",
+        "y coordinate",
+        "lat dd",
+    ),
+    "longitude": (
+        "lng",
+        "lon",
+        "long",
+        "x",
+        "x coordinate",
+        "lon dd",
+    ),
+}
@@ -0,0 +1,285 @@
+import hashlib
+import re
+from collections import Counter
+from functools import cache
+from typing import Any, Callable, Mapping, Optional, Sequence, get_args
+from pfman.models import (
+    GEOCODING_ATTRIBUTE,
+    ColumnSuggestion,
+    FieldScore,
+    MappingSuggestion,
+)
+from pfman.models.PortfolioImport import normalize_header
+from pfman.utils.cache import LRUCache
+from pfman.utils.geo import get_country
+from pfman.utils.string import camel_to_snake, parse_float
+from .FieldSynonyms import FIELD_SYNONYMS
+
+DEFAULT_MAPPING_CACHE_SIZE = 1_000
+DEFAULT_SAMPLE_ROWS = 200
+
+# Columns scoring lower than this for every field are left unmapped
+MIN_SCORE = 0.5
+
+# Score of a header with a word that is a one-word synonym of a field, as in "Building ID"
+TOKEN_SCORE = 0.75
+
+# N-gram similarities lower than this are noise rather than evidence
+MIN_NGRAM_SCORE = 0.3
+
+# Share of the score given by the sampled values, for fields that can be told from them
+VALUE_WEIGHT = 0.4
+
+MAX_ALTERNATIVES = 3
+
+_NON_ALPHANUMERIC = re.compile(r"[^a-z0-9]+")
+_LETTER_DIGIT = re.compile(r"(?<=[a-z])(?=[0-9])|(?<=[0-9])(?=[a-z])")
+_HOUSE_NUMBER = re.compile(r"^\d{1,6}[a-z]?(?:\s*-\s*\d{1,6}[a-z]?)?$", re.IGNORECASE)
+_POSTAL_CODE = re.compile(r"^(?=.*\d)[a-z0-9][a-z0-9 -]{2,9}$", re.IGNORECASE)
+_CODE = re.compile(r"^[a-z0-9]{1,3}$", re.IGNORECASE)
+_NAME = re.compile(r"^[^\W\d_][^\W\d_ .'-]*(?:[ .'-]+[^\W\d_]+)*$")
+
+
+def header_words(header: str) -> str:
+    """Lowercases a header into space-separated words, splitting camelCase and digits"""
+    words = camel_to_snake(normalize_header(header)).lower()
+    return _NON_ALPHANUMERIC.sub(" ", _LETTER_DIGIT.sub(" ", words)).strip()
+
+
+def _trigrams(phrase: str) -> set[str]:
+    padded = f" {phrase.replace(' ', '')} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def _coordinate(limit: float) -> Callable[[str], bool]:
+    def matches(value: str) -> bool:
+        number = parse_float(value)
+        return number is not None and "." in value and -limit <= number <= limit
+
+    return matches
+
+
+def _country_code(value: str) -> bool:
+    return value.isalpha() and len(value) in (2, 3) and get_country(code=value) is not None
+
+
+def _country_name(value: str) -> bool:
+    return len(value) > 3 and get_country(name=value) is not None
+
+
+# Tell fields with a recognizable value format apart, such as a country column
+# holding ISO codes rather than names. Each returns whether a value fits the field.
+VALUE_DETECTORS: dict[GEOCODING_ATTRIBUTE, Callable[[str], bool]] = {
+    "latitude": _coordinate(90),
+    "longitude": _coordinate(180),
+    "country_code": _country_code,
+    "country": _country_name,
+    "state_code": lambda value: bool(_CODE.match(value)),
+    "state": lambda value: len(value) > 3 and bool(_NAME.match(value)),
+    "postal_code": lambda value: bool(_POSTAL_CODE.match(value)),
+    "house_number": lambda value: bool(_HOUSE_NUMBER.match(value)),
+}
+
+
+class _HeaderIndex:
+    """
+    Synonym and character trigram tables over `FIELD_SYNONYMS`, built once.
+
+    Headers are matched exactly against the synonyms, word by word against the
+    one-word synonyms, and otherwise by the Dice similarity of their trigrams
+    with those of each synonym, found through an inverted trigram index.
+    """
+
+    def __init__(self):
+        self.fields: list[GEOCODING_ATTRIBUTE] = list(get_args(GEOCODING_ATTRIBUTE))
+        self.by_phrase: dict[str, GEOCODING_ATTRIBUTE] = {}
+        self.by_word: dict[str, GEOCODING_ATTRIBUTE] = {}
+        self.synonyms: list[tuple[GEOCODING_ATTRIBUTE, int]] = []
+        self.by_trigram: dict[str, list[int]] = {}
+
+        for field in self.fields:
+            for synonym in (field, *FIELD_SYNONYMS.get(field, ())):
+                phrase = header_words(synonym)
+                self.by_phrase.setdefault(phrase.replace(" ", ""), field)
+                if " " not in phrase and len(phrase) > 1:
+                    self.by_word.setdefault(phrase, field)
+
+                trigrams = _trigrams(phrase)
+                for trigram in trigrams:
+                    self.by_trigram.setdefault(trigram, []).append(len(self.synonyms))
+                self.synonyms.append((field, len(trigrams)))
+
+    def score(self, header: str) -> dict[GEOCODING_ATTRIBUTE, float]:
+        """Scores a header against every field it resembles"""
+        phrase = header_words(header)
+        scores: dict[GEOCODING_ATTRIBUTE, float] = {}
+        if not phrase:
+            return scores
+
+        exact = self.by_phrase.get(phrase.replace(" ", ""))
+        if exact:
+            scores[exact] = 1.0
+
+        for word in phrase.split():
+            field = self.by_word.get(word)
+            if field and scores.get(field, 0.0) < TOKEN_SCORE:
+                scores[field] = TOKEN_SCORE
+
+        trigrams = _trigrams(phrase)
+        shared = Counter(
+            synonym for trigram in trigrams for synonym in self.by_trigram.get(trigram, ())
+        )
+        for synonym, count in shared.items():
+            field, size = self.synonyms[synonym]
+            similarity = 2 * count / (len(trigrams) + size)
+            if similarity >= MIN_NGRAM_SCORE and scores.get(field, 0.0) < similarity:
+                scores[field] = similarity
+        return scores
+
+
+@cache
+def _header_index() -> _HeaderIndex:
+    return _HeaderIndex()
+
+
+def header_signature(headers: Sequence[str]) -> str:
+    """Hashes a set of headers, regardless of their order"""
+    return hashlib.sha1(
+        "\x1f".join(sorted({normalize_header(header) for header in headers})).encode()
+    ).hexdigest()
+
+
+def _reorder(suggestion: MappingSuggestion, headers: Sequence[str]) -> MappingSuggestion:
+    """
+    Lays out a cached suggestion for the headers of a request, which share its
+    signature but may come in another order, or with other surrounding spaces
+    and byte order marks.
+    """
+    by_header = {normalize_header(column.header): column for column in suggestion.columns}
+    columns = []
+    seen: set[str] = set()
+    for header in dict.fromkeys(headers):
+        name = normalize_header(header)
+        column = by_header[name]
+        if name in seen:
+            # Only one of the headers that differ by their spaces keeps the field
+            column = ColumnSuggestion(header=header, alternatives=column.alternatives)
+        seen.add(name)
+        columns.append(column.model_copy(update={"header": header}))
+
+    return MappingSuggestion(
+        columns=columns,
+        mapping={column.header: column.field for column in columns if column.field},
+        cached=True,
+    )
+
+
+def _value_scores(values: Sequence[str]) -> dict[GEOCODING_ATTRIBUTE, float]:
+    """The share of sampled values fitting each field with a recognizable format"""
+    return {
+        field: sum(map(matches, values)) / len(values)
+        for field, matches in VALUE_DETECTORS.items()
+    }
+
+
+class MappingSuggester:
+    """
+    Suggests how to map CSV columns to address fields, from their headers and a
+    sample of their values.
+
+    Each header is scored against every field through a synonym and trigram
+    index. When values are sampled, fields with a recognizable format (such as
+    coordinates or ISO country codes) are also scored on the share of values
+    fitting them, which tells apart columns whose headers look alike. Columns
+    are then assigned the best scoring fields, each field to one column at most.
+
+    Suggestions are cached by the set of headers, so files exported again by the
+    same source system are answered without scoring them again. The values
+    sampled the first time a header set is seen decide its cached suggestion.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_MAPPING_CACHE_SIZE,
+        sample_rows: int = DEFAULT_SAMPLE_ROWS,
+    ):
+        self.cache = LRUCache(maxsize)
+        self.sample_rows = sample_rows
+
+    def suggest(
+        self, headers: Sequence[str], rows: Sequence[Mapping[str, Any]] = ()
+    ) -> MappingSuggestion:
+        """
+        Suggests a column mapping.
+
+        Args:
+          headers (Sequence[str]): The CSV column headers.
+          rows (Sequence[Mapping[str, Any]]): Sample rows keyed by header, of which the first `sample_rows` are used.
+
+        Returns:
+          MappingSuggestion: The suggested field of each column and the resulting mapping.
+        """
+        signature = header_signature(headers)
+        cached: Optional[MappingSuggestion] = self.cache.get(signature)  # type: ignore
+        if cached is not None:
+            return _reorder(cached, headers)
+
+        suggestion = self._suggest(list(dict.fromkeys(headers)), rows[: self.sample_rows])
+        self.cache.set(signature, suggestion)
+        return suggestion
+
+    def _suggest(
+        self, headers: list[str], rows: Sequence[Mapping[str, Any]]
+    ) -> MappingSuggestion:
+        index = _header_index()
+        scores: dict[str, dict[GEOCODING_ATTRIBUTE, float]] = {}
+        for header in headers:
+            scores[header] = index.score(header)
+            values = [
+                value
+                for value in (str(row.get(header) or "").strip() for row in rows)
+                if value
+            ]
+            if not values:
+                continue
+
+            fits = _value_scores(values)
+            for field, fit in fits.items():
+                scores[header][field] = (
+                    (1 - VALUE_WEIGHT) * scores[header].get(field, 0.0) + VALUE_WEIGHT * fit
+                )
+
+        # The best scoring column and field pairs are assigned first
+        candidates = sorted(
+            (
+                (score, header, field)
+                for header, by_field in scores.items()
+                for field, score in by_field.items()
+                if score >= MIN_SCORE
+            ),
+            key=lambda candidate: -candidate[0],
+        )
+        mapping: dict[str, GEOCODING_ATTRIBUTE] = {}
+        assigned: set[GEOCODING_ATTRIBUTE] = set()
+        for score, header, field in candidates:
+            if header not in mapping and field not in assigned:
+                mapping[header] = field
+                assigned.add(field)
+
+        columns = []
+        for header in headers:
+            ranked = sorted(scores[header].items(), key=lambda item: -item[1])
+            field = mapping.get(header)
+            columns.append(
+                ColumnSuggestion(
+                    header=header,
+                    field=field,
+                    score=round(scores[header][field], 3) if field else 0.0,
+                    alternatives=[
+                        FieldScore(field=field, score=round(score, 3))
+                        for field, score in ranked[:MAX_ALTERNATIVES]
+                        if score > 0
+                    ],
+                )
+            )
+        return MappingSuggestion(columns=columns, mapping=mapping)
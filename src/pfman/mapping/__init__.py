@@ -0,0 +1,7 @@
+from .ColumnProfiler import ColumnProfiler
+from .MappingSuggester import MappingSuggester
+
+__all__ = [
+    "ColumnProfiler",
+    "MappingSuggester",
+]
@@ -1,6 +1,7 @@
 import re
-from typing import Optional, Self
-from pfman.utils.string import is_int
+from functools import cached_property
+from typing import Any, Iterable, Mapping, Optional, Self
+from pfman.utils.string import is_int, parse_float
 from .GeocodingAttributes import GEOCODING_ATTRIBUTE
 from pfman.utils.geocoding import (
     normalize,
@@ -11,11 +12,65 @@ from pfman.utils.geocoding import (
     normalize_street_name,
 )
 from pfman.utils.geo import get_country, get_state, Country, Subdivision
+from pfman.utils.spatial import H3_MAX_RESOLUTION
 import h3
 from pydantic import BaseModel, Field, computed_field, field_validator, model_validator
 
 HOUSE_NUMBER_PATTERN = r"^\d+[-\w]*?$"
 ADDRESS_LINE_PATTERN = r"^(\d+[-\w]*?)\s+(.*)$"
+ADDRESS_LINE_REGEX = re.compile(ADDRESS_LINE_PATTERN)
+
+# The cached computed fields derived from each source field, dropped whenever
+# the source field is assigned.
+DERIVED_FIELDS: dict[str, tuple[str, ...]] = {
+    "name": ("normalized_name",),
+    "house_number": ("normalized_house_number",),
+    "street": ("normalized_street",),
+    "neighborhood": ("normalized_neighborhood",),
+    "city": ("normalized_city",),
+    "county": ("normalized_county",),
+    "state": ("normalized_state",),
+    "state_code": ("normalized_state_code",),
+    "country": ("normalized_country",),
+    "country_code": ("normalized_country_code",),
+    "postal_code": ("normalized_postal_code",),
+    "latitude": ("h3_cell",),
+    "longitude": ("h3_cell",),
+}
+
+# The source fields of each cached computed field
+DERIVED_SOURCES: dict[str, tuple[str, ...]] = {
+    derived: tuple(source for source, fields in DERIVED_FIELDS.items() if derived in fields)
+    for derived in {field for fields in DERIVED_FIELDS.values() for field in fields}
+}
+
+
+def split_address_line(address_line: str) -> Optional[tuple[str, str]]:
+    """Splits an address line into its house number and street, if it starts with a number"""
+    match = ADDRESS_LINE_REGEX.match(address_line.strip())
+    return (match.group(1), match.group(2)) if match else None
+
+
+def resolve_country(
+    country: Optional[str], country_code: Optional[str]
+) -> Optional[Country]:
+    """Resolves a country from its code, falling back to its name"""
+    resolved = get_country(q=country_code) if country_code else None
+    if not resolved and country:
+        resolved = get_country(q=country)
+    return resolved
+
+
+def resolve_state(
+    state: Optional[str], state_code: Optional[str], country_code: Optional[str]
+) -> Optional[Subdivision]:
+    """Resolves a first level subdivision from its code, falling back to its name"""
+    resolved = (
+        get_state(q=state_code, country_code=country_code) if state_code else None
+    )
+    if not resolved and state:
+        resolved = get_state(q=state, country_code=country_code)
+    return resolved
 
 
 class Address(BaseModel):
@@ -63,10 +118,12 @@ class Address(BaseModel):
     )
 
     @computed_field
+    @cached_property
     def normalized_name(self) -> Optional[str]:
         return normalize(self.name) if self.name else None
 
     @computed_field
+    @cached_property
     def normalized_house_number(self) -> Optional[str]:
         if self.house_number is None:
             return None
@@ -78,48 +135,76 @@ class Address(BaseModel):
         return None
 
     @computed_field
+    @cached_property
     def normalized_street(self) -> Optional[str]:
         return normalize_street_name(self.street) if self.street else None
 
     @computed_field
+    @cached_property
     def normalized_neighborhood(self) -> Optional[str]:
         return normalize(self.neighborhood) if self.neighborhood else None
 
     @computed_field
+    @cached_property
     def normalized_city(self) -> Optional[str]:
         return normalize_city_name(self.city) if self.city else None
 
     @computed_field
+    @cached_property
     def normalized_county(self) -> Optional[str]:
         return normalize_county_name(self.county) if self.county else None
 
     @computed_field
+    @cached_property
     def normalized_state(self) -> Optional[str]:
         return normalize_state_name(self.state) if self.state else None
 
     @computed_field
+    @cached_property
     def normalized_state_code(self) -> Optional[str]:
         return normalize(self.state_code) if self.state_code else None
 
     @computed_field
+    @cached_property
     def normalized_country(self) -> Optional[str]:
         return normalize(self.country) if self.country else None
 
     @computed_field
+    @cached_property
     def normalized_country_code(self) -> Optional[str]:
         return normalize(self.country_code) if self.country_code else None
 
     @computed_field
+    @cached_property
     def normalized_postal_code(self) -> Optional[str]:
         return normalize_postal_code(self.postal_code) if self.postal_code else None
 
     @computed_field
+    @cached_property
     def h3_cell(self) -> Optional[str]:
         """Returns the H3 cell ID for the address"""
-        if not self.latitude or not self.longitude:
+        if self.latitude is None or self.longitude is None:
             return None
 
-        return h3.latlng_to_cell(self.latitude, self.longitude, 15)
+        return h3.latlng_to_cell(self.latitude, self.longitude, H3_MAX_RESOLUTION)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        self._invalidate_derived_fields((name,))
+
+    def model_copy(
+        self, *, update: Optional[Mapping[str, Any]] = None, deep: bool = False
+    ) -> Self:
+        copied = super().model_copy(update=update, deep=deep)
+        if update:
+            copied._invalidate_derived_fields(update)
+        return copied
+
+    def _invalidate_derived_fields(self, names: Iterable[str]) -> None:
+        """Drops cached computed fields so they are recomputed from the new values"""
+        for name in names:
+            for derived in DERIVED_FIELDS.get(name, ()):
+                self.__dict__.pop(derived, None)
 
     @field_validator("house_number", mode="before")
     def validate_house_number(cls, v) -> Optional[str | int]:
@@ -151,9 +236,8 @@ class Address(BaseModel):
         elif isinstance(v, str):
             if not v.strip():
                 return None
-            try:
-                vfloat = float(v.strip())
-            except ValueError:
+            vfloat = parse_float(v)
+            if vfloat is None:
                 raise ValueError("Latitude must be a number")
         else:
             raise ValueError("Latitude must be a number")
@@ -173,9 +257,8 @@ class Address(BaseModel):
         elif isinstance(v, str):
             if not v.strip():
                 return None
-            try:
-                vfloat = float(v.strip())
-            except ValueError:
+            vfloat = parse_float(v)
+            if vfloat is None:
                 raise ValueError("Longitude must be a number")
         else:
             raise ValueError("Longitude must be a number")
@@ -188,47 +271,29 @@ class Address(BaseModel):
     @model_validator(mode="after")
     def validate_address_model(self) -> Self:
         if self.address_line:
-            match = re.match(ADDRESS_LINE_PATTERN, self.address_line.strip())
-            if match:
-                self.house_number = self.house_number or match.group(1)
-                self.street = self.street or match.group(2)
-
-        country: Optional[Country] = None
-
-        if self.country_code and not country:
-            country = get_country(q=self.country_code)
-            if country:
-                self.country = country.official_name or country.name
-                self.country_code = country.alpha_2
-
-        if self.country and not country:
-            country = get_country(q=self.country)
-            if country:
-                self.country = country.official_name or country.name
-                self.country_code = country.alpha_2
-
-        state: Optional[Subdivision] = None
-
-        if self.state_code and not state:
-            state = get_state(
-                q=self.state_code, country_code=country.alpha_2 if country else None
-            )
-            if state:
-                self.state = state.name
-                self.state_code = state.state_code  # type: ignore
-
-        if self.state and not state:
-            state = get_state(
-                q=self.state, country_code=country.alpha_2 if country else None
-            )
-            if state:
-                self.state = state.name
-                self.state_code = state.state_code  # type: ignore
+            parts = split_address_line(self.address_line)
+            if parts:
+                self.house_number = self.house_number or parts[0]
+                self.street = self.street or parts[1]
+
+        country = resolve_country(country=self.country, country_code=self.country_code)
+        if country:
+            self.country = country.official_name or country.name
+            self.country_code = country.alpha_2
+
+        state = resolve_state(
+            state=self.state,
+            state_code=self.state_code,
+            country_code=country.alpha_2 if country else None,
+        )
+        if state:
+            self.state = state.name
+            self.state_code = state.state_code  # type: ignore
 
         return self
 
     def is_valid_property_address(self) -> bool:
-        if self.latitude and self.longitude:
+        if self.latitude is not None and self.longitude is not None:
             return True
 
         if self.formatted_address:
@@ -243,11 +308,34 @@ class Address(BaseModel):
         return False
 
     def pick_subset(self, attributes: list[GEOCODING_ATTRIBUTE]) -> "Address":
-        """Returns a subset of the address object with only the specified attributes"""
-        return Address(
-            **{
-                attr: getattr(self, attr)
-                for attr in attributes
-                if hasattr(self, attr) and getattr(self, attr) is not None
-            }
-        )
+        """
+        Returns a subset of the address object with only the specified attributes.
+
+        The values are already validated, so the subset is copied from an empty
+        address without running validation again, and computed fields already
+        cached on this address are carried over when all of their source
+        attributes are included.
+        """
+        fields = self.__dict__
+        values = {
+            attr: fields[attr] for attr in attributes if fields.get(attr) is not None
+        }
+
+        # A house number taken from the address line is kept as a string, which
+        # validation would turn into an integer
+        if "house_number" in values:
+            values["house_number"] = Address.validate_house_number(
+                values["house_number"]
+            )
+
+        # The prototype has nothing cached, so there is nothing to invalidate
+        subset = BaseModel.model_copy(EMPTY_ADDRESS, update=values)
+        for derived, sources in DERIVED_SOURCES.items():
+            if derived in fields and all(source in values for source in sources):
+                subset.__dict__[derived] = fields[derived]
+
+        return subset
+
+
+# Prototype for addresses built from already validated values, see pick_subset
+EMPTY_ADDRESS = Address()
@@ -0,0 +1,360 @@
+from types import NoneType
+from typing import (
+    Any,
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Self,
+    Sequence,
+)
+from .Address import (
+    DERIVED_FIELDS,
+    EMPTY_ADDRESS,
+    Address,
+    resolve_country,
+    resolve_state,
+    split_address_line,
+)
+from .GeocodingAttributes import GEOCODING_ATTRIBUTE
+from pfman.utils.duplicates import (
+    DEFAULT_BLOCK_RESOLUTION,
+    DEFAULT_MAX_BLOCK_SIZE,
+    DuplicateCandidate,
+    find_duplicates,
+)
+from pfman.utils.geocoding import normalize
+from pfman.utils.spatial import (
+    DEFAULT_H3_RESOLUTIONS,
+    H3_MAX_RESOLUTION,
+    cell_to_string,
+    latlng_to_cells,
+)
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+ADDRESS_FIELDS: tuple[GEOCODING_ATTRIBUTE, ...] = tuple(Address.model_fields)  # type: ignore
+
+FIELD_VALIDATORS: dict[str, Callable[[Any], Any]] = {
+    "house_number": Address.validate_house_number,
+    "latitude": Address.validate_latitude,
+    "longitude": Address.validate_longitude,
+}
+
+# Validates a value against a field's declared type, after its field validator
+FIELD_ADAPTERS: dict[str, TypeAdapter] = {
+    field: TypeAdapter(info.annotation) for field, info in Address.model_fields.items()
+}
+
+# Inclusive bounds of the coordinate fields, for parsing whole columns at once
+COORDINATE_BOUNDS: dict[str, tuple[float, float]] = {
+    "latitude": (-90, 90),
+    "longitude": (-180, 180),
+}
+
+
+def _parse_coordinates(
+    column: list[Optional[str]], bounds: tuple[float, float]
+) -> Optional[list[Optional[float]]]:
+    """
+    Parses a column of coordinate strings in one pass. Returns None if any value
+    is blank, malformed or out of bounds, so the caller can fall back to the
+    field validator for exact per-value errors.
+    """
+    low, high = bounds
+    try:
+        parsed = [None if value is None else float(value) for value in column]
+    except ValueError:
+        return None
+
+    if all(low <= value <= high for value in parsed if value is not None):
+        return parsed
+    return None
+
+
+def _validate_value(field: str, value: Any) -> tuple[Any, Optional[str]]:
+    """Validates a single value as `Address` would, returning it with the error message, if any"""
+    try:
+        if validator := FIELD_VALIDATORS.get(field):
+            value = validator(value)
+        return FIELD_ADAPTERS[field].validate_python(value), None
+    except ValidationError as e:
+        return None, e.errors()[0]["msg"]
+    except ValueError as e:
+        return None, f"Value error, {e}"
+
+
+def _memoized(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Memoizes `fn` for the lifetime of a single batch operation"""
+    results: dict[Hashable, Any] = {}
+
+    def wrapper(*args):
+        try:
+            return results[args]
+        except KeyError:
+            result = results[args] = fn(*args)
+            return result
+        except TypeError:
+            return fn(*args)
+
+    return wrapper
+
+
+class AddressBatch:
+    """
+    A columnar batch of addresses, holding one list per `Address` field.
+
+    Validation follows `Address` exactly, but runs column by column: each
+    field validator, address line split, country resolution and state
+    resolution is evaluated once per distinct value (or combination of values)
+    in the batch rather than once per row. Errors are recorded per field and
+    row, and `Address` instances are only built when requested.
+    """
+
+    def __init__(self, columns: Mapping[str, Sequence[Any]]):
+        lengths = {len(values) for values in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("All columns must have the same length.")
+
+        self.size: int = lengths.pop() if lengths else 0
+        self.provided: set[str] = {field for field in columns if field in ADDRESS_FIELDS}
+        self.columns: dict[GEOCODING_ATTRIBUTE, list[Any]] = {
+            field: list(columns.get(field) or [None] * self.size)
+            for field in ADDRESS_FIELDS
+        }
+        self.errors: dict[GEOCODING_ATTRIBUTE, dict[int, str]] = {}
+
+        self._validate_fields()
+        self._validate_rows()
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping[str, Any]]) -> Self:
+        rows = rows if isinstance(rows, Sequence) else list(rows)
+        present = set().union(*rows)
+        return cls(
+            {
+                field: [row.get(field) for row in rows]
+                for field in ADDRESS_FIELDS
+                if field in present
+            }
+        )
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def valid_mask(self) -> list[bool]:
+        """Per row flag, True where the row has no errors"""
+        mask = [True] * self.size
+        for rows in self.errors.values():
+            for row in rows:
+                mask[row] = False
+        return mask
+
+    def error_mask(self, field: GEOCODING_ATTRIBUTE) -> list[bool]:
+        """Per row flag, True where the given field is invalid"""
+        mask = [False] * self.size
+        for row in self.errors.get(field, {}):
+            mask[row] = True
+        return mask
+
+    def row_errors(self, row: int) -> dict[GEOCODING_ATTRIBUTE, str]:
+        return {
+            field: rows[row] for field, rows in self.errors.items() if row in rows
+        }
+
+    def address(self, row: int) -> Address:
+        """Materializes a single validated row as an `Address`"""
+        if errors := self.row_errors(row):
+            raise ValueError(f"Row {row} is invalid: {errors}")
+
+        values = {field: self.columns[field][row] for field in ADDRESS_FIELDS}
+        return Address.model_construct(
+            _fields_set={field for field, value in values.items() if value is not None},
+            **values,
+        )
+
+    def addresses(self) -> Iterator[Address]:
+        """Materializes every valid row as an `Address`, in order"""
+        for row, valid in enumerate(self.valid_mask):
+            if valid:
+                yield self.address(row)
+
+    def h3_cells(
+        self, resolutions: Iterable[int] = DEFAULT_H3_RESOLUTIONS
+    ) -> dict[int, list[Optional[int]]]:
+        """
+        Indexes every row into integer H3 cells at each of the given
+        resolutions. Invalid rows and rows without coordinates are None.
+        """
+        valid = self.valid_mask
+        return latlng_to_cells(
+            [lat if ok else None for lat, ok in zip(self.columns["latitude"], valid)],
+            [lng if ok else None for lng, ok in zip(self.columns["longitude"], valid)],
+            resolutions,
+        )
+
+    def normalized(self, field: str) -> list[Any]:
+        """
+        Computes one of the `Address` computed fields (such as `normalized_city`
+        or `h3_cell`) for every row, once per distinct source value. Invalid
+        rows are None.
+        """
+        if field == "h3_cell":
+            cells = self.h3_cells((H3_MAX_RESOLUTION,))[H3_MAX_RESOLUTION]
+            return [cell_to_string(cell) if cell is not None else None for cell in cells]
+
+        sources = [
+            source for source, derived in DERIVED_FIELDS.items() if field in derived
+        ]
+        if not sources:
+            raise ValueError(f"{field} is not a computed field of Address.")
+
+        keys = list(zip(*(self.columns[source] for source in sources)))  # type: ignore
+        valid = self.valid_mask
+
+        def compute(key):
+            # Copying the empty address skips validation, the values are already valid
+            address = BaseModel.model_copy(EMPTY_ADDRESS, update=dict(zip(sources, key)))
+            return getattr(address, field)
+
+        try:
+            results = {key: compute(key) for key in {k for k, ok in zip(keys, valid) if ok}}
+        except TypeError:
+            return [compute(key) if ok else None for key, ok in zip(keys, valid)]
+        return [results[key] if ok else None for key, ok in zip(keys, valid)]
+
+    def duplicates(
+        self,
+        block_resolution: int = DEFAULT_BLOCK_RESOLUTION,
+        max_block_size: int = DEFAULT_MAX_BLOCK_SIZE,
+    ) -> list[list[int]]:
+        """
+        Finds clusters of valid rows describing the same property, comparing
+        rows only within H3 parent cell and postal code plus street blocks.
+        See `find_duplicates`.
+        """
+        valid = self.valid_mask
+        cells = self.h3_cells((H3_MAX_RESOLUTION,))[H3_MAX_RESOLUTION]
+        units = {unit: normalize(unit) for unit in set(self.columns["unit"]) if unit}
+        units[None] = None
+        candidates = [
+            (
+                DuplicateCandidate(
+                    name, house_number, street, units[unit or None], postal_code, cell
+                )
+                if ok
+                else None
+            )
+            for ok, name, house_number, street, unit, postal_code, cell in zip(
+                valid,
+                self.normalized("normalized_name"),
+                self.normalized("normalized_house_number"),
+                self.normalized("normalized_street"),
+                self.columns["unit"],
+                self.normalized("normalized_postal_code"),
+                cells,
+            )
+        ]
+        return find_duplicates(candidates, block_resolution, max_block_size)
+
+    def _validate_fields(self):
+        for field in ADDRESS_FIELDS:
+            if field not in self.provided:
+                continue
+
+            column = self.columns[field]
+            validator = FIELD_VALIDATORS.get(field)
+            types = set(map(type, column))
+
+            if types <= {str, NoneType}:
+                if validator is None:
+                    continue
+
+                if field in COORDINATE_BOUNDS:
+                    parsed = _parse_coordinates(column, COORDINATE_BOUNDS[field])
+                    if parsed is not None:
+                        self.columns[field] = parsed
+                        continue
+
+                # Strings and None hash apart, so each distinct value is validated once
+                results = {value: _validate_value(field, value) for value in set(column)}
+                self.columns[field] = [results[value][0] for value in column]
+                if any(error for _, error in results.values()):
+                    self._record_errors(
+                        field, (results[value][1] for value in column)
+                    )
+                continue
+
+            # 1, 1.0 and True hash alike but validate differently, so the type
+            # is part of the key
+            validate = _memoized(lambda _, value: _validate_value(field, value))
+            checked = [validate(type(value), value) for value in column]
+            self.columns[field] = [value for value, _ in checked]
+            self._record_errors(field, (error for _, error in checked))
+
+    def _record_errors(self, field: GEOCODING_ATTRIBUTE, errors: Iterable[Optional[str]]):
+        for row, error in enumerate(errors):
+            if error:
+                self.errors.setdefault(field, {})[row] = error
+
+    def _validate_rows(self):
+        columns = self.columns
+        valid = self.valid_mask
+
+        address_lines = columns["address_line"]
+        parts = {line: split_address_line(line) for line in set(address_lines) if line}
+        if any(parts.values()):
+            splits = [
+                parts[line] if line and ok else None
+                for line, ok in zip(address_lines, valid)
+            ]
+            columns["house_number"] = [
+                (house_number or split[0]) if split else house_number
+                for house_number, split in zip(columns["house_number"], splits)
+            ]
+            columns["street"] = [
+                (street or split[1]) if split else street
+                for street, split in zip(columns["street"], splits)
+            ]
+
+        country_keys = [
+            key if ok else None
+            for key, ok in zip(zip(columns["country"], columns["country_code"]), valid)
+        ]
+        countries = {
+            key: resolve_country(*key) for key in set(country_keys) if key is not None
+        }
+        countries[None] = None
+        resolved_countries = [countries[key] for key in country_keys]
+        columns["country"] = [
+            (country.official_name or country.name) if country else value
+            for country, value in zip(resolved_countries, columns["country"])
+        ]
+        columns["country_code"] = [
+            country.alpha_2 if country else value
+            for country, value in zip(resolved_countries, columns["country_code"])
+        ]
+
+        state_keys = [
+            (state, state_code, country.alpha_2 if country else None) if ok else None
+            for state, state_code, country, ok in zip(
+                columns["state"], columns["state_code"], resolved_countries, valid
+            )
+        ]
+        states = {
+            key: (state.name, state.state_code) if (state := resolve_state(*key)) else None
+            for key in set(state_keys)
+            if key is not None
+        }
+        states[None] = None
+        resolved_states = [states[key] for key in state_keys]
+        columns["state"] = [
+            state[0] if state else value
+            for state, value in zip(resolved_states, columns["state"])
+        ]
+        columns["state_code"] = [
+            state[1] if state else value
+            for state, value in zip(resolved_states, columns["state_code"])
+        ]
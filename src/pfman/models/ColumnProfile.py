@@ -0,0 +1,56 @@
+from typing import Dict, List, Literal, Optional
+from pydantic import BaseModel, Field
+
+VALUE_KIND = Literal[
+    "integer",
+    "decimal",
+    "percentage",
+    "country_code",
+    "postal_code",
+    "text",
+]
+
+COLUMN_HINT = Literal[
+    "mostly_empty",
+    "numeric",
+    "latitude",
+    "longitude",
+    "country_code",
+    "postal_code",
+    "unique",
+]
+
+
+class ColumnProfile(BaseModel):
+    name: str = Field(description="The CSV column header")
+    nulls: int = Field(description="The number of empty or placeholder values, such as N/A")
+    null_rate: float = Field(description="The share of rows with a null value")
+    distinct: int = Field(description="The number of distinct non-null values")
+    distinct_exact: bool = Field(
+        description="Whether `distinct` is exact rather than estimated"
+    )
+    types: Dict[VALUE_KIND, int] = Field(
+        description="The number of profiled non-null values of each kind"
+    )
+    min: Optional[float] = Field(default=None, description="The smallest numeric value")
+    max: Optional[float] = Field(default=None, description="The largest numeric value")
+    hints: List[COLUMN_HINT] = Field(
+        default_factory=list, description="What the values of the column look like"
+    )
+
+
+class CsvProfile(BaseModel):
+    """
+    The profile of each column of a CSV file.
+
+    Null counts and distinct counts cover every row. Value kinds, numeric
+    ranges and hints cover the `sampled_rows` of a reservoir sample when the
+    file was sampled, and every row otherwise.
+    """
+
+    rows: int = Field(description="The number of rows, not counting the header")
+    sampled_rows: Optional[int] = Field(
+        default=None,
+        description="The number of rows the value kinds were profiled on, if sampled",
+    )
+    columns: List[ColumnProfile] = Field(description="The profile of each column")
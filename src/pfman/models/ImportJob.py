@@ -0,0 +1,54 @@
+from datetime import datetime, timezone
+from typing import Literal, Optional
+from pydantic import Field, computed_field
+from .PortfolioImport import ImportResult
+
+JOB_STATUS = Literal["queued", "running", "completed", "failed"]
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class ImportJob(ImportResult):
+    """The progress of a background portfolio import, `rows` being the rows processed so far"""
+
+    id: str = Field(description="The job ID")
+    status: JOB_STATUS = Field(default="queued", description="The job status")
+    portfolio_id: str = Field(description="The ID of the portfolio being created")
+    total_rows: int = Field(description="The number of rows to import")
+    import_key: Optional[str] = Field(
+        default=None,
+        description="The content hash of the import, shared by identical submissions",
+    )
+    geocoded_rows: int = Field(
+        default=0,
+        description="The number of valid rows without coordinates that were geocoded",
+    )
+    failure: Optional[str] = Field(
+        default=None, description="Why the job failed, if it did"
+    )
+    created_at: datetime = Field(
+        default_factory=utcnow, description="When the job was queued"
+    )
+    started_at: Optional[datetime] = Field(
+        default=None, description="When a worker started the job"
+    )
+    updated_at: datetime = Field(
+        default_factory=utcnow, description="When the job progress last changed"
+    )
+    finished_at: Optional[datetime] = Field(
+        default=None, description="When the job completed or failed"
+    )
+
+    @computed_field
+    @property
+    def eta_seconds(self) -> Optional[float]:
+        """Estimated seconds until the job completes, from its throughput so far"""
+        if self.status == "completed":
+            return 0.0
+        if self.status != "running" or not self.started_at or not self.rows:
+            return None
+
+        elapsed = (self.updated_at - self.started_at).total_seconds()
+        return round(elapsed / self.rows * (self.total_rows - self.rows), 1)
@@ -0,0 +1,38 @@
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+from .GeocodingAttributes import GEOCODING_ATTRIBUTE
+
+
+class SuggestMappingPayload(BaseModel):
+    headers: List[str] = Field(description="The CSV column headers", min_length=1)
+    rows: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description="Sample rows keyed by header, whose values help tell similar fields apart",
+    )
+
+
+class FieldScore(BaseModel):
+    field: GEOCODING_ATTRIBUTE = Field(description="The address field")
+    score: float = Field(description="How well the column matches the field, from 0 to 1")
+
+
+class ColumnSuggestion(BaseModel):
+    header: str = Field(description="The CSV column header")
+    field: Optional[GEOCODING_ATTRIBUTE] = Field(
+        default=None, description="The suggested address field, None to ignore the column"
+    )
+    score: float = Field(default=0.0, description="The score of the suggested field")
+    alternatives: List[FieldScore] = Field(
+        default_factory=list, description="The best scoring fields, best first"
+    )
+
+
+class MappingSuggestion(BaseModel):
+    columns: List[ColumnSuggestion] = Field(description="The suggestion for each column")
+    mapping: Dict[str, GEOCODING_ATTRIBUTE] = Field(
+        description="The suggested column mapping, as sent to the import"
+    )
+    cached: bool = Field(
+        default=False,
+        description="Whether the suggestion was served from the cache of known header sets",
+    )
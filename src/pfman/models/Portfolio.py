@@ -0,0 +1,32 @@
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+
+
+class CreatePortfolioPayload(BaseModel):
+    title: str = Field(description="The portfolio title")
+    description: Optional[str] = Field(
+        default=None, description="The portfolio description"
+    )
+    properties: List[Dict[str, Any]] = Field(
+        description="The rows to include in the portfolio, mapped to address fields. "
+        "Rows are validated by the import job, which reports the invalid ones."
+    )
+
+
+class PortfolioPage(BaseModel):
+    items: List[Dict[str, Any]] = Field(
+        description="The portfolios of the page, with the requested fields"
+    )
+    next_cursor: Optional[str] = Field(
+        default=None, description="The cursor of the next page, None on the last page"
+    )
+
+
+class PortfolioPropertiesPage(BaseModel):
+    portfolio: Dict[str, Any] = Field(description="The portfolio")
+    items: List[Dict[str, Any]] = Field(
+        description="The properties of the page, with the requested fields"
+    )
+    next_cursor: Optional[str] = Field(
+        default=None, description="The cursor of the next page, None on the last page"
+    )
@@ -0,0 +1,114 @@
+from typing import Any, Iterable, List, Mapping, Optional
+from pydantic import BaseModel, Field
+from .GeocodingAttributes import GEOCODING_ATTRIBUTE
+from .RowValidationCache import RowValidation
+
+DEFAULT_IMPORT_CHUNK_SIZE = 5_000
+
+DEFAULT_MAX_IMPORT_ERRORS = 1_000
+
+
+def normalize_header(name: str) -> str:
+    """Strips whitespace and stray byte order marks from a CSV column name"""
+    return name.replace("\ufeff", "").strip()
+
+
+class ImportRowError(BaseModel):
+    row: int = Field(description="Index of the row in the file, not counting the header")
+    errors: dict[str, str] = Field(description="Error messages by address field")
+
+
+class ImportResult(BaseModel):
+    rows: int = Field(default=0, description="The number of rows read")
+    valid_rows: int = Field(default=0, description="The number of valid rows")
+    invalid_rows: int = Field(default=0, description="The number of invalid rows")
+    cached_rows: int = Field(
+        default=0,
+        description="The number of rows whose validation was served from the cache",
+    )
+    errors: List[ImportRowError] = Field(
+        default_factory=list, description="The errors of the first invalid rows"
+    )
+    errors_truncated: bool = Field(
+        default=False,
+        description="Whether more rows were invalid than errors were reported",
+    )
+
+    def add_chunk(self, offset: int, size: int, validation: RowValidation, max_errors: int):
+        """Adds the outcome of validating `size` rows starting at row `offset`"""
+        self.rows += size
+        self.invalid_rows += len(validation.errors)
+        self.valid_rows += size - len(validation.errors)
+        self.cached_rows += validation.cached_rows
+
+        for row, errors in validation.errors.items():
+            if len(self.errors) >= max_errors:
+                self.errors_truncated = True
+                break
+            self.errors.append(ImportRowError(row=offset + row, errors=errors))
+
+
+class PortfolioImport:
+    """
+    Maps the records of an imported CSV file to rows of address fields as
+    they are read.
+
+    The first record is the header. Each following record is mapped to address
+    fields with `mapping`, which maps CSV column names to `Address` fields, and
+    the rows are handed out in chunks of `chunk_size`, so only the current
+    chunk is held in memory, whatever the size of the file.
+    """
+
+    def __init__(
+        self,
+        mapping: Mapping[str, GEOCODING_ATTRIBUTE],
+        chunk_size: int = DEFAULT_IMPORT_CHUNK_SIZE,
+    ):
+        fields = list(mapping.values())
+        if duplicated := {field for field in fields if fields.count(field) > 1}:
+            raise ValueError(
+                f"Fields mapped from more than one column: {', '.join(sorted(duplicated))}"
+            )
+
+        self.mapping = {normalize_header(column): field for column, field in mapping.items()}
+        self.chunk_size = max(chunk_size, 1)
+        self.rows = 0
+
+        self._columns: Optional[list[tuple[int, GEOCODING_ATTRIBUTE]]] = None
+        self._rows: list[dict[str, Any]] = []
+
+    def add(self, records: Iterable[list[str]]) -> list[list[dict[str, Any]]]:
+        """Maps records, returning the chunks of rows they complete"""
+        chunks = []
+        for record in records:
+            if self._columns is None:
+                self._columns = self.map_header(record)
+                continue
+
+            self._rows.append(
+                {
+                    field: (record[index].strip() or None) if index < len(record) else None
+                    for index, field in self._columns
+                }
+            )
+            if len(self._rows) >= self.chunk_size:
+                chunks.append(self._take_chunk())
+        return chunks
+
+    def finish(self) -> list[list[dict[str, Any]]]:
+        """Returns the last, partial chunk of rows, if any"""
+        if self._columns is None:
+            raise ValueError("The CSV file is empty.")
+        return [self._take_chunk()] if self._rows else []
+
+    def map_header(self, header: list[str]) -> list[tuple[int, GEOCODING_ATTRIBUTE]]:
+        """Returns the position of each mapped column in the header, with its field"""
+        positions = {normalize_header(name): index for index, name in enumerate(header)}
+        if missing := [column for column in self.mapping if column not in positions]:
+            raise ValueError(f"Mapped columns not in the CSV header: {', '.join(missing)}")
+        return [(positions[column], field) for column, field in self.mapping.items()]
+
+    def _take_chunk(self) -> list[dict[str, Any]]:
+        chunk, self._rows = self._rows, []
+        self.rows += len(chunk)
+        return chunk
@@ -0,0 +1,102 @@
+from dataclasses import dataclass, field
+from typing import Any, Hashable, Mapping, Optional, Sequence
+from .Address import Address
+from .AddressBatch import ADDRESS_FIELDS, AddressBatch
+from pfman.utils.cache import LRUCache
+
+DEFAULT_ROW_CACHE_SIZE = 100_000
+
+# Values of these types are only equal to values of the same type, so rows
+# made only of them can be keyed on their values alone
+_PLAIN_TYPES = (str, type(None))
+
+
+def _row_key(row: Mapping[str, Any]) -> Optional[Hashable]:
+    """Keys a raw mapped row on its Address field values, or None if they are unhashable"""
+    values = tuple(row.get(field) for field in ADDRESS_FIELDS)
+    if not all(type(value) in _PLAIN_TYPES for value in values):
+        # 1, 1.0 and True are equal but validate differently
+        values = tuple((type(value), value) for value in values)
+
+    try:
+        hash(values)
+    except TypeError:
+        return None
+    return values
+
+
+@dataclass
+class RowValidation:
+    addresses: list[Optional[Address]] = field(default_factory=list)
+    """The validated address of each row, None where the row is invalid"""
+    errors: dict[int, dict[str, str]] = field(default_factory=dict)
+    """Error messages of the invalid rows, by row index and field"""
+    cached_rows: int = 0
+    """The number of rows served from the cache rather than validated"""
+
+
+class RowValidationCache:
+    """
+    Caches the validation outcome of raw mapped rows, so rows repeated within or
+    across imports (units of one building, rows pasted twice) are validated once.
+
+    Rows are keyed on their Address field values and map to either the
+    validated `Address` or the row's error messages. Rows missing from the
+    cache are validated together by `_validate_uncached`, as an `AddressBatch`.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_ROW_CACHE_SIZE):
+        self.cache = LRUCache(maxsize)
+
+    def validate(self, rows: Sequence[Mapping[str, Any]]) -> RowValidation:
+        result = RowValidation(addresses=[None] * len(rows))
+        keys = [_row_key(row) for row in rows]
+
+        # Rows to validate, with the first position of each distinct key
+        pending: dict[Hashable, int] = {}
+        uncacheable: list[int] = []
+        outcomes: dict[Hashable, tuple[Optional[Address], Optional[dict[str, str]]]] = {}
+        for position, key in enumerate(keys):
+            if key is None:
+                uncacheable.append(position)
+            elif key not in outcomes and key not in pending:
+                cached = self.cache.get(key)
+                if cached is None:
+                    pending[key] = position
+                else:
+                    outcomes[key] = cached  # type: ignore
+
+        validated = list(pending.values()) + uncacheable
+        by_position = dict(
+            zip(validated, self._validate_uncached([rows[position] for position in validated]))
+        )
+
+        for key, position in pending.items():
+            address, errors = outcomes[key] = by_position[position]
+            self.cache.set(key, (address.model_copy() if address else None, errors))
+
+        for position, key in enumerate(keys):
+            if key is None or pending.get(key) == position:
+                address, errors = by_position[position]
+            else:
+                address, errors = outcomes[key]
+                result.cached_rows += 1
+                # Each row gets its own instance, as addresses are mutable
+                address = address.model_copy() if address else None
+
+            result.addresses[position] = address
+            if errors:
+                result.errors[position] = errors
+
+        return result
+
+    def _validate_uncached(
+        self, rows: Sequence[Mapping[str, Any]]
+    ) -> list[tuple[Optional[Address], Optional[dict[str, str]]]]:
+        """Validates rows missing from the cache, returning the address or the errors of each"""
+        batch = AddressBatch.from_rows(rows)
+        outcomes: list[tuple[Optional[Address], Optional[dict[str, str]]]] = []
+        for row in range(len(rows)):
+            errors = batch.row_errors(row)
+            outcomes.append((None, errors) if errors else (batch.address(row), None))
+        return outcomes
@@ -0,0 +1,107 @@
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+from pydantic import BaseModel, Field
+from pfman.utils.row_sets import bitmap_size, encode_bitmap, encode_runs, runs_size
+from .PortfolioImport import DEFAULT_IMPORT_CHUNK_SIZE
+from .RowValidationCache import RowValidationCache
+
+
+class ValidatePayload(BaseModel):
+    rows: List[Dict[str, Any]] = Field(
+        description="The rows to validate, mapped to address fields"
+    )
+
+
+class ColumnErrors(BaseModel):
+    message: int = Field(description="Index of the error message in `messages`")
+    runs: Optional[List[int]] = Field(
+        default=None,
+        description="The invalid rows as flat [start, length, ...] runs of consecutive rows",
+    )
+    bitmap: Optional[str] = Field(
+        default=None,
+        description="The invalid rows as a base64 bitmap, bit i % 8 of byte i // 8 set for row i",
+    )
+
+
+class ValidationReport(BaseModel):
+    """
+    The validity of every cell of a batch of rows, in a columnar form.
+
+    Error messages are listed once in `messages`. For each column, the rows
+    failing with each message are given either as runs of consecutive rows or
+    as a bitmap, whichever is smaller, so the report grows with the number of
+    distinct errors rather than with the number of rows.
+    """
+
+    rows: int = Field(description="The number of rows validated")
+    invalid_rows: int = Field(description="The number of rows with at least one error")
+    cached_rows: int = Field(
+        default=0,
+        description="The number of rows whose validation was served from the cache",
+    )
+    messages: List[str] = Field(description="The distinct error messages")
+    columns: Dict[str, List[ColumnErrors]] = Field(
+        description="The invalid rows of each column with errors, by error message"
+    )
+
+    @classmethod
+    def from_errors(
+        cls,
+        rows: int,
+        errors: Mapping[int, Mapping[str, str]],
+        cached_rows: int = 0,
+    ) -> "ValidationReport":
+        """
+        Builds a report from row errors.
+
+        Args:
+          rows (int): The number of rows validated.
+          errors (Mapping[int, Mapping[str, str]]): Error messages of the invalid rows, by row index and field.
+          cached_rows (int): The number of rows served from the validation cache.
+
+        Returns:
+          ValidationReport: The columnar report.
+        """
+        messages: dict[str, int] = {}
+        invalid: dict[str, dict[int, list[int]]] = {}
+        for row in sorted(errors):
+            for field, message in errors[row].items():
+                index = messages.setdefault(message, len(messages))
+                invalid.setdefault(field, {}).setdefault(index, []).append(row)
+
+        columns: dict[str, list[ColumnErrors]] = {}
+        for field, by_message in invalid.items():
+            columns[field] = []
+            for message, invalid_rows in by_message.items():
+                runs = encode_runs(invalid_rows)
+                columns[field].append(
+                    ColumnErrors(message=message, runs=runs)
+                    if runs_size(runs) <= bitmap_size(rows)
+                    else ColumnErrors(message=message, bitmap=encode_bitmap(invalid_rows, rows))
+                )
+
+        return cls(
+            rows=rows,
+            invalid_rows=len(errors),
+            cached_rows=cached_rows,
+            messages=list(messages),
+            columns=columns,
+        )
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Sequence[Mapping[str, Any]],
+        cache: RowValidationCache,
+        chunk_size: int = DEFAULT_IMPORT_CHUNK_SIZE,
+    ) -> "ValidationReport":
+        """Validates rows mapped to address fields in chunks through the cache and reports their errors"""
+        chunk_size = max(chunk_size, 1)
+        errors: dict[int, dict[str, str]] = {}
+        cached_rows = 0
+        for start in range(0, len(rows), chunk_size):
+            validation = cache.validate(rows[start : start + chunk_size])
+            cached_rows += validation.cached_rows
+            for row, row_errors in validation.errors.items():
+                errors[start + row] = row_errors
+        return cls.from_errors(len(rows), errors, cached_rows)
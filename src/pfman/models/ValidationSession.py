@@ -0,0 +1,39 @@
+from typing import Any, Dict, List
+from pydantic import BaseModel, Field
+from .GeocodingAttributes import GEOCODING_ATTRIBUTE
+from .ValidationReport import ValidationReport
+
+
+class ValidationSession(BaseModel):
+    id: str = Field(description="The session ID, to patch the rows with")
+    report: ValidationReport = Field(description="The validation report of the rows")
+
+
+class CellEdit(BaseModel):
+    row: int = Field(ge=0, description="Index of the edited row")
+    field: GEOCODING_ATTRIBUTE = Field(description="The edited address field")
+    value: Any = Field(default=None, description="The new value, None to clear the cell")
+
+
+class ValidationPatch(BaseModel):
+    edits: List[CellEdit] = Field(
+        description="The cell edits, applied in order", min_length=1
+    )
+
+
+class RowChange(BaseModel):
+    row: int = Field(description="Index of the row")
+    valid: bool = Field(description="Whether the row is valid after the edits")
+    errors: Dict[str, str] = Field(
+        default_factory=dict, description="Error messages of the row by field, if invalid"
+    )
+    values: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="The validated fields whose value changed, such as a resolved country_code",
+    )
+
+
+class ValidationPatchResult(BaseModel):
+    rows: List[RowChange] = Field(
+        description="The edited rows whose validity, errors or validated values changed"
+    )
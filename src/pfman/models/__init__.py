@@ -1,5 +1,52 @@
 from .Address import Address
+from .AddressBatch import AddressBatch
+from .ColumnProfile import ColumnProfile, CsvProfile
 from .GeocodingAttributes import GEOCODING_ATTRIBUTE
+from .ImportJob import ImportJob
+from .MappingSuggestion import (
+    ColumnSuggestion,
+    FieldScore,
+    MappingSuggestion,
+    SuggestMappingPayload,
+)
+from .Portfolio import CreatePortfolioPayload, PortfolioPage, PortfolioPropertiesPage
+from .PortfolioImport import ImportResult, ImportRowError, PortfolioImport
+from .RowValidationCache import RowValidation, RowValidationCache
 from .User import User
+from .ValidationReport import ColumnErrors, ValidatePayload, ValidationReport
+from .ValidationSession import (
+    CellEdit,
+    RowChange,
+    ValidationPatch,
+    ValidationPatchResult,
+    ValidationSession,
+)
 
-__all__ = ["Address", "GEOCODING_ATTRIBUTE"]
\ No newline at end of file
+__all__ = [
+    "Address",
+    "AddressBatch",
+    "CellEdit",
+    "ColumnErrors",
+    "ColumnProfile",
+    "ColumnSuggestion",
+    "CreatePortfolioPayload",
+    "CsvProfile",
+    "FieldScore",
+    "GEOCODING_ATTRIBUTE",
+    "ImportJob",
+    "ImportResult",
+    "ImportRowError",
+    "MappingSuggestion",
+    "PortfolioImport",
+    "PortfolioPage",
+    "PortfolioPropertiesPage",
+    "RowChange",
+    "RowValidation",
+    "RowValidationCache",
+    "SuggestMappingPayload",
+    "ValidatePayload",
+    "ValidationPatch",
+    "ValidationPatchResult",
+    "ValidationReport",
+    "ValidationSession",
+]
\ No newline at end of file
@@ -0,0 +1,35 @@
+from typing import AsyncIterator
+from fastapi import Depends, Request
+from neo4j import AsyncDriver, AsyncSession
+
+from pfman.jobs import JobQueue
+from pfman.utils.redis_cache import ReadThroughCache
+from pfman.validation import SessionStore
+
+
+def get_graph_driver(request: Request) -> AsyncDriver:
+    """The process-wide pooled Neo4j driver, created by the app lifespan"""
+    return request.app.state.graph_driver
+
+
+async def get_graph_session(
+    driver: AsyncDriver = Depends(get_graph_driver),
+) -> AsyncIterator[AsyncSession]:
+    """A Neo4j session on a pooled connection, returned to the pool after the request"""
+    async with driver.session() as session:
+        yield session
+
+
+def get_job_queue(request: Request) -> JobQueue:
+    """The import job queue, created by the app lifespan"""
+    return request.app.state.job_queue
+
+
+def get_portfolio_cache(request: Request) -> ReadThroughCache:
+    """The Redis cache of portfolio reads, created by the app lifespan"""
+    return request.app.state.portfolio_cache
+
+
+def get_validation_sessions(request: Request) -> SessionStore:
+    """The store of validation sessions, created by the app lifespan"""
+    return request.app.state.validation_sessions
@@ -1,35 +1,408 @@
-from typing import List, Optional
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from neo4j import AsyncDriver, AsyncSession
+from pydantic import TypeAdapter, ValidationError
+from starlette.concurrency import run_in_threadpool
 
-from pfman.models import Address
+from pfman.Env import config
+from pfman.graph.Reader import (
+    PORTFOLIO_READ_FIELDS,
+    PROPERTY_READ_FIELDS,
+    portfolio_exists,
+    read_portfolio_properties,
+    read_portfolios,
+    stream_portfolio_addresses,
+)
+from pfman.jobs import CsvUpload, JobQueue
+from pfman.jobs.CacheInvalidation import PORTFOLIOS_NAMESPACE, portfolio_namespace
+from pfman.mapping import ColumnProfiler, MappingSuggester
+from pfman.models import (
+    GEOCODING_ATTRIBUTE,
+    CreatePortfolioPayload,
+    CsvProfile,
+    ImportJob,
+    MappingSuggestion,
+    PortfolioPage,
+    PortfolioPropertiesPage,
+    SuggestMappingPayload,
+    ValidatePayload,
+    ValidationPatch,
+    ValidationPatchResult,
+    ValidationReport,
+    ValidationSession,
+)
+from pfman.utils.csv_stream import CsvStreamDecoder
+from pfman.utils.multipart import iter_multipart
+from pfman.utils.ndjson import NDJSON_MEDIA_TYPE, iter_ndjson
+from pfman.utils.pagination import decode_cursor, encode_cursor, parse_fields
+from pfman.utils.redis_cache import ReadThroughCache, cache_key
+from pfman.validation import ParallelRowValidationCache, SessionStore
+from .dependencies import (
+    get_graph_driver,
+    get_graph_session,
+    get_job_queue,
+    get_portfolio_cache,
+    get_validation_sessions,
+)
 
 portfolio_router = APIRouter()
 
+# Shared by all imports, so rows repeated across uploads are validated once.
+# Its worker processes are started by the app lifespan.
+row_validation_cache = ParallelRowValidationCache(
+    config.ROW_VALIDATION_CACHE_SIZE,
+    min_rows=config.PARALLEL_VALIDATION_MIN_ROWS,
+    normalization_cache_size=config.NORMALIZATION_CACHE_SIZE,
+)
 
-@portfolio_router.get("/")
-def get_portfolios():
-    pass
+# Shared by all requests, so header sets seen before are answered from its cache
+mapping_suggester = MappingSuggester(
+    config.MAPPING_CACHE_SIZE, sample_rows=config.MAPPING_SAMPLE_ROWS
+)
 
+COLUMN_MAPPING = TypeAdapter(dict[str, GEOCODING_ATTRIBUTE])
 
-class CreatePortfolioPayload(BaseModel):
-    title: str = Field(description="The portfolio title")
-    description: Optional[str] = Field(
-        default=None, description="The portfolio description"
-    )
-    properties: List[Address] = Field(
-        description="The addresses to include in the portfolio"
+# Largest accepted size of a plain form field, such as the column mapping
+MAX_FORM_FIELD_SIZE = 64 * 1024
+
+PAGE_SIZE = Query(
+    default=config.PAGE_SIZE, ge=1, le=config.MAX_PAGE_SIZE, description="The page size"
+)
+
+CURSOR = Query(
+    default=None, description="The `next_cursor` of the previous page, omitted for the first page"
+)
+
+FIELDS = Query(
+    default=None, description="Comma-separated fields to return, all of them when omitted"
+)
+
+
+def page_query(
+    cursor: Optional[str], fields: Optional[str], allowed: tuple[str, ...]
+) -> tuple[Optional[str], tuple[str, ...]]:
+    """Decodes the cursor and field projection of a page request"""
+    try:
+        return (
+            decode_cursor(cursor) if cursor else None,
+            parse_fields(fields, allowed, allowed[0]),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@portfolio_router.get("/", response_model=PortfolioPage)
+async def get_portfolios(
+    limit: int = PAGE_SIZE,
+    cursor: Optional[str] = CURSOR,
+    fields: Optional[str] = FIELDS,
+    session: AsyncSession = Depends(get_graph_session),
+    cache: ReadThroughCache = Depends(get_portfolio_cache),
+) -> Response:
+    """
+    Lists portfolios by ID, a page at a time. Pass the `next_cursor` of a
+    page to get the next one.
+    """
+    after, projected = page_query(cursor, fields, PORTFOLIO_READ_FIELDS)
+
+    async def load() -> bytes:
+        # One extra item tells whether there is a next page
+        items = await read_portfolios(session, after, limit + 1, projected)
+        return PortfolioPage(
+            items=items[:limit],
+            next_cursor=(
+                encode_cursor(items[limit - 1]["portfolio_id"])
+                if len(items) > limit
+                else None
+            ),
+        ).model_dump_json().encode()
+
+    body = await cache.get(
+        PORTFOLIOS_NAMESPACE, cache_key(limit, after, projected), load
     )
+    return Response(content=body, media_type="application/json")
 
 
 @portfolio_router.post("/")
-def create_portfolio(body: CreatePortfolioPayload):
-    pass
+def create_portfolio(
+    body: CreatePortfolioPayload,
+    response: Response,
+    background: bool = False,
+    job_queue: JobQueue = Depends(get_job_queue),
+) -> ImportJob:
+    """
+    Creates a portfolio through an import job. With `background`, the job is
+    queued and returned right away with status 202, and its progress can be
+    followed at `/jobs/{id}`. Otherwise the job runs within the request.
+
+    Submitting the same portfolio again returns the job of the first
+    submission: its result once completed, or the job in flight, which the
+    request waits for unless in the background. A job still in flight after
+    `IMPORT_JOB_WAIT_TIMEOUT` is returned with status 202. Only a failed or
+    abandoned import is run again.
+    """
+    job = job_queue.submit(body, background)
+    if job.status in ("queued", "running"):
+        response.status_code = 202
+    return job
+
+
+@portfolio_router.post("/mapping/suggest")
+def suggest_mapping(body: SuggestMappingPayload) -> MappingSuggestion:
+    """
+    Suggests how to map the columns of a CSV to address fields, from their
+    headers and optionally a sample of rows. The `mapping` of the result can
+    be sent as is to `/import`.
+    """
+    return mapping_suggester.suggest(body.headers, body.rows)
+
+
+@portfolio_router.post("/validate", response_model_exclude_none=True)
+async def validate_rows(body: ValidatePayload) -> ValidationReport:
+    """
+    Validates rows mapped to address fields without importing them, and
+    reports the invalid cells of each column in a columnar form.
+    """
+    return await run_in_threadpool(
+        ValidationReport.from_rows,
+        body.rows,
+        row_validation_cache,
+        config.IMPORT_CHUNK_SIZE,
+    )
+
+
+@portfolio_router.post("/validate/sessions", response_model_exclude_none=True)
+async def create_validation_session(
+    body: ValidatePayload, sessions: SessionStore = Depends(get_validation_sessions)
+) -> ValidationSession:
+    """
+    Validates rows mapped to address fields and keeps them in a session, so
+    cells can then be fixed with `PATCH /validate/sessions/{id}`.
+    """
+    return await run_in_threadpool(sessions.create, body.rows)
+
+
+@portfolio_router.patch("/validate/sessions/{id}")
+async def patch_validation_session(
+    id: str,
+    body: ValidationPatch,
+    sessions: SessionStore = Depends(get_validation_sessions),
+) -> ValidationPatchResult:
+    """
+    Applies cell edits to the rows of a validation session and revalidates the
+    edited rows only. Returns the edited rows whose validity, errors or
+    validated values changed, with only the values that changed.
+    """
+    try:
+        result = await run_in_threadpool(sessions.patch, id, body.edits)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=404, detail="Validation session not found")
+    return result
+
+
+@portfolio_router.delete("/validate/sessions/{id}", status_code=204)
+def delete_validation_session(
+    id: str, sessions: SessionStore = Depends(get_validation_sessions)
+) -> None:
+    if not sessions.delete(id):
+        raise HTTPException(status_code=404, detail="Validation session not found")
+
+
+@portfolio_router.get("/cache/stats")
+def get_cache_stats(cache: ReadThroughCache = Depends(get_portfolio_cache)) -> dict:
+    """The hit, miss and load counters of the portfolio read cache in this process"""
+    info = cache.info()
+    return {**info._asdict(), "hit_rate": info.hit_rate}
+
 
+@portfolio_router.get("/jobs/{id}")
+def get_import_job(id: str, job_queue: JobQueue = Depends(get_job_queue)) -> ImportJob:
+    job = job_queue.get(id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job
 
-@portfolio_router.get("/{id}")
-def get_portfolio(id: str):
-    pass
+
+@portfolio_router.post("/profile")
+async def profile_csv(
+    request: Request,
+    sample_size: int = Query(
+        default=config.PROFILE_SAMPLE_SIZE,
+        ge=0,
+        description="Rows whose value kinds are profiled, 0 to profile every row",
+    ),
+) -> CsvProfile:
+    """
+    Profiles the columns of a CSV file streamed as `multipart/form-data` in a
+    `file` part: their null rates, distinct counts, the kinds of their values
+    and what they look like, such as coordinates or country codes. Nulls and
+    distinct values are counted over every row, value kinds over a reservoir
+    sample of `sample_size` rows.
+    """
+    profiler: Optional[ColumnProfiler] = None
+    decoder = CsvStreamDecoder()
+
+    try:
+        async for part, data in iter_multipart(
+            request.stream(), request.headers.get("content-type", "")
+        ):
+            if part.name != "file" or part.filename is None:
+                continue
+            if profiler is None:
+                profiler = ColumnProfiler(sample_size=sample_size)
+
+            records = decoder.feed(data) if data else decoder.close()
+            if records:
+                await run_in_threadpool(profiler.add, records)
+
+        if profiler is None:
+            raise ValueError("A CSV file part named file is required.")
+        return await run_in_threadpool(profiler.finish)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@portfolio_router.post("/import")
+async def import_portfolio(
+    request: Request,
+    response: Response,
+    background: bool = False,
+    job_queue: JobQueue = Depends(get_job_queue),
+) -> ImportJob:
+    """
+    Creates a portfolio from a CSV file streamed as `multipart/form-data`,
+    through an import job as with `/`.
+
+    The form has a `title` field, an optional `description` field and a
+    `mapping` field, a JSON object mapping CSV column names to address fields,
+    followed by the CSV as a `file` part. The header of the file is checked
+    against the mapping while it is received, and the rows are validated and
+    written by the job.
+
+    Uploading the same file with the same mapping again returns the job of the
+    first upload, whatever its title.
+    """
+    fields: dict[str, bytes] = {}
+    upload: Optional[CsvUpload] = None
+
+    try:
+        async for part, data in iter_multipart(
+            request.stream(), request.headers.get("content-type", "")
+        ):
+            if part.filename is None:
+                fields[part.name] = fields.get(part.name, b"") + data
+                if len(fields[part.name]) > MAX_FORM_FIELD_SIZE:
+                    raise HTTPException(
+                        status_code=413, detail=f"Form field {part.name} is too large"
+                    )
+                continue
+
+            if part.name != "file":
+                continue
+            if upload is None:
+                if "title" not in fields or "mapping" not in fields:
+                    raise ValueError("The title and mapping fields must be sent before the file.")
+                description = fields.get("description")
+                upload = CsvUpload(
+                    fields["title"].decode(),
+                    description.decode() if description is not None else None,
+                    COLUMN_MAPPING.validate_json(fields["mapping"]),
+                )
+
+            if data:
+                await run_in_threadpool(upload.add, data)
+
+        if upload is None:
+            raise ValueError("A CSV file part named file is required.")
+        await run_in_threadpool(upload.finish)
+        job = await run_in_threadpool(
+            job_queue.submit_payload,
+            upload.payload(),
+            upload.import_key,
+            upload.rows,
+            background,
+        )
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors(include_input=False))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        if upload is not None:
+            upload.close()
+
+    if job.status in ("queued", "running"):
+        response.status_code = 202
+    return job
+
+
+@portfolio_router.get("/{id}", response_model=PortfolioPropertiesPage)
+async def get_portfolio(
+    id: str,
+    limit: int = PAGE_SIZE,
+    cursor: Optional[str] = CURSOR,
+    fields: Optional[str] = FIELDS,
+    session: AsyncSession = Depends(get_graph_session),
+    cache: ReadThroughCache = Depends(get_portfolio_cache),
+) -> Response:
+    """
+    Returns a portfolio with a page of its properties by ID. Pass the
+    `next_cursor` of a page to get the next one.
+    """
+    after, projected = page_query(cursor, fields, PROPERTY_READ_FIELDS)
+
+    async def load() -> bytes:
+        page = await read_portfolio_properties(session, id, after, limit + 1, projected)
+        if page is None:
+            raise HTTPException(status_code=404, detail="Portfolio not found")
+
+        portfolio, items = page
+        return PortfolioPropertiesPage(
+            portfolio=portfolio,
+            items=items[:limit],
+            next_cursor=(
+                encode_cursor(items[limit - 1]["property_id"])
+                if len(items) > limit
+                else None
+            ),
+        ).model_dump_json().encode()
+
+    body = await cache.get(
+        portfolio_namespace(id), cache_key(limit, after, projected), load
+    )
+    return Response(content=body, media_type="application/json")
+
+
+@portfolio_router.get("/{id}/properties.ndjson")
+async def export_portfolio_properties(
+    id: str, driver: AsyncDriver = Depends(get_graph_driver)
+) -> StreamingResponse:
+    """
+    Streams the addresses of the properties of a portfolio as newline-delimited
+    JSON, one address per line, ordered by property ID.
+    """
+    async with driver.session() as session:
+        if not await portfolio_exists(session, id):
+            raise HTTPException(status_code=404, detail="Portfolio not found")
+
+    async def body():
+        # The session lives as long as the stream, not the request handler
+        async with driver.session(fetch_size=config.EXPORT_FETCH_SIZE) as session:
+            addresses = stream_portfolio_addresses(session, id)
+            async for chunk in iter_ndjson(addresses, config.EXPORT_CHUNK_SIZE):
+                yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={
+            "Content-Disposition": 'attachment; filename="properties.ndjson"',
+            # Keeps reverse proxies from buffering the stream
+            "X-Accel-Buffering": "no",
+        },
+    )
 
 
 @portfolio_router.get("/{path:path}")
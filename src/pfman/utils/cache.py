@@ -0,0 +1,132 @@
+from collections import OrderedDict
+from functools import wraps
+from threading import Lock
+from typing import Callable, Hashable, NamedTuple, ParamSpec, TypeVar
+
+DEFAULT_MAXSIZE = 10_000
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_MISSING = object()
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LRUCache:
+    """
+    A bounded least-recently-used cache with hit, miss and eviction counters.
+
+    All operations take an internal lock, so a single instance can be shared
+    between threadpool workers. Values are computed outside the lock, so two
+    threads missing on the same key may both compute it; the cached functions
+    are pure, so either result is kept.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        self._data: OrderedDict[Hashable, object] = OrderedDict()
+        self._lock = Lock()
+        self._maxsize = maxsize
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable, default: object = None) -> object:
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self._misses += 1
+                return default
+
+            self._hits += 1
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: object) -> None:
+        with self._lock:
+            if self._maxsize <= 0:
+                return
+
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def resize(self, maxsize: int) -> None:
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                maxsize=self._maxsize,
+                currsize=len(self._data),
+            )
+
+    def _evict(self) -> None:
+        while len(self._data) > max(self._maxsize, 0):
+            self._data.popitem(last=False)
+            self._evictions += 1
+
+
+_caches: dict[str, LRUCache] = {}
+_maxsize = DEFAULT_MAXSIZE
+
+
+def memoize(fn: Callable[P, R]) -> Callable[P, R]:
+    """
+    Caches the results of a pure function in a shared, bounded `LRUCache`.
+
+    The cache is registered under the function's qualified name so it can be
+    sized with `configure_caches` and inspected with `cache_stats`. Calls that
+    raise are not cached.
+    """
+    cache = _caches.setdefault(f"{fn.__module__}.{fn.__qualname__}", LRUCache(_maxsize))
+
+    @wraps(fn)
+    def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+        value = cache.get(key, _MISSING)
+        if value is _MISSING:
+            value = fn(*args, **kwargs)
+            cache.set(key, value)
+        return value  # type: ignore
+
+    wrapper.cache = cache  # type: ignore
+    return wrapper
+
+
+def configure_caches(maxsize: int = DEFAULT_MAXSIZE) -> None:
+    """Sets the size of every memoized function's cache. A size of 0 disables caching."""
+    global _maxsize
+    _maxsize = maxsize
+    for cache in _caches.values():
+        cache.resize(maxsize)
+
+
+def clear_caches() -> None:
+    for cache in _caches.values():
+        cache.clear()
+
+
+def cache_stats() -> dict[str, CacheInfo]:
+    return {name: cache.info() for name, cache in _caches.items()}
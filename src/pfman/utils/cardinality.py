@@ -0,0 +1,74 @@
+import math
+from typing import Hashable, Iterable, Optional
+
+DEFAULT_PRECISION = 12
+
+DEFAULT_EXACT_LIMIT = 10_000
+
+_MASK = (1 << 64) - 1
+
+# Spreads hash() values, which are the value itself for small integers,
+# over the 64 bits the registers are indexed and ranked from
+_GOLDEN = 0x9E3779B97F4A7C15
+
+
+class CardinalityEstimator:
+    """
+    Counts the distinct values of a stream in bounded memory.
+
+    Values are counted exactly until `exact_limit` distinct values are seen,
+    then estimated with a HyperLogLog sketch of `2 ** precision` one-byte
+    registers, whose standard error is about `1.04 / sqrt(2 ** precision)`
+    (1.6% with the default precision).
+
+    Values are hashed with `hash()`, so estimates are only comparable within a
+    process.
+    """
+
+    def __init__(
+        self, precision: int = DEFAULT_PRECISION, exact_limit: int = DEFAULT_EXACT_LIMIT
+    ):
+        if not 4 <= precision <= 16:
+            raise ValueError("The precision must be between 4 and 16")
+
+        self.precision = precision
+        self.exact_limit = exact_limit
+        self._values: Optional[set[Hashable]] = set()
+        self._registers = bytearray(1 << precision)
+
+    @property
+    def exact(self) -> bool:
+        """Whether the count is still exact"""
+        return self._values is not None
+
+    def update(self, values: Iterable[Hashable]) -> None:
+        if self._values is not None:
+            self._values.update(values)
+            if len(self._values) <= self.exact_limit:
+                return
+            values, self._values = self._values, None
+
+        registers = self._registers
+        shift = 64 - self.precision
+        rest = (1 << shift) - 1
+        bit_length = int.bit_length
+        for h in map(hash, values):
+            h = (h * _GOLDEN) & _MASK
+            h = ((h ^ (h >> 32)) * _GOLDEN) & _MASK
+            index = h >> shift
+            rank = shift + 1 - bit_length(h & rest)
+            if rank > registers[index]:
+                registers[index] = rank
+
+    def count(self) -> int:
+        """The number of distinct values seen, estimated once past `exact_limit`"""
+        if self._values is not None:
+            return len(self._values)
+
+        m = len(self._registers)
+        estimate = 0.7213 / (1 + 1.079 / m) * m * m / sum(2.0**-r for r in self._registers)
+        zeros = self._registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate while many registers are unset
+            estimate = m * math.log(m / zeros)
+        return round(estimate)
@@ -0,0 +1,122 @@
+import codecs
+import csv
+import io
+from typing import Optional
+
+# Largest incomplete record buffered while waiting for more data, in characters
+DEFAULT_MAX_RECORD_SIZE = 1 << 20
+
+
+class _NeedMoreData(Exception):
+    """Raised by the line buffer when a record continues past the data received so far"""
+
+
+class _LineBuffer:
+    """
+    The line iterator behind the decoder's `csv.reader`. It raises
+    `_NeedMoreData` instead of ending while more data may still arrive, so a
+    record split across chunks can be re-read once the rest of it is fed.
+    """
+
+    def __init__(self):
+        self.lines: list[str] = []
+        self.position = 0
+        self.closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if self.position >= len(self.lines):
+            if self.closed:
+                raise StopIteration
+            raise _NeedMoreData
+        line = self.lines[self.position]
+        self.position += 1
+        return line
+
+
+class CsvStreamDecoder:
+    """
+    Incrementally decodes CSV records from chunks of bytes, such as the body of
+    an upload as it arrives.
+
+    Records are parsed with `csv.reader`, so quoting (including newlines in
+    quoted fields) follows the `csv` module exactly. Only the bytes of an
+    incomplete trailing record are buffered between chunks. The default
+    `utf-8-sig` encoding drops the byte order mark spreadsheet exports put in
+    front of the header.
+    """
+
+    def __init__(
+        self,
+        encoding: str = "utf-8-sig",
+        max_record_size: int = DEFAULT_MAX_RECORD_SIZE,
+        **fmtparams,
+    ):
+        self._decoder = codecs.getincrementaldecoder(encoding)()
+        self._max_record_size = max_record_size
+        self._partial = ""
+        self._buffer = _LineBuffer()
+        self._reader = csv.reader(self._buffer, **fmtparams)
+
+    def feed(self, data: bytes) -> list[list[str]]:
+        """
+        Decodes a chunk of bytes.
+
+        Args:
+          data (bytes): The next chunk of the CSV file.
+
+        Returns:
+          list[list[str]]: The records completed by this chunk, without blank lines.
+        """
+        text = self._partial + self._decoder.decode(data)
+        lines = io.StringIO(text, newline="").readlines()
+
+        # The last line may be cut mid-way, or between the \r and \n of a \r\n
+        self._partial = ""
+        if lines and not lines[-1].endswith("\n"):
+            self._partial = lines.pop()
+
+        self._buffer.lines.extend(lines)
+        records = self._read()
+
+        pending = len(self._partial) + sum(map(len, self._buffer.lines))
+        if pending > self._max_record_size:
+            raise ValueError(
+                f"CSV record exceeds {self._max_record_size} characters, check its quoting"
+            )
+        return records
+
+    def close(self) -> list[list[str]]:
+        """
+        Decodes the rest of the stream once all chunks have been fed.
+
+        Returns:
+          list[list[str]]: The remaining records, including a final record without a line break.
+        """
+        text = self._partial + self._decoder.decode(b"", final=True)
+        self._partial = ""
+        self._buffer.lines.extend(io.StringIO(text, newline="").readlines())
+        self._buffer.closed = True
+        return self._read()
+
+    def _read(self) -> list[list[str]]:
+        buffer = self._buffer
+        records = []
+        while True:
+            start = buffer.position
+            try:
+                record: Optional[list[str]] = next(self._reader)
+            except _NeedMoreData:
+                # The reader restarts its record on the next call, so rewind to it
+                buffer.position = start
+                break
+            except StopIteration:
+                break
+            if record:
+                records.append(record)
+
+        del buffer.lines[: buffer.position]
+        buffer.position = 0
+        return records
@@ -0,0 +1,142 @@
+from typing import Hashable, Iterable, NamedTuple, Optional, Sequence
+from loguru import logger
+from pfman.utils.spatial import _parent_masks
+
+# Resolution of the H3 cells used to block nearby properties, roughly 25m across
+DEFAULT_BLOCK_RESOLUTION = 11
+
+# Largest number of distinct candidates in one block that are compared pairwise
+DEFAULT_MAX_BLOCK_SIZE = 1_000
+
+
+class DuplicateCandidate(NamedTuple):
+    """The normalized identifying attributes of one row"""
+
+    name: Optional[str]
+    house_number: Optional[str]
+    street: Optional[str]
+    unit: Optional[str]
+    postal_code: Optional[str]
+    cell: Optional[int]
+    """The finest resolution integer H3 cell of the row"""
+
+
+def is_duplicate(a: DuplicateCandidate, b: DuplicateCandidate) -> bool:
+    """
+    Two candidates are duplicates if none of their name, house number, street
+    and unit conflict (values present on both must be equal), and they either
+    share a finest resolution H3 cell or the same house number and street.
+    """
+    for left, right in (
+        (a.name, b.name),
+        (a.house_number, b.house_number),
+        (a.street, b.street),
+        (a.unit, b.unit),
+    ):
+        if left and right and left != right:
+            return False
+
+    if a.cell is not None and a.cell == b.cell:
+        return True
+
+    return bool(
+        a.house_number
+        and a.house_number == b.house_number
+        and a.street
+        and a.street == b.street
+    )
+
+
+def _group(keys: Iterable[tuple[int, Hashable]]) -> Iterable[list[int]]:
+    """Groups rows by key, yielding only groups of more than one row"""
+    # Most rows are alone in their block, so lists are only built on a collision
+    first: dict[Hashable, int] = {}
+    groups: dict[Hashable, list[int]] = {}
+    for row, key in keys:
+        other = first.setdefault(key, row)
+        if other != row:
+            groups.setdefault(key, [other]).append(row)
+    return groups.values()
+
+
+def _blocks(
+    candidates: Sequence[Optional[DuplicateCandidate]], block_resolution: int
+) -> Iterable[list[int]]:
+    """Groups rows sharing an H3 parent cell, or a postal code and street"""
+    keep, set_bits = _parent_masks(block_resolution)
+    yield from _group(
+        (row, (candidate.cell & keep) | set_bits)
+        for row, candidate in enumerate(candidates)
+        if candidate is not None and candidate.cell is not None
+    )
+    yield from _group(
+        (row, (candidate.postal_code, candidate.street))
+        for row, candidate in enumerate(candidates)
+        if candidate is not None and candidate.postal_code and candidate.street
+    )
+
+
+def find_duplicates(
+    candidates: Sequence[Optional[DuplicateCandidate]],
+    block_resolution: int = DEFAULT_BLOCK_RESOLUTION,
+    max_block_size: int = DEFAULT_MAX_BLOCK_SIZE,
+) -> list[list[int]]:
+    """
+    Finds clusters of rows describing the same property.
+
+    Rows are only compared within blocks: rows in the same H3 parent cell at
+    `block_resolution`, and rows with the same normalized postal code and
+    street. Each distinct candidate within a block is compared once with
+    `is_duplicate` against itself, to merge its repeats, and once against
+    every other distinct candidate. Blocks with more than `max_block_size`
+    distinct candidates only merge repeats, which keeps the cost linear on
+    degenerate inputs.
+
+    Args:
+      candidates (Sequence[Optional[DuplicateCandidate]]): The candidate of each row, None for rows to skip.
+      block_resolution (int): The H3 resolution of the spatial blocks. Defaults to DEFAULT_BLOCK_RESOLUTION.
+      max_block_size (int): The largest number of distinct candidates compared pairwise in a block. Defaults to DEFAULT_MAX_BLOCK_SIZE.
+
+    Returns:
+      list[list[int]]: The clusters of duplicate row indexes, each sorted and ordered by their first row.
+    """
+    parents = list(range(len(candidates)))
+
+    def find(row: int) -> int:
+        while parents[row] != row:
+            parents[row] = parents[parents[row]]
+            row = parents[row]
+        return row
+
+    def union(a: int, b: int):
+        a, b = find(a), find(b)
+        if a != b:
+            parents[max(a, b)] = min(a, b)
+
+    for rows in _blocks(candidates, block_resolution):
+        distinct: dict[DuplicateCandidate, int] = {}
+        for row in rows:
+            candidate: DuplicateCandidate = candidates[row]  # type: ignore
+            first = distinct.setdefault(candidate, row)
+            if first != row and is_duplicate(candidate, candidate):
+                union(first, row)
+
+        if len(distinct) > max_block_size:
+            logger.warning(
+                f"Skipping pairwise comparison of a block of {len(distinct)} distinct addresses"
+            )
+            continue
+
+        unique = list(distinct.items())
+        for i, (a, row_a) in enumerate(unique):
+            for b, row_b in unique[i + 1 :]:
+                if is_duplicate(a, b):
+                    union(row_a, row_b)
+
+    # Unions keep the smallest row as the root, so each cluster starts with it
+    clusters: dict[int, list[int]] = {}
+    for row in range(len(parents)):
+        if parents[row] != row:
+            clusters.setdefault(find(row), [find(row)]).append(row)
+
+    return [rows for _, rows in sorted(clusters.items())]
@@ -1,11 +1,15 @@
+from functools import cache
 from typing import Optional
+from pfman.utils.cache import memoize
 from pfman.utils.string import is_int
 from loguru import logger
 from pycountry import countries, subdivisions
-from pydantic import BaseModel, Field, computed_field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, computed_field, field_validator
 
 
 class Country(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     name: str = Field(..., description="The common use name of the country.")
     official_name: Optional[str] = Field(
         default=None, description="The official name of the country."
@@ -31,6 +35,8 @@ class Country(BaseModel):
 
 
 class Subdivision(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     name: str = Field(..., description="The common use name of the state.")
     type: str = Field(..., description="The type of subdivision.")
     code: str = Field(..., description="The ISO 3166-2 code of the state.")
@@ -47,55 +53,86 @@ class Subdivision(BaseModel):
         return self.code.split("-")[-1]
 
 
+class _CountryIndex:
+    """
+    Case-folded lookup tables over `pycountry.countries`, built once.
+
+    Each key maps to the position of the first country record it matches, so a
+    lookup resolves to the same country the previous linear scan would have
+    returned.
+    """
+
+    def __init__(self):
+        self.countries: list[Country] = []
+        self.by_name: dict[str, int] = {}
+        self.by_code: dict[str, int] = {}
+        self.by_numeric: dict[str, int] = {}
+
+        for position, record in enumerate(countries):
+            self.countries.append(Country(**dict(record)))  # type: ignore
+
+            self.by_name.setdefault(record.name.casefold(), position)  # type: ignore
+            official_name = getattr(record, "official_name", None)
+            if official_name:
+                self.by_name.setdefault(official_name.casefold(), position)
+
+            self.by_code.setdefault(record.alpha_2.casefold(), position)  # type: ignore
+            self.by_code.setdefault(record.alpha_3.casefold(), position)  # type: ignore
+            self.by_numeric.setdefault(record.numeric, position)  # type: ignore
+
+    def find(
+        self,
+        q: Optional[str] = None,
+        name: Optional[str] = None,
+        code: Optional[str] = None,
+        numeric: Optional[int] = None,
+    ) -> Optional[Country]:
+        positions: list[Optional[int]] = []
+        if q is not None:
+            positions.append(self.by_name.get(q.casefold()))
+            positions.append(self.by_code.get(q.casefold()))
+            positions.append(self.by_numeric.get(q))
+        if name is not None:
+            positions.append(self.by_name.get(name.casefold()))
+        if code is not None:
+            positions.append(self.by_code.get(code.casefold()))
+            positions.append(self.by_numeric.get(code))
+        if numeric is not None:
+            positions.append(self.by_numeric.get(str(numeric)))
+
+        matched = [p for p in positions if p is not None]
+        if not matched:
+            return None
+
+        return self.countries[min(matched)]
+
+
+@cache
+def _country_index() -> _CountryIndex:
+    return _CountryIndex()
+
+
+@memoize
 def get_country(
     q: Optional[str] = None,
     name: Optional[str] = None,
     code: Optional[str] = None,
     numeric: Optional[int] = None,
 ) -> Optional[Country]:
+    """
+    Resolve a country by name, official name, ISO 3166-1 alpha-2/alpha-3 code or
+    numeric code. Matching is case-insensitive.
+
+    The returned `Country` instances are shared between calls and must not be
+    mutated.
+    """
     if not any([q, name, code, numeric]):
         raise ValueError("At least one of the parameters must be provided.")
 
-    country = next(
-        (
-            country
-            for country in countries
-            if any(
-                [
-                    q and q.lower() == country.name.lower(),  # type: ignore
-                    (
-                        q
-                        and hasattr(country, "official_name")
-                        and country.official_name  # type: ignore
-                        and q.lower() == country.official_name.lower()  # type: ignore
-                    ),
-                    q and q.lower() == country.alpha_2.lower(),  # type: ignore
-                    q and q.lower() == country.alpha_2.lower(),  # type: ignore
-                    q and q.lower() == country.alpha_3.lower(),  # type: ignore
-                    q and is_int(q) and q == country.numeric,  # type: ignore
-                    name and name.lower() == country.name.lower(),  # type: ignore
-                    (
-                        name
-                        and hasattr(country, "official_name")
-                        and country.official_name  # type: ignore
-                        and name.lower() == country.official_name.lower()  # type: ignore
-                    ),
-                    code and code.lower() == country.alpha_2.lower(),  # type: ignore
-                    code and code.lower() == country.alpha_3.lower(),  # type: ignore
-                    code and is_int(code) and code == country.numeric,  # type: ignore
-                    numeric and str(numeric) == country.numeric,  # type: ignore
-                ]
-            )
-        ),
-        None,
-    )
-
-    if not country:
-        return None
-
-    return Country(**dict(country))  # type: ignore
+    return _country_index().find(q=q, name=name, code=code, numeric=numeric)
 
 
+@memoize
 def get_state(
     q: Optional[str] = None,
     name: Optional[str] = None,
@@ -114,14 +151,118 @@ def get_state(
     )
 
 
-def _get_level(code: str) -> int:
-    Subdivision = subdivisions.get(code=code)
-    if Subdivision is None:
-        raise ValueError(f"Subdivision with code {code} not found.")
+class _SubdivisionIndex:
+    """
+    Lookup tables over `pycountry.subdivisions`, built once.
+
+    Name and code-suffix tables are keyed by `(country_code, key)` and by
+    `(None, key)` for searches without a country. Every table holds positions
+    in iteration order, so results come back in the same order as the previous
+    linear scan. The depth of each subdivision in its hierarchy is computed up
+    front.
+    """
+
+    def __init__(self):
+        self.subdivisions: list[Subdivision] = []
+        self.levels: list[int] = []
+
+        by_code: dict[str, list[int]] = {}
+        by_suffix: dict[tuple[Optional[str], str], list[int]] = {}
+        by_name: dict[tuple[Optional[str], str], list[int]] = {}
+        by_country: dict[str, list[int]] = {}
+
+        for position, record in enumerate(subdivisions):
+            subdivision = Subdivision(**dict(record))  # type: ignore
+            self.subdivisions.append(subdivision)
+
+            country_code = subdivision.country_code.casefold()
+            code = subdivision.code.casefold()
+            suffix = code.split("-", 1)[-1]
+            name = subdivision.name.casefold()
+
+            by_code.setdefault(code, []).append(position)
+            by_country.setdefault(country_code, []).append(position)
+            for key in (country_code, None):
+                by_suffix.setdefault((key, suffix), []).append(position)
+                by_name.setdefault((key, name), []).append(position)
+
+        self.by_code = {k: tuple(v) for k, v in by_code.items()}
+        self.by_suffix = {k: tuple(v) for k, v in by_suffix.items()}
+        self.by_name = {k: tuple(v) for k, v in by_name.items()}
+        self.by_country = {k: tuple(v) for k, v in by_country.items()}
+
+        positions = {code: p[0] for code, p in self.by_code.items()}
+        levels: dict[int, int] = {}
 
-    if Subdivision.parent_code is None:  # type: ignore
-        return 1
-    return 1 + _get_level(Subdivision.parent_code)  # type: ignore
+        def level_of(position: int) -> int:
+            if position not in levels:
+                parent_code = self.subdivisions[position].parent_code
+                parent = positions.get(parent_code.casefold()) if parent_code else None
+                levels[position] = 1 if parent is None else 1 + level_of(parent)
+            return levels[position]
+
+        self.levels = [level_of(p) for p in range(len(self.subdivisions))]
+
+    def find(
+        self,
+        q: Optional[str] = None,
+        name: Optional[str] = None,
+        code: Optional[str] = None,
+        parent_code: Optional[str] = None,
+        country_code: Optional[str] = None,
+        level: Optional[int] = None,
+    ) -> list[Subdivision]:
+        country_key = country_code.casefold() if country_code else None
+
+        if q or name or code:
+            candidates: set[int] = set()
+            if q:
+                key = q.casefold()
+                candidates.update(self.by_name.get((country_key, key), ()))
+                candidates.update(self.by_code.get(key, ()))
+                candidates.update(self.by_suffix.get((country_key, key), ()))
+            if name:
+                candidates.update(self.by_name.get((country_key, name.casefold()), ()))
+            if code:
+                key = code.casefold()
+                candidates.update(self.by_code.get(key, ()))
+                candidates.update(self.by_suffix.get((country_key, key), ()))
+            positions = sorted(candidates)
+        elif country_key:
+            positions = self.by_country.get(country_key, ())
+        else:
+            positions = range(len(self.subdivisions))
+
+        parent_codes: set[str] = set()
+        if parent_code:
+            parent_codes.add(parent_code.casefold())
+            if country_key:
+                parent_codes.add(f"{country_key}-{parent_code.casefold()}")
+
+        return [
+            self.subdivisions[p]
+            for p in positions
+            if (level is None or self.levels[p] == level)
+            and (
+                not country_key
+                or self.subdivisions[p].country_code.casefold() == country_key
+            )
+            and (
+                not parent_codes
+                or (self.subdivisions[p].parent_code or "").casefold() in parent_codes
+            )
+        ]
+
+
+@cache
+def _subdivision_index() -> _SubdivisionIndex:
+    return _SubdivisionIndex()
+
+
+def load_indexes() -> None:
+    """Builds the country and subdivision indexes ahead of the first lookup"""
+    _country_index()
+    _subdivision_index()
 
 
 def get_subdivisions(
@@ -132,51 +273,23 @@ def get_subdivisions(
     country_code: Optional[str] = None,
     level: Optional[int] = None,
 ) -> list[Subdivision]:
+    """
+    Search ISO 3166-2 subdivisions. Matching is case-insensitive.
+
+    The returned `Subdivision` instances are shared between calls and must not
+    be mutated.
+    """
     if not any([q, name, code, parent_code, country_code, level]):
         raise ValueError("At least one of the parameters must be provided.")
 
-    matches = [
-        Subdivision(**dict(subdivision))  # type: ignore
-        for subdivision in subdivisions
-        if any(
-            [
-                not q and not name and not code,
-                q and q.lower() == subdivision.name.lower(),  # type: ignore
-                q and q.lower() == subdivision.code.lower(),  # type: ignore
-                q and subdivision.code.lower().endswith(f"-{q.lower()}"),  # type: ignore
-                name and name.lower() == subdivision.name.lower(),  # type: ignore
-                code and code.lower() == subdivision.code.lower(),  # type: ignore
-                code and subdivision.code.lower().endswith(f"-{code.lower()}"),  # type: ignore
-            ]
-        )
-        and (
-            not parent_code
-            or (
-                subdivision.parent_code  # type: ignore
-                and (
-                    (parent_code and subdivision.parent_code.lower() == parent_code.lower())  # type: ignore
-                    or (
-                        parent_code
-                        and country_code
-                        and subdivision.parent_code.lower() == f"{country_code.lower()}-{parent_code.lower()}"  # type: ignore
-                    )
-                )
-            )
-        )
-        and (
-            not country_code
-            or (country_code and subdivision.country_code.lower() == country_code.lower())  # type: ignore
-        )
-    ]
-
-    if level is not None:
-        matches = [
-            subdivision
-            for subdivision in matches
-            if _get_level(subdivision.code) == level
-        ]
-
-    return matches
+    return _subdivision_index().find(
+        q=q,
+        name=name,
+        code=code,
+        parent_code=parent_code,
+        country_code=country_code,
+        level=level,
+    )
 
 
 def get_subdivision(
@@ -208,4 +321,4 @@ def get_subdivision(
         )
         return None
 
-    return Subdivision(**dict(matches[0]))  # type: ignore
+    return matches[0]
@@ -1,4 +1,7 @@
 import re
+from typing import Iterable
+
+from pfman.utils.cache import memoize
 
 PUNCTUATION_PATTERN = re.compile(r"[,;:\-\\'\".]")
 
@@ -11,204 +14,236 @@ def replace_whitespace(name: str) -> str:
     return re.sub(r"\s+", " ", name)
 
 
-STREET_PATTERNS = {
-    re.compile(r"\bALY\b"): "ALLEY",
-    re.compile(r"\bANX\b"): "ANNEX",
-    re.compile(r"\bARC\b"): "ARCADE",
-    re.compile(r"\bAVE\b"): "AVENUE",
-    re.compile(r"\bBCH\b"): "BEACH",
-    re.compile(r"\bBLVD\b"): "BOULEVARD",
-    re.compile(r"\bBND\b"): "BEND",
-    re.compile(r"\bBYP\b"): "BYPASS",
-    re.compile(r"\bCIR\b"): "CIRCLE",
-    re.compile(r"\bCL\b"): "CLOSE",
-    re.compile(r"\bCLB\b"): "CLUB",
-    re.compile(r"\bCLS\b"): "CLOSE",
-    re.compile(r"\bCMN\b"): "COMMON",
-    re.compile(r"\bCNY\b"): "CANYON",
-    re.compile(r"\bCOR\b"): "CORNER",
-    re.compile(r"\bCR\b"): "CREEK",
-    re.compile(r"\bCRES\b"): "CRESCENT",
-    re.compile(r"\bCRK\b"): "CREEK",
-    re.compile(r"\bCRS\b"): "CROSSING",
-    re.compile(r"\bCRT\b"): "COURT",
-    re.compile(r"\bCT\b"): "COURT",
-    re.compile(r"\bCTR\b"): "CENTER",
-    re.compile(r"\bCTY\b"): "COUNTY",
-    re.compile(r"\bCV\b"): "COVE",
-    re.compile(r"\bDIV\b"): "DIVERSION",
-    re.compile(r"\bDL\b"): "DALE",
-    re.compile(r"\bDR\b"): "DRIVE",
-    re.compile(r"\bDRV\b"): "DRIVE",
-    re.compile(r"\bE\b"): "EAST",
-    re.compile(r"\bEST\b"): "ESTATE",
-    re.compile(r"\bEXPY\b"): "EXPRESSWAY",
-    re.compile(r"\bEXT\b"): "EXTENSION",
-    re.compile(r"\bFD\b"): "FORD",
-    re.compile(r"\bFQ\b"): "FIRE QUARTER",
-    re.compile(r"\bFRD\b"): "FORD",
-    re.compile(r"\bFRNT\b"): "FRONT",
-    re.compile(r"\bFRST\b"): "FOREST",
-    re.compile(r"\bFT\b"): "FORT",
-    re.compile(r"\bGDNS\b"): "GARDENS",
-    re.compile(r"\bGRN\b"): "GREEN",
-    re.compile(r"\bHBR\b"): "HARBOR",
-    re.compile(r"\bHL\b"): "HILL",
-    re.compile(r"\bHLS\b"): "HILLS",
-    re.compile(r"\bHTS\b"): "HEIGHTS",
-    re.compile(r"\bHVN\b"): "HAVEN",
-    re.compile(r"\bHWY\b"): "HIGHWAY",
-    re.compile(r"\bISL\b"): "ISLAND",
-    re.compile(r"\bJCT\b"): "JUNCTION",
-    re.compile(r"\bJNCTN\b"): "JUNCTION",
-    re.compile(r"\bLN\b"): "LANE",
-    re.compile(r"\bLNDG\b"): "LANDING",
-    re.compile(r"\bLNDNG\b"): "LANDING",
-    re.compile(r"\bMDW\b"): "MEADOW",
-    re.compile(r"\bMEWS\b"): "MEWS",
-    re.compile(r"\bML\b"): "MALL",
-    re.compile(r"\bMNR\b"): "MINOR",
-    re.compile(r"\bMNT\b"): "MOUNT",
-    re.compile(r"\bMT\b"): "MOUNT",
-    re.compile(r"\bMTN\b"): "MOUNTAIN",
-    re.compile(r"\bN\b"): "NORTH",
-    re.compile(r"\bNE\b"): "NORTHEAST",
-    re.compile(r"\bNW\b"): "NORTHWEST",
-    re.compile(r"\bPARK\b"): "PARK",
-    re.compile(r"\bPK\b"): "PARK",
-    re.compile(r"\bPKWY\b"): "PARKWAY",
-    re.compile(r"\bPL\b"): "PLACE",
-    re.compile(r"\bPLZ\b"): "PLAZA",
-    re.compile(r"\bPO\b"): "POCKET",
-    re.compile(r"\bPR\b"): "PARK",
-    re.compile(r"\bPRK\b"): "PARK",
-    re.compile(r"\bPRKWAY\b"): "PARKWAY",
-    re.compile(r"\bPRKWY\b"): "PARKWAY",
-    re.compile(r"\bPROM\b"): "PROMENADE",
-    re.compile(r"\bPT\b"): "POINT",
-    re.compile(r"\bRD\b"): "ROAD",
-    re.compile(r"\bRDS\b"): "ROADS",
-    re.compile(r"\bRNCH\b"): "RANCH",
-    re.compile(r"\bRTE\b"): "ROUTE",
-    re.compile(r"\bS\b"): "SOUTH",
-    re.compile(r"\bSE\b"): "SOUTHEAST",
-    re.compile(r"\bSHR\b"): "SHORE",
-    re.compile(r"\bSQ\b"): "SQUARE",
-    re.compile(r"\bSQR\b"): "SQUARE",
-    re.compile(r"\bST\b"): "STREET",
-    re.compile(r"\bSTN\b"): "STATION",
-    re.compile(r"\bSTR\b"): "STREET",
-    re.compile(r"\bSW\b"): "SOUTHWEST",
-    re.compile(r"\bTER\b"): "TERRACE",
-    re.compile(r"\bTNL\b"): "TUNNEL",
-    re.compile(r"\bTPK\b"): "TURNPIKE",
-    re.compile(r"\bTPKE\b"): "TURNPIKE",
-    re.compile(r"\bTRL\b"): "TRAIL",
-    re.compile(r"\bTUNL\b"): "TUNNEL",
-    re.compile(r"\bVLY\b"): "VALLEY",
-    re.compile(r"\bW\b"): "WEST",
-    re.compile(r"\bWD\b"): "WOOD",
-    re.compile(r"\bWDS\b"): "WOODS",
-    re.compile(r"\bWLK\b"): "WALK",
-    re.compile(r"\bWY\b"): "WAY",
+def word_pattern(words: Iterable[str]) -> re.Pattern:
+    """Compiles a single pattern matching any of the given whole words."""
+    alternatives = sorted(words, key=len, reverse=True)
+    return re.compile(rf"\b(?:{'|'.join(map(re.escape, alternatives))})\b")
+
+
+def replace_all(pattern: re.Pattern, replacements: dict[str, str], name: str) -> str:
+    """
+    Replaces every match of `pattern` in `name` with the entry for the matched
+    text in `replacements`, in a single scan of `name`.
+    """
+    return pattern.sub(lambda match: replacements[match[0]], name)
+
+
+STREET_ABBREVIATIONS = {
+    "ALY": "ALLEY",
+    "ANX": "ANNEX",
+    "ARC": "ARCADE",
+    "AVE": "AVENUE",
+    "BCH": "BEACH",
+    "BLVD": "BOULEVARD",
+    "BND": "BEND",
+    "BYP": "BYPASS",
+    "CIR": "CIRCLE",
+    "CL": "CLOSE",
+    "CLB": "CLUB",
+    "CLS": "CLOSE",
+    "CMN": "COMMON",
+    "CNY": "CANYON",
+    "COR": "CORNER",
+    "CR": "CREEK",
+    "CRES": "CRESCENT",
+    "CRK": "CREEK",
+    "CRS": "CROSSING",
+    "CRT": "COURT",
+    "CT": "COURT",
+    "CTR": "CENTER",
+    "CTY": "COUNTY",
+    "CV": "COVE",
+    "DIV": "DIVERSION",
+    "DL": "DALE",
+    "DR": "DRIVE",
+    "DRV": "DRIVE",
+    "E": "EAST",
+    "EST": "ESTATE",
+    "EXPY": "EXPRESSWAY",
+    "EXT": "EXTENSION",
+    "FD": "FORD",
+    "FQ": "FIRE QUARTER",
+    "FRD": "FORD",
+    "FRNT": "FRONT",
+    "FRST": "FOREST",
+    "FT": "FORT",
+    "GDNS": "GARDENS",
+    "GRN": "GREEN",
+    "HBR": "HARBOR",
+    "HL": "HILL",
+    "HLS": "HILLS",
+    "HTS": "HEIGHTS",
+    "HVN": "HAVEN",
+    "HWY": "HIGHWAY",
+    "ISL": "ISLAND",
+    "JCT": "JUNCTION",
+    "JNCTN": "JUNCTION",
+    "LN": "LANE",
+    "LNDG": "LANDING",
+    "LNDNG": "LANDING",
+    "MDW": "MEADOW",
+    "MEWS": "MEWS",
+    "ML": "MALL",
+    "MNR": "MINOR",
+    "MNT": "MOUNT",
+    "MT": "MOUNT",
+    "MTN": "MOUNTAIN",
+    "N": "NORTH",
+    "NE": "NORTHEAST",
+    "NW": "NORTHWEST",
+    "PARK": "PARK",
+    "PK": "PARK",
+    "PKWY": "PARKWAY",
+    "PL": "PLACE",
+    "PLZ": "PLAZA",
+    "PO": "POCKET",
+    "PR": "PARK",
+    "PRK": "PARK",
+    "PRKWAY": "PARKWAY",
+    "PRKWY": "PARKWAY",
+    "PROM": "PROMENADE",
+    "PT": "POINT",
+    "RD": "ROAD",
+    "RDS": "ROADS",
+    "RNCH": "RANCH",
+    "RTE": "ROUTE",
+    "S": "SOUTH",
+    "SE": "SOUTHEAST",
+    "SHR": "SHORE",
+    "SQ": "SQUARE",
+    "SQR": "SQUARE",
+    "ST": "STREET",
+    "STN": "STATION",
+    "STR": "STREET",
+    "SW": "SOUTHWEST",
+    "TER": "TERRACE",
+    "TNL": "TUNNEL",
+    "TPK": "TURNPIKE",
+    "TPKE": "TURNPIKE",
+    "TRL": "TRAIL",
+    "TUNL": "TUNNEL",
+    "VLY": "VALLEY",
+    "W": "WEST",
+    "WD": "WOOD",
+    "WDS": "WOODS",
+    "WLK": "WALK",
+    "WY": "WAY",
 }
 
+STREET_PATTERN = word_pattern(STREET_ABBREVIATIONS)
+
 
 def normalize(name: str) -> str:
     return replace_punctuation(name).upper().strip()
 
 
+@memoize
 def normalize_street_name(name: str) -> str:
-    normalized = normalize(name)
-    for pattern, replacement in STREET_PATTERNS.items():
-        normalized = pattern.sub(replacement, normalized)
+    normalized = replace_all(STREET_PATTERN, STREET_ABBREVIATIONS, normalize(name))
     return normalized.strip()
 
 
-NEIGHBORHOOD_PATTERNS = {
-    re.compile(r"^DOWNTOWN .*"): "DOWNTOWN",
-    re.compile(r"^MIDTOWN .*"): "MIDTOWN",
-    re.compile(r"^UPTOWN .*"): "UPTOWN",
-    re.compile(r"^CENTRAL .*"): "CENTRAL",
-    re.compile(r"CBD"): "CENTRAL",
-    re.compile(r"BUSINESS DISTRICT"): "CENTRAL",
-    re.compile(r"CENTRAL BUSINESS DISTRICT"): "CENTRAL",
-    re.compile(r"FINANCIAL DISTRICT"): "FINANCIAL DISTRICT",
-    re.compile(r"THE FINANCIAL DISTRICT"): "FINANCIAL DISTRICT",
+NEIGHBORHOOD_PREFIX_PATTERN = re.compile(r"^(DOWNTOWN|MIDTOWN|UPTOWN|CENTRAL) .*")
+
+NEIGHBORHOOD_REPLACEMENTS = {
+    "CBD": "CENTRAL",
+    "BUSINESS DISTRICT": "CENTRAL",
+    "FINANCIAL DISTRICT": "FINANCIAL DISTRICT",
+    "THE FINANCIAL DISTRICT": "FINANCIAL DISTRICT",
 }
 
+NEIGHBORHOOD_PATTERN = re.compile(
+    "|".join(sorted(NEIGHBORHOOD_REPLACEMENTS, key=len, reverse=True))
+)
+
 
+@memoize
 def normalize_neighborhood_name(name: str) -> str:
-    normalized = normalize(name)
-    for pattern, replacement in NEIGHBORHOOD_PATTERNS.items():
-        normalized = pattern.sub(replacement, normalized)
+    normalized = NEIGHBORHOOD_PREFIX_PATTERN.sub(r"\1", normalize(name), count=1)
+    normalized = replace_all(
+        NEIGHBORHOOD_PATTERN, NEIGHBORHOOD_REPLACEMENTS, normalized
+    )
     return normalized.strip()
 
 
-BOROUGH_PATTERNS = {
-    re.compile(r"^(THE )?.*?BOROUGH OF "): "",
-    re.compile(r", (THE )?.*BOROUGH OF$"): "",
-    re.compile(r"\bBORO\b"): "BOROUGH",
-    re.compile(r"\bBRO\b"): "BOROUGH",
+BOROUGH_PREFIX_PATTERN = re.compile(r"^(THE )?.*?BOROUGH OF ")
+
+BOROUGH_ABBREVIATIONS = {
+    "BORO": "BOROUGH",
+    "BRO": "BOROUGH",
 }
 
+BOROUGH_PATTERN = word_pattern(BOROUGH_ABBREVIATIONS)
+
 
+@memoize
 def normalize_borough_name(name: str) -> str:
-    normalized = normalize(name)
-    for pattern, replacement in BOROUGH_PATTERNS.items():
-        normalized = pattern.sub(replacement, normalized)
+    normalized = BOROUGH_PREFIX_PATTERN.sub("", normalize(name), count=1)
+    normalized = replace_all(BOROUGH_PATTERN, BOROUGH_ABBREVIATIONS, normalized)
     return normalized.strip()
 
 
-CITY_PATTERNS = {
-    re.compile(r"^(THE )?(CITY|TOWN|VILLAGE|MUNICIPALITY|DISTRICT) OF "): "",
-    re.compile(r", (THE )?(CITY|TOWN|VILLAGE|MUNICIPALITY|DISTRICT) OF$"): "",
-    re.compile(r"\bCITY$"): "",
-    re.compile(r"\bST\b"): "SAINT",
-    re.compile(r"\bMT\b"): "MOUNT",
-    re.compile(r"\bFT\b"): "FORT",
+CITY_PREFIX_PATTERN = re.compile(
+    r"^(THE )?(CITY|TOWN|VILLAGE|MUNICIPALITY|DISTRICT) OF "
+)
+
+CITY_ABBREVIATIONS = {
+    "ST": "SAINT",
+    "MT": "MOUNT",
+    "FT": "FORT",
 }
 
+# A trailing "CITY" is dropped in the same scan that expands abbreviations.
+CITY_PATTERN = re.compile(
+    rf"{word_pattern(CITY_ABBREVIATIONS).pattern}|\bCITY$"
+)
+
+CITY_REPLACEMENTS = {**CITY_ABBREVIATIONS, "CITY": ""}
 
-def normalize_city_name(name: str) -> str:
-    normalized = normalize(name)
-    for pattern, replacement in CITY_PATTERNS.items():
-        normalized = pattern.sub(replacement, normalized)
 
+@memoize
+def normalize_city_name(name: str) -> str:
+    normalized = CITY_PREFIX_PATTERN.sub("", normalize(name), count=1)
+    normalized = replace_all(CITY_PATTERN, CITY_REPLACEMENTS, normalized)
     return normalized.strip()
 
 
-COUNTY_PATTERNS = {
-    re.compile(r"^(THE )?(COUNTY OF )"): "",
-    re.compile(r", (THE )?(COUNTY OF )$"): "",
-    re.compile(r"\bCOUNTY\b"): "",
-    re.compile(r"\bCO\b"): "",
-    re.compile(r"\bCTY\b"): "",
+COUNTY_PREFIX_PATTERN = re.compile(r"^(THE )?(COUNTY OF )")
+
+COUNTY_ABBREVIATIONS = {
+    "COUNTY": "",
+    "CO": "",
+    "CTY": "",
 }
 
+COUNTY_PATTERN = word_pattern(COUNTY_ABBREVIATIONS)
 
+
+@memoize
 def normalize_county_name(name: str) -> str:
-    normalized = normalize(name)
-    for pattern, replacement in COUNTY_PATTERNS.items():
-        normalized = pattern.sub(replacement, normalized)
+    normalized = COUNTY_PREFIX_PATTERN.sub("", normalize(name), count=1)
+    normalized = replace_all(COUNTY_PATTERN, COUNTY_ABBREVIATIONS, normalized)
     return normalized.strip()
 
 
-STATE_PATTERNS = {
-    re.compile(r"^(THE )?(STATE|COMMONWEALTH) OF"): "",
-    re.compile(r", (THE )?(STATE|COMMONWEALTH) OF$"): "",
-    re.compile(r"\bSTATE\b"): "",
-    re.compile(r"\bST\b"): "",
+STATE_PREFIX_PATTERN = re.compile(r"^(THE )?(STATE|COMMONWEALTH) OF")
+
+STATE_ABBREVIATIONS = {
+    "STATE": "",
+    "ST": "",
 }
 
+STATE_PATTERN = word_pattern(STATE_ABBREVIATIONS)
+
 
+@memoize
 def normalize_state_name(name: str) -> str:
-    normalized = normalize(name)
-    for pattern, replacement in STATE_PATTERNS.items():
-        normalized = pattern.sub(replacement, normalized)
+    normalized = STATE_PREFIX_PATTERN.sub("", normalize(name), count=1)
+    normalized = replace_all(STATE_PATTERN, STATE_ABBREVIATIONS, normalized)
     return normalized.strip()
 
 
+@memoize
 def normalize_postal_code(name: str) -> str:
     normalized = normalize(replace_whitespace(name))
     return normalized.strip()
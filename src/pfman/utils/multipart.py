@@ -0,0 +1,91 @@
+from typing import AsyncIterable, AsyncIterator, NamedTuple, Optional
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+
+class MultipartPart(NamedTuple):
+    name: str
+    filename: Optional[str]
+    """The uploaded file name, None for plain form fields"""
+
+
+async def iter_multipart(
+    chunks: AsyncIterable[bytes], content_type: str
+) -> AsyncIterator[tuple[MultipartPart, bytes]]:
+    """
+    Parses a `multipart/form-data` body as it is received, without buffering
+    whole parts in memory or spooling files to disk.
+
+    Parts are yielded in the order they were sent, as pieces of data with the
+    part they belong to. Each part ends with an empty piece, so consumers know
+    when a field or file is complete.
+
+    Args:
+      chunks (AsyncIterable[bytes]): The body, such as `Request.stream()`.
+      content_type (str): The Content-Type header of the request, with its boundary.
+
+    Returns:
+      AsyncIterator[tuple[MultipartPart, bytes]]: The pieces of each part, in order.
+    """
+    media_type, params = parse_options_header(content_type)
+    if media_type != b"multipart/form-data":
+        raise ValueError("Expected a multipart/form-data body.")
+    boundary = params.get(b"boundary")
+    if not boundary:
+        raise ValueError("The multipart boundary is missing.")
+
+    pieces: list[tuple[MultipartPart, bytes]] = []
+    headers: dict[bytes, bytes] = {}
+    header = [b"", b""]
+    part: Optional[MultipartPart] = None
+
+    def on_part_begin():
+        headers.clear()
+
+    def on_header_field(data: bytes, start: int, end: int):
+        header[0] += data[start:end]
+
+    def on_header_value(data: bytes, start: int, end: int):
+        header[1] += data[start:end]
+
+    def on_header_end():
+        headers[header[0].lower()] = header[1]
+        header[:] = [b"", b""]
+
+    def on_headers_finished():
+        nonlocal part
+        _, options = parse_options_header(headers.get(b"content-disposition"))
+        filename = options.get(b"filename")
+        part = MultipartPart(
+            name=options.get(b"name", b"").decode(),
+            filename=filename.decode() if filename is not None else None,
+        )
+
+    def on_part_data(data: bytes, start: int, end: int):
+        if end > start:
+            pieces.append((part, data[start:end]))  # type: ignore
+
+    def on_part_end():
+        pieces.append((part, b""))  # type: ignore
+
+    parser = MultipartParser(
+        boundary,
+        {
+            "on_part_begin": on_part_begin,
+            "on_header_field": on_header_field,
+            "on_header_value": on_header_value,
+            "on_header_end": on_header_end,
+            "on_headers_finished": on_headers_finished,
+            "on_part_data": on_part_data,
+            "on_part_end": on_part_end,
+        },  # type: ignore
+    )
+
+    async for chunk in chunks:
+        parser.write(chunk)
+        for piece in pieces:
+            yield piece
+        pieces.clear()
+
+    parser.finalize()
+    for piece in pieces:
+        yield piece
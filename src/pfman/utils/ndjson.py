@@ -0,0 +1,36 @@
+from typing import AsyncIterable, AsyncIterator
+from pydantic import BaseModel
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+DEFAULT_NDJSON_CHUNK_SIZE = 64 * 1024
+
+
+async def iter_ndjson(
+    items: AsyncIterable[BaseModel], chunk_size: int = DEFAULT_NDJSON_CHUNK_SIZE
+) -> AsyncIterator[bytes]:
+    """
+    Serializes models as newline-delimited JSON as they arrive.
+
+    Lines are grouped into chunks of about `chunk_size` bytes, so a streaming
+    response sends few large body messages rather than one per item. This
+    keeps per-message overhead low, including the flush of a compressing
+    middleware such as `GZipMiddleware`, while memory use stays bounded by
+    the chunk size.
+
+    Args:
+      items (AsyncIterable[BaseModel]): The models to serialize.
+      chunk_size (int): The size in bytes from which a chunk is sent.
+
+    Returns:
+      AsyncIterator[bytes]: The chunks of the NDJSON document.
+    """
+    buffer = bytearray()
+    async for item in items:
+        buffer += item.model_dump_json(round_trip=True, exclude_none=True).encode()
+        buffer += b"\n"
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
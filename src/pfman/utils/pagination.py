@@ -0,0 +1,68 @@
+import base64
+import binascii
+from typing import Iterable, Optional, Sequence
+
+
+def encode_cursor(key: str) -> str:
+    """
+    Encode the key of the last item of a page as an opaque cursor.
+
+    Args:
+      key (str): The sort key of the last item returned.
+
+    Returns:
+      str: A URL-safe cursor to pass back to fetch the next page.
+    """
+    return base64.urlsafe_b64encode(key.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    """
+    Decode a cursor made by `encode_cursor` back into its key.
+
+    Args:
+      cursor (str): The cursor received from the client.
+
+    Returns:
+      str: The sort key of the last item of the previous page.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return base64.b64decode(padded.encode(), altchars=b"-_", validate=True).decode()
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def parse_fields(
+    fields: Optional[str], allowed: Sequence[str], key: str
+) -> tuple[str, ...]:
+    """
+    Parse a comma-separated field projection, keeping the sort key so the
+    next cursor can always be built.
+
+    Args:
+      fields (Optional[str]): The requested fields, such as "name,postal_code". None for all of them.
+      allowed (Sequence[str]): The fields that can be requested, in their output order.
+      key (str): The sort key of the items, always returned.
+
+    Returns:
+      tuple[str, ...]: The projected fields, in the order of `allowed`.
+    """
+    if not fields:
+        return tuple(allowed)
+
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    requested.add(key)
+    return tuple(field for field in allowed if field in requested)
+
+
+def projection(variable: str, fields: Iterable[str]) -> str:
+    """
+    Build a Cypher map projection such as `n {.name, .postal_code}`. The
+    fields must come from a known list, as they are not parameters.
+    """
+    return f"{variable} {{{', '.join(f'.{field}' for field in fields)}}}"
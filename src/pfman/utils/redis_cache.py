@@ -0,0 +1,213 @@
+import asyncio
+import hashlib
+import time
+from threading import Lock
+from typing import Awaitable, Callable, NamedTuple
+from loguru import logger
+from redis import Redis
+from redis.asyncio import Redis as AsyncRedis
+from redis.exceptions import LockError, RedisError
+
+DEFAULT_CACHE_TTL = 300
+
+# Seconds a loader may hold the lock of a key before other loaders stop waiting
+DEFAULT_LOCK_TIMEOUT = 10.0
+
+# Seconds between checks for a value being loaded by another process
+LOCK_POLL_INTERVAL = 0.05
+
+
+class ReadThroughCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    loads: int
+    """The misses that loaded the value, the others waited for another load"""
+    errors: int
+    """The lookups that fell back to loading because Redis failed"""
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def version_key(prefix: str, namespace: str) -> str:
+    return f"{prefix}:version:{namespace}"
+
+
+def cache_key(*parts: object) -> str:
+    """A short key for a set of arguments, such as the parameters of a query"""
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+class ReadThroughCache:
+    """
+    A Redis read-through cache of serialized values, grouped in versioned
+    namespaces.
+
+    Each namespace, such as the pages of one portfolio, has a version number
+    stored in Redis, and its values are stored under keys including that
+    version. Invalidating a namespace increments its version, so every value
+    cached for it is ignored at once and left to expire after `ttl` seconds.
+
+    A missing value is loaded only once at a time: concurrent lookups of this
+    process wait on the same load, and lookups of other processes wait for the
+    process holding the key's Redis lock to store it, up to `lock_timeout`.
+    When Redis fails, values are loaded directly. A `ttl` of 0 disables
+    caching.
+    """
+
+    def __init__(
+        self,
+        client: AsyncRedis,
+        prefix: str,
+        ttl: int = DEFAULT_CACHE_TTL,
+        lock_timeout: float = DEFAULT_LOCK_TIMEOUT,
+    ):
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+        self.lock_timeout = lock_timeout
+        self._loads: dict[str, asyncio.Future[bytes]] = {}
+        self._hits = 0
+        self._misses = 0
+        self._loaded = 0
+        self._errors = 0
+
+    async def get(
+        self, namespace: str, key: str, load: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        """
+        Returns the cached value of a key, loading and caching it on a miss.
+
+        Args:
+          namespace (str): The namespace of the key, as passed to `invalidate`.
+          key (str): The key within the namespace, such as from `cache_key`.
+          load (Callable[[], Awaitable[bytes]]): Loads the value on a miss.
+
+        Returns:
+          bytes: The cached or loaded value.
+        """
+        if self.ttl <= 0:
+            return await load()
+
+        try:
+            version = await self.client.get(version_key(self.prefix, namespace))
+            name = f"{self.prefix}:{namespace}:v{int(version or 0)}:{key}"
+            value = await self.client.get(name)
+        except RedisError as e:
+            logger.warning(f"Cache lookup failed, loading directly: {e}")
+            self._errors += 1
+            return await load()
+
+        if value is not None:
+            self._hits += 1
+            return value  # type: ignore
+
+        self._misses += 1
+        if name in self._loads:
+            return await asyncio.shield(self._loads[name])
+
+        future: asyncio.Future[bytes] = asyncio.get_running_loop().create_future()
+        self._loads[name] = future
+        try:
+            value = await self._load(name, load)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiting lookups get the error, this one re-raises it
+            future.exception()
+            raise
+        finally:
+            del self._loads[name]
+
+    async def _load(self, name: str, load: Callable[[], Awaitable[bytes]]) -> bytes:
+        """Loads a value under the key's Redis lock, or waits for the holder to store it"""
+        lock = self.client.lock(f"{name}:lock", timeout=self.lock_timeout)
+        try:
+            acquired = await lock.acquire(blocking=False)
+        except RedisError as e:
+            logger.warning(f"Cache lock failed, loading directly: {e}")
+            self._errors += 1
+            return await load()
+
+        if not acquired:
+            deadline = time.monotonic() + self.lock_timeout
+            try:
+                while time.monotonic() < deadline:
+                    await asyncio.sleep(LOCK_POLL_INTERVAL)
+                    value = await self.client.get(name)
+                    if value is not None:
+                        return value  # type: ignore
+                    if not await lock.locked():
+                        break
+            except RedisError as e:
+                logger.warning(f"Cache wait failed, loading directly: {e}")
+                self._errors += 1
+            # The holder failed or is too slow, so load without the lock
+            self._loaded += 1
+            return await load()
+
+        try:
+            self._loaded += 1
+            value = await load()
+            try:
+                await self.client.set(name, value, ex=self.ttl)
+            except RedisError as e:
+                logger.warning(f"Cache store failed: {e}")
+                self._errors += 1
+            return value
+        finally:
+            try:
+                await lock.release()
+            except (LockError, RedisError):
+                pass
+
+    async def invalidate(self, *namespaces: str) -> None:
+        """Drops every cached value of the namespaces"""
+        if self.ttl <= 0 or not namespaces:
+            return
+        pipeline = self.client.pipeline()
+        for namespace in namespaces:
+            pipeline.incr(version_key(self.prefix, namespace))
+        await pipeline.execute()
+
+    def info(self) -> ReadThroughCacheInfo:
+        """The counters of this process, as each process has its own"""
+        return ReadThroughCacheInfo(
+            hits=self._hits,
+            misses=self._misses,
+            loads=self._loaded,
+            errors=self._errors,
+        )
+
+
+class CacheInvalidator:
+    """
+    Invalidates namespaces of a `ReadThroughCache` from blocking code, such as
+    the import job workers.
+    """
+
+    def __init__(self, client: Redis, prefix: str):
+        self.client = client
+        self.prefix = prefix
+        self._lock = Lock()
+        self.errors = 0
+
+    def invalidate(self, *namespaces: str) -> None:
+        """Drops every cached value of the namespaces, logging rather than raising failures"""
+        if not namespaces:
+            return
+        try:
+            pipeline = self.client.pipeline()
+            for namespace in namespaces:
+                pipeline.incr(version_key(self.prefix, namespace))
+            pipeline.execute()
+        except RedisError as e:
+            logger.error(f"Failed to invalidate cached {', '.join(namespaces)}: {e}")
+            with self._lock:
+                self.errors += 1
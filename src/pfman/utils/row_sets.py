@@ -0,0 +1,70 @@
+import base64
+from typing import Iterable, Sequence
+
+
+def encode_runs(rows: Iterable[int]) -> list[int]:
+    """
+    Run-length encodes increasing row indexes as flat `[start, length, ...]` pairs.
+
+    Args:
+      rows (Iterable[int]): The row indexes, in increasing order.
+
+    Returns:
+      list[int]: The start and length of each run of consecutive rows.
+    """
+    runs: list[int] = []
+    for row in rows:
+        if runs and runs[-2] + runs[-1] == row:
+            runs[-1] += 1
+        else:
+            runs += (row, 1)
+    return runs
+
+
+def decode_runs(runs: Sequence[int]) -> list[int]:
+    """The row indexes of runs made by `encode_runs`"""
+    return [
+        row
+        for start, length in zip(runs[::2], runs[1::2])
+        for row in range(start, start + length)
+    ]
+
+
+def encode_bitmap(rows: Iterable[int], size: int) -> str:
+    """
+    Encodes row indexes as a bitmap of `size` bits, bit `i % 8` of byte `i // 8`
+    set for row `i`, in base64.
+
+    Args:
+      rows (Iterable[int]): The row indexes, below `size`.
+      size (int): The number of rows.
+
+    Returns:
+      str: The base64 encoded bitmap.
+    """
+    bitmap = bytearray((size + 7) // 8)
+    for row in rows:
+        bitmap[row >> 3] |= 1 << (row & 7)
+    return base64.b64encode(bitmap).decode()
+
+
+def decode_bitmap(bitmap: str) -> list[int]:
+    """The row indexes of a bitmap made by `encode_bitmap`"""
+    data = base64.b64decode(bitmap)
+    return [
+        (index << 3) + bit
+        for index, byte in enumerate(data)
+        if byte
+        for bit in range(8)
+        if byte >> bit & 1
+    ]
+
+
+def runs_size(runs: Sequence[int]) -> int:
+    """The approximate size in bytes of runs serialized as a JSON array"""
+    return sum(len(str(value)) + 1 for value in runs) + 1
+
+
+def bitmap_size(size: int) -> int:
+    """The size in bytes of a base64 bitmap of `size` rows serialized as a JSON string"""
+    return 4 * (((size + 7) // 8 + 2) // 3) + 2
@@ -0,0 +1,85 @@
+from typing import Iterable, Optional, Sequence
+from h3.api import basic_int as h3_int
+
+# The H3 resolutions stored for every property: roughly district (7),
+# neighborhood block (9) and building (15) sized cells
+DEFAULT_H3_RESOLUTIONS: tuple[int, ...] = (7, 9, 15)
+
+H3_MAX_RESOLUTION = 15
+
+# Layout of a 64-bit H3 cell index: a 4-bit resolution at bit 52, followed by
+# fifteen 3-bit digits, one per resolution, with unused digits set to 7
+H3_RESOLUTION_OFFSET = 52
+H3_RESOLUTION_MASK = 0xF << H3_RESOLUTION_OFFSET
+H3_DIGIT_BITS = 3
+
+
+def _parent_masks(resolution: int) -> tuple[int, int]:
+    """Returns the bits to keep and the bits to set to move a cell to a coarser resolution"""
+    unused_digits = (1 << ((H3_MAX_RESOLUTION - resolution) * H3_DIGIT_BITS)) - 1
+    keep = ~(H3_RESOLUTION_MASK | unused_digits)
+    return keep, (resolution << H3_RESOLUTION_OFFSET) | unused_digits
+
+
+def cell_to_parent(cell: int, resolution: int) -> int:
+    """
+    Returns the parent of an integer H3 cell at a coarser resolution, using bit
+    operations on the index instead of a call into the H3 library.
+    """
+    keep, set_bits = _parent_masks(resolution)
+    return (cell & keep) | set_bits
+
+
+def latlng_to_cells(
+    latitudes: Sequence[Optional[float]],
+    longitudes: Sequence[Optional[float]],
+    resolutions: Iterable[int] = DEFAULT_H3_RESOLUTIONS,
+) -> dict[int, list[Optional[int]]]:
+    """
+    Indexes coordinates into integer H3 cells at several resolutions in one pass.
+
+    Each coordinate is indexed once at the finest requested resolution and the
+    coarser cells are derived from it with `cell_to_parent`. Coarser cells are
+    therefore always ancestors of the finest cell, which keeps the keys nested;
+    near cell edges this can differ from indexing the point directly at the
+    coarser resolution, as H3 cells are not strictly contained by their
+    parents. Rows without a latitude or longitude get None, while 0.0 is a
+    real coordinate on the equator or prime meridian.
+
+    Args:
+      latitudes (Sequence[Optional[float]]): The latitudes, in degrees.
+      longitudes (Sequence[Optional[float]]): The longitudes, in degrees.
+      resolutions (Iterable[int]): The H3 resolutions to index. Defaults to DEFAULT_H3_RESOLUTIONS.
+
+    Returns:
+      dict[int, list[Optional[int]]]: The cells of every coordinate, keyed by resolution.
+    """
+    if len(latitudes) != len(longitudes):
+        raise ValueError("Latitudes and longitudes must have the same length.")
+
+    resolutions = sorted(set(resolutions))
+    if not resolutions:
+        raise ValueError("At least one resolution must be provided.")
+
+    finest = resolutions[-1]
+    latlng_to_cell = h3_int.latlng_to_cell
+    cells = [
+        latlng_to_cell(latitude, longitude, finest)
+        if latitude is not None and longitude is not None
+        else None
+        for latitude, longitude in zip(latitudes, longitudes)
+    ]
+
+    indexed = {finest: cells}
+    for resolution in resolutions[:-1]:
+        keep, set_bits = _parent_masks(resolution)
+        indexed[resolution] = [
+            (cell & keep) | set_bits if cell is not None else None for cell in cells
+        ]
+
+    return indexed
+
+
+def cell_to_string(cell: int) -> str:
+    """Returns the hexadecimal string form of an integer H3 cell, as used by `Address.h3_cell`"""
+    return h3_int.int_to_str(cell)
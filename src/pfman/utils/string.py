@@ -3,6 +3,24 @@ from typing import Literal, Optional, Union
 from urllib3.util import parse_url, url
 
 
+# Digits as accepted by int() and float(), including underscore separators
+_DIGITS = r"\d+(?:_\d+)*"
+
+# The whitespace int() and float() strip, which unlike str.strip() excludes the
+# \x1c-\x1f separators
+_SPACE = r"[^\S\x1c-\x1f]*"
+
+# The strings int() accepts, so integers can be recognized without raising
+INT_REGEX = re.compile(rf"{_SPACE}[+-]?{_DIGITS}{_SPACE}")
+
+# The strings float() accepts, so numbers can be recognized without raising
+FLOAT_REGEX = re.compile(
+    rf"{_SPACE}[+-]?(?:(?:{_DIGITS}(?:\.(?:{_DIGITS})?)?|\.{_DIGITS})(?:e[+-]?{_DIGITS})?"
+    rf"|inf(?:inity)?|nan){_SPACE}",
+    re.IGNORECASE,
+)
+
+
 def is_int(maybe_int: str) -> bool:
     """
     Check if the given string is a valid integer.
@@ -13,11 +31,7 @@ def is_int(maybe_int: str) -> bool:
     Returns:
         bool: True if the string is a valid integer, False otherwise.
     """
-    try:
-        int(maybe_int)
-        return True
-    except ValueError:
-        return False
+    return INT_REGEX.fullmatch(maybe_int) is not None
 
 
 def is_url(maybe_url: str) -> bool:
@@ -96,11 +110,11 @@ def parse_float(maybe_float: str | float) -> Optional[float]:
 
     maybe_float = maybe_float.strip()
 
-    try:
-        return float(maybe_float)
-    except ValueError:
+    if FLOAT_REGEX.fullmatch(maybe_float) is None:
         return None
 
+    return float(maybe_float)
+
 
 def parse_percentage(
     maybe_float: str | float, range_parse_type: RangeParseType = "lower"
@@ -134,10 +148,10 @@ def parse_percentage(
         return (float(match.group(1 if range_parse_type == "lower" else 3))) / 100.0
 
     if "%" in maybe_float:
-        try:
-            return float(maybe_float.strip("%")) / 100.0
-        except:
+        value = maybe_float.strip("%")
+        if FLOAT_REGEX.fullmatch(value) is None:
             return None
+        return float(value) / 100.0
 
     return None
 
@@ -0,0 +1,51 @@
+import time
+from threading import Lock
+from typing import Any, Mapping, Optional, Sequence
+from .SessionStore import SessionStore
+
+DEFAULT_SESSION_TTL = 60 * 60
+
+
+class InProcessSessionStore(SessionStore):
+    """
+    Keeps sessions in memory in this process. Sessions are lost on restart and
+    are not shared between processes, so this backend is meant for tests and
+    development. Sessions expire `ttl` seconds after their last use.
+    """
+
+    def __init__(self, *args, ttl: int = DEFAULT_SESSION_TTL, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.ttl = ttl
+        self._sessions: dict[str, tuple[dict[int, dict[str, Any]], float]] = {}
+        self._lock = Lock()
+
+    def _expire(self, now: float) -> None:
+        for session_id in [
+            session_id
+            for session_id, (_, expires_at) in self._sessions.items()
+            if expires_at <= now
+        ]:
+            del self._sessions[session_id]
+
+    def get_rows(
+        self, session_id: str, rows: Sequence[int]
+    ) -> Optional[dict[int, dict[str, Any]]]:
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            if session_id not in self._sessions:
+                return None
+            stored, _ = self._sessions[session_id]
+            self._sessions[session_id] = (stored, now + self.ttl)
+            return {row: dict(stored[row]) for row in rows if row in stored}
+
+    def save_rows(self, session_id: str, rows: Mapping[int, dict[str, Any]]) -> None:
+        now = time.monotonic()
+        with self._lock:
+            stored, _ = self._sessions.get(session_id, ({}, now))
+            stored.update((row, dict(values)) for row, values in rows.items())
+            self._sessions[session_id] = (stored, now + self.ttl)
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
@@ -0,0 +1,135 @@
+import math
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Mapping, Optional, Sequence
+from loguru import logger
+from pfman.models import Address, RowValidationCache
+from pfman.models.AddressBatch import ADDRESS_FIELDS
+from pfman.models.RowValidationCache import DEFAULT_ROW_CACHE_SIZE
+from pfman.utils.cache import DEFAULT_MAXSIZE, configure_caches
+from pfman.utils.geo import load_indexes
+
+# Inputs smaller than this are validated in-process, as shipping them to the
+# workers costs more than it saves
+DEFAULT_PARALLEL_MIN_ROWS = 2_000
+
+# The rows validated by a worker process, kept between tasks
+_worker_cache: Optional[RowValidationCache] = None
+
+# The validated field values of a valid row, in ADDRESS_FIELDS order
+AddressValues = tuple[Any, ...]
+
+
+def _init_worker(cache_size: int, normalization_cache_size: int) -> None:
+    """Prepares a worker process to validate rows, loading the geo indexes up front"""
+    global _worker_cache
+    configure_caches(normalization_cache_size)
+    load_indexes()
+    _worker_cache = RowValidationCache(cache_size)
+
+
+def _ready() -> bool:
+    return _worker_cache is not None
+
+
+def _validate_shard(
+    rows: Sequence[Mapping[str, Any]],
+) -> tuple[list[Optional[AddressValues]], dict[int, dict[str, str]]]:
+    """Validates a shard of rows in a worker, returning plain values that are cheap to send back"""
+    validation = _worker_cache.validate(rows)  # type: ignore
+    values = [
+        tuple(getattr(address, field) for field in ADDRESS_FIELDS) if address else None
+        for address in validation.addresses
+    ]
+    return values, validation.errors
+
+
+def _address(values: AddressValues) -> Address:
+    """Rebuilds an address validated by a worker, without validating it again"""
+    fields = dict(zip(ADDRESS_FIELDS, values))
+    return Address.model_construct(
+        _fields_set={field for field, value in fields.items() if value is not None},
+        **fields,
+    )
+
+
+class ParallelRowValidationCache(RowValidationCache):
+    """
+    A `RowValidationCache` that shards large inputs across a pool of worker
+    processes, so validating a big import uses every core rather than one.
+
+    Rows are looked up in the cache of this process first. When at least
+    `min_rows` distinct rows are missing from it, they are split into one
+    contiguous shard per worker, validated in parallel, merged back in order
+    and cached. Workers are started once by `start` and kept for the lifetime
+    of the pool, each with its geo indexes loaded, so no task pays for a cold
+    start. Fewer missing rows, or all rows when the pool is not started, are
+    validated in this process.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_ROW_CACHE_SIZE,
+        min_rows: int = DEFAULT_PARALLEL_MIN_ROWS,
+        normalization_cache_size: int = DEFAULT_MAXSIZE,
+    ):
+        super().__init__(maxsize)
+        self.maxsize = maxsize
+        self.min_rows = min_rows
+        self.normalization_cache_size = normalization_cache_size
+        self.workers = 0
+        self._executor: Optional[Executor] = None
+
+    def start(self, workers: int) -> None:
+        """Starts `workers` worker processes and waits until they are ready, none if 0"""
+        if workers <= 0 or self._executor is not None:
+            return
+
+        # Spawned rather than forked, as the parent process runs threads
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.maxsize, self.normalization_cache_size),
+        )
+        self.workers = workers
+        try:
+            for future in [self._executor.submit(_ready) for _ in range(workers)]:
+                future.result()
+        except BrokenProcessPool:
+            logger.exception("Validation workers failed to start, validating in-process")
+            self.stop()
+
+    def stop(self) -> None:
+        """Stops the worker processes, letting running validations finish"""
+        executor, self._executor = self._executor, None
+        self.workers = 0
+        if executor:
+            executor.shutdown(wait=True)
+
+    def _validate_uncached(
+        self, rows: Sequence[Mapping[str, Any]]
+    ) -> list[tuple[Optional[Address], Optional[dict[str, str]]]]:
+        executor = self._executor
+        if executor is None or len(rows) < max(self.min_rows, 2):
+            return super()._validate_uncached(rows)
+
+        shard_size = math.ceil(len(rows) / self.workers)
+        offsets = range(0, len(rows), shard_size)
+        try:
+            shards = list(
+                executor.map(
+                    _validate_shard, [rows[offset : offset + shard_size] for offset in offsets]
+                )
+            )
+        except BrokenProcessPool:
+            logger.exception("Validation worker pool failed, validating in-process from now on")
+            self.stop()
+            return super()._validate_uncached(rows)
+
+        return [
+            (_address(value), None) if value is not None else (None, errors[row])
+            for values, errors in shards
+            for row, value in enumerate(values)
+        ]
@@ -0,0 +1,59 @@
+import json
+from typing import Any, Mapping, Optional, Sequence
+from redis import Redis
+from .InProcessSessionStore import DEFAULT_SESSION_TTL
+from .SessionStore import SessionStore
+
+# Number of rows written to Redis per round trip when a session is created
+WRITE_BATCH_SIZE = 5_000
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Stores the rows of each session in a Redis hash keyed on row index, so
+    every API process can patch any session and a patch only reads and writes
+    the edited rows. Sessions expire `ttl` seconds after their last use.
+    """
+
+    def __init__(
+        self,
+        client: Redis,
+        *args,
+        ttl: int = DEFAULT_SESSION_TTL,
+        prefix: str = "pfman:validation",
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _rows_key(self, session_id: str) -> str:
+        return f"{self.prefix}:rows:{session_id}"
+
+    def get_rows(
+        self, session_id: str, rows: Sequence[int]
+    ) -> Optional[dict[int, dict[str, Any]]]:
+        key = self._rows_key(session_id)
+        pipeline = self.client.pipeline()
+        pipeline.expire(key, self.ttl)
+        if rows:
+            pipeline.hmget(key, [str(row) for row in rows])
+        found, *values = pipeline.execute()
+        if not found:
+            return None
+        return {
+            row: json.loads(data)
+            for row, data in zip(rows, values[0] if values else [])
+            if data is not None
+        }
+
+    def save_rows(self, session_id: str, rows: Mapping[int, dict[str, Any]]) -> None:
+        key = self._rows_key(session_id)
+        items = [(str(row), json.dumps(values)) for row, values in rows.items()]
+        for start in range(0, len(items), WRITE_BATCH_SIZE):
+            self.client.hset(key, mapping=dict(items[start : start + WRITE_BATCH_SIZE]))
+        self.client.expire(key, self.ttl)
+
+    def delete(self, session_id: str) -> bool:
+        return bool(self.client.delete(self._rows_key(session_id)))
@@ -0,0 +1,121 @@
+from abc import ABC, abstractmethod
+from typing import Any, Mapping, Optional, Sequence
+from uuid import uuid4
+from pfman.models import (
+    Address,
+    CellEdit,
+    RowChange,
+    RowValidationCache,
+    ValidationPatchResult,
+    ValidationReport,
+    ValidationSession,
+)
+from pfman.models.AddressBatch import ADDRESS_FIELDS
+from pfman.models.PortfolioImport import DEFAULT_IMPORT_CHUNK_SIZE
+
+
+def _values(address: Optional[Address]) -> dict[str, Any]:
+    """The validated field values of an address, empty for an invalid row"""
+    return {field: getattr(address, field) for field in ADDRESS_FIELDS} if address else {}
+
+
+class SessionStore(ABC):
+    """
+    Keeps the rows of validation sessions, so the review step can fix cells
+    one edit at a time without re-sending and re-validating the whole file.
+
+    `create` validates the rows and stores them. `patch` applies cell edits to
+    the stored rows and revalidates only the edited rows, reporting the rows
+    whose validity, errors or validated values changed. Only the raw rows are
+    stored: their previous state is recomputed through the
+    `RowValidationCache`, where it was cached when the rows were validated.
+
+    Backends implement how rows are stored.
+    """
+
+    def __init__(
+        self, cache: RowValidationCache, chunk_size: int = DEFAULT_IMPORT_CHUNK_SIZE
+    ):
+        self.cache = cache
+        self.chunk_size = max(chunk_size, 1)
+
+    def create(self, rows: Sequence[Mapping[str, Any]]) -> ValidationSession:
+        """
+        Validates rows and stores them in a new session.
+
+        Args:
+          rows (Sequence[Mapping[str, Any]]): The rows, mapped to address fields.
+
+        Returns:
+          ValidationSession: The session ID and the validation report of the rows.
+        """
+        session = ValidationSession(
+            id=uuid4().hex,
+            report=ValidationReport.from_rows(rows, self.cache, self.chunk_size),
+        )
+        self.save_rows(session.id, {row: dict(values) for row, values in enumerate(rows)})
+        return session
+
+    def patch(self, session_id: str, edits: Sequence[CellEdit]) -> Optional[ValidationPatchResult]:
+        """
+        Applies cell edits to the rows of a session and revalidates the edited rows.
+
+        Args:
+          session_id (str): The session ID.
+          edits (Sequence[CellEdit]): The edits, applied in order.
+
+        Returns:
+          Optional[ValidationPatchResult]: The changes of the edited rows, None if the session is unknown or expired.
+        """
+        edited = sorted({edit.row for edit in edits})
+        before = self.get_rows(session_id, edited)
+        if before is None:
+            return None
+        if missing := [row for row in edited if row not in before]:
+            raise ValueError(f"Rows not in the session: {', '.join(map(str, missing))}")
+
+        after = {row: dict(before[row]) for row in edited}
+        for edit in edits:
+            after[edit.row][edit.field] = edit.value
+
+        old = self.cache.validate([before[row] for row in edited])
+        new = self.cache.validate([after[row] for row in edited])
+        self.save_rows(session_id, after)
+
+        changes = []
+        for position, row in enumerate(edited):
+            old_errors = old.errors.get(position, {})
+            new_errors = new.errors.get(position, {})
+            old_values = _values(old.addresses[position])
+            new_values = _values(new.addresses[position])
+            if old_values:
+                values = {
+                    field: value
+                    for field, value in new_values.items()
+                    if old_values[field] != value
+                }
+            else:
+                # A row turning valid had no values, so only its set values changed
+                values = {field: value for field, value in new_values.items() if value is not None}
+            if values or old_errors != new_errors:
+                changes.append(
+                    RowChange(row=row, valid=not new_errors, errors=new_errors, values=values)
+                )
+        return ValidationPatchResult(rows=changes)
+
+    @abstractmethod
+    def get_rows(
+        self, session_id: str, rows: Sequence[int]
+    ) -> Optional[dict[int, dict[str, Any]]]:
+        """Returns the given rows of a session present in it, None if the session is unknown or expired"""
+        pass
+
+    @abstractmethod
+    def save_rows(self, session_id: str, rows: Mapping[int, dict[str, Any]]) -> None:
+        """Stores rows of a session, creating the session if needed"""
+        pass
+
+    @abstractmethod
+    def delete(self, session_id: str) -> bool:
+        """Deletes a session, returning whether it existed"""
+        pass
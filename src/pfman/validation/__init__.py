@@ -0,0 +1,11 @@
+from .InProcessSessionStore import InProcessSessionStore
+from .ParallelRowValidationCache import ParallelRowValidationCache
+from .RedisSessionStore import RedisSessionStore
+from .SessionStore import SessionStore
+
+__all__ = [
+    "InProcessSessionStore",
+    "ParallelRowValidationCache",
+    "RedisSessionStore",
+    "SessionStore",
+]
@@ -0,0 +1,11 @@
+import os
+
+# The app settings are read at import time, so tests provide the required ones
+os.environ.setdefault("ENV", "test")
+os.environ.setdefault("NEO4J_URL", "bolt://localhost:7687")
+os.environ.setdefault("NEO4J_CONNECTION_STRING", "bolt://localhost:7687")
+os.environ.setdefault("NEO4J_PASSWORD", "password")
+os.environ.setdefault("REDIS_URL", "redis://localhost:6379")
+os.environ.setdefault("REDIS_PASSWORD", "password")
+os.environ.setdefault("SESSION_SECRET", "secret")
+os.environ.setdefault("SITE_URL", "http://localhost:8000")
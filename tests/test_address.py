@@ -0,0 +1,60 @@
+from pfman.models import Address
+
+
+def address() -> Address:
+    return Address(
+        address_line="12 Main St",
+        city="St. Louis",
+        country="US",
+        latitude=38.6,
+        longitude=-90.2,
+    )
+
+
+def test_assigning_a_field_recomputes_its_computed_fields():
+    subject = address()
+    assert subject.normalized_city == "SAINT LOUIS"
+    cell = subject.h3_cell
+
+    subject.city = "Mt Vernon"
+    subject.latitude = 40.0
+
+    assert subject.normalized_city == "MOUNT VERNON"
+    assert subject.h3_cell != cell
+    assert subject.normalized_street == "MAIN STREET"
+
+
+def test_model_copy_recomputes_updated_computed_fields_only():
+    subject = address()
+    assert subject.normalized_street == "MAIN STREET"
+
+    copied = subject.model_copy(update={"street": "Oak Ave"})
+
+    assert copied.normalized_street == "OAK AVENUE"
+    assert copied.normalized_city == "SAINT LOUIS"
+    assert subject.normalized_street == "MAIN STREET"
+
+
+def test_pick_subset_keeps_only_the_given_attributes():
+    subject = address()
+    subset = subject.pick_subset(["house_number", "street", "city", "postal_code"])
+
+    # The house number split from the address line is validated as Address would
+    assert subset.model_dump(exclude_none=True, include=set(Address.model_fields)) == {
+        "house_number": 12,
+        "street": "Main St",
+        "city": "St. Louis",
+    }
+    assert subset.country is None and subset.normalized_country_code is None
+
+
+def test_pick_subset_carries_over_computed_fields_of_included_sources():
+    subject = address()
+    assert subject.normalized_street == "MAIN STREET"
+    assert subject.h3_cell is not None
+
+    subset = subject.pick_subset(["street", "latitude"])
+
+    assert subset.__dict__.get("normalized_street") == "MAIN STREET"
+    assert "h3_cell" not in subset.__dict__
+    assert subset.h3_cell is None
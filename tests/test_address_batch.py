@@ -0,0 +1,62 @@
+from pydantic import ValidationError
+from pfman.models import Address, AddressBatch
+
+
+def test_h3_cell_matches_addresses_at_zero_coordinates():
+    rows = [
+        {"address_line": "1 Main St", "country_code": "US", "latitude": 0.0, "longitude": 0.0},
+        {"address_line": "2 Main St", "country_code": "US", "latitude": 0.0, "longitude": 12.5},
+        {"address_line": "3 Main St", "country_code": "US"},
+    ]
+    cells = AddressBatch.from_rows(rows).normalized("h3_cell")
+
+    assert cells == [Address(**row).h3_cell for row in rows]
+    assert cells[0] is not None and cells[2] is None
+    assert Address(latitude=0.0, longitude=0.0).is_valid_property_address()
+
+
+ROWS = [
+    {"address_line": "12 Main St", "city": "Chicago", "country": "US", "postal_code": "60601"},
+    {"address_line": "3 Oak Ave", "latitude": "north", "country": "US"},
+    {"name": "HQ", "street": "Elm St", "country": "Germany", "postal_code": " 10115 "},
+    {"street": "Elm St", "country": "Atlantis"},
+    {"latitude": "91", "longitude": "0"},
+    {"address_line": "1 Pier", "state": "Illinois", "country": "US", "latitude": 41.89},
+]
+
+
+def test_batch_validation_matches_addresses():
+    batch = AddressBatch.from_rows(ROWS)
+
+    for row, values in enumerate(ROWS):
+        try:
+            address = Address(**values)
+        except ValidationError as e:
+            assert set(batch.row_errors(row)) == {error["loc"][0] for error in e.errors()}
+            assert not batch.valid_mask[row]
+        else:
+            assert batch.row_errors(row) == {}
+            assert batch.address(row).model_dump() == address.model_dump()
+
+
+def test_duplicates_cluster_rows_of_the_same_property():
+    rows = [
+        {"address_line": "12 Main St", "city": "Chicago", "country": "US", "postal_code": "60601"},
+        {"house_number": "12", "street": "Main Street", "country": "US", "postal_code": "60601"},
+        {"address_line": "14 Main St", "country": "US", "postal_code": "60601"},
+        {"name": "Navy Pier", "street": "Pier", "latitude": 41.89, "longitude": -87.6},
+        {"address_line": "1 Pier", "country": "US", "latitude": 41.89, "longitude": -87.6},
+        {"address_line": "12 Main St", "country": "US", "latitude": "north"},
+    ]
+
+    assert AddressBatch.from_rows(rows).duplicates() == [[0, 1], [3, 4]]
+
+
+def test_duplicates_tell_apart_units():
+    rows = [
+        {"address_line": "12 Main St", "unit": "Apt 1", "country": "US", "postal_code": "60601"},
+        {"address_line": "12 Main St", "unit": "Apt 2", "country": "US", "postal_code": "60601"},
+        {"address_line": "12 Main St", "unit": "apt. 1", "country": "US", "postal_code": "60601"},
+    ]
+
+    assert AddressBatch.from_rows(rows).duplicates() == [[0, 2]]
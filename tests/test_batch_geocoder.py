@@ -0,0 +1,31 @@
+from redis import Redis
+from redis.backoff import NoBackoff
+from redis.retry import Retry
+from pfman.geocoders import BatchGeocoder, FakeGeocodingProvider, RedisGeocodeCache
+from pfman.models import Address
+
+
+def test_geocodes_without_an_unreachable_cache():
+    cache = RedisGeocodeCache(Redis(port=1, retry=Retry(NoBackoff(), 0)))
+    geocoder = BatchGeocoder(FakeGeocodingProvider(latency=0), cache)
+    try:
+        addresses, geocoded = geocoder.fill_coordinates(
+            [Address(address_line="1 Main St", city="Springfield", country_code="US")]
+        )
+    finally:
+        geocoder.stop()
+    assert geocoded == 1
+    assert addresses[0] is not None and addresses[0].latitude is not None
+
+
+def test_keeps_zero_coordinates():
+    geocoder = BatchGeocoder(FakeGeocodingProvider(latency=0))
+    address = Address(
+        address_line="1 Main St", city="Springfield", country_code="US", latitude=0.0, longitude=0.0
+    )
+    try:
+        addresses, geocoded = geocoder.fill_coordinates([address])
+    finally:
+        geocoder.stop()
+    assert geocoded == 0
+    assert addresses == [address]
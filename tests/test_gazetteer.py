@@ -0,0 +1,12 @@
+from pfman.geocoders.Gazetteer import Gazetteer, haversine_km
+
+
+def test_reverse_finds_entries_beyond_neighbor_cells():
+    # About 9.9 km apart, with a whole H3 cell between their cells
+    gazetteer = Gazetteer(
+        [{"country_code": "US", "city": "Far", "latitude": "35.5688", "longitude": "-75.9571"}]
+    )
+    assert haversine_km(35.4798, -75.9613, 35.5688, -75.9571) < 10
+    entry = gazetteer.reverse(35.4798, -75.9613)
+    assert entry is not None and entry.city == "Far"
+    assert gazetteer.reverse(35.4798, -75.9613, max_distance_km=5) is None
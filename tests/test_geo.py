@@ -0,0 +1,31 @@
+import pytest
+from pfman.utils.geo import get_country, get_state, get_subdivision, get_subdivisions
+
+
+def test_get_country_ignores_numeric_zero():
+    assert get_country(q="Nowhere", numeric=0) is None
+    assert get_country(q="Germany", numeric=0).name == "Germany"  # type: ignore
+
+
+def test_get_country_matches_names_and_codes_case_insensitively():
+    for query in ["germany", "GERMANY", "de", "DEU", "Federal Republic of Germany"]:
+        assert get_country(q=query).alpha_2 == "DE"  # type: ignore
+    assert get_country(numeric=276).alpha_2 == "DE"  # type: ignore
+    assert get_country(code="us").name == "United States"  # type: ignore
+    assert get_country(name="united states").alpha_2 == "US"  # type: ignore
+    assert get_country(q="Nowhere") is None
+
+
+def test_get_country_requires_a_parameter():
+    with pytest.raises(ValueError):
+        get_country()
+
+
+def test_get_state_matches_names_and_codes_within_a_country():
+    assert get_state(q="california").code == "US-CA"  # type: ignore
+    assert get_state(code="CA", country_code="US").code == "US-CA"  # type: ignore
+    assert get_state(q="Texas", country_code="US").state_code == "TX"  # type: ignore
+    assert get_subdivision(name="ontario", country_code="CA").code == "CA-ON"  # type: ignore
+    assert [subdivision.code for subdivision in get_subdivisions(q="ca", country_code="US")] == [
+        "US-CA"
+    ]
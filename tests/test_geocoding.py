@@ -0,0 +1,38 @@
+import pytest
+from pfman.utils.cache import clear_caches
+from pfman.utils.geocoding import (
+    normalize_borough_name,
+    normalize_city_name,
+    normalize_county_name,
+    normalize_postal_code,
+    normalize_state_name,
+    normalize_street_name,
+)
+
+
+@pytest.mark.parametrize(
+    "normalizer, name, expected",
+    [
+        (normalize_street_name, "123 N. Main St., Apt", "123 NORTH MAIN STREET APT"),
+        (normalize_street_name, "E Cir Dr", "EAST CIRCLE DRIVE"),
+        (normalize_city_name, "City of St. Louis", "SAINT LOUIS"),
+        (normalize_city_name, "New York City", "NEW YORK"),
+        (normalize_county_name, "The County of Cook", "COOK"),
+        (normalize_county_name, "Cook Co.", "COOK"),
+        (normalize_state_name, "State of New York", "NEW YORK"),
+        (normalize_borough_name, "The Borough of Manhattan", "MANHATTAN"),
+        (normalize_borough_name, "Bronx Boro", "BRONX BOROUGH"),
+        (normalize_postal_code, " sw1a  1aa ", "SW1A 1AA"),
+    ],
+)
+def test_normalizers_expand_each_word_once(normalizer, name, expected):
+    assert normalizer(name) == expected
+
+
+def test_normalizers_are_memoized():
+    clear_caches()
+    assert normalize_street_name("5 Ocean Blvd") == "5 OCEAN BOULEVARD"
+    assert normalize_street_name("5 Ocean Blvd") == "5 OCEAN BOULEVARD"
+
+    info = normalize_street_name.cache.info()  # type: ignore
+    assert (info.hits, info.misses) == (1, 1)
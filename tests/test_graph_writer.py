@@ -0,0 +1,103 @@
+import os
+from uuid import uuid4
+import pytest
+from pfman.graph.Writer import GraphWriter, hierarchy_levels
+from pfman.models import Address
+from pfman.utils.neo4j import get_driver
+
+# A Neo4j database the tests may write to, such as the one of compose.yml
+CONNECTION_STRING = os.getenv("NEO4J_TEST_CONNECTION_STRING")
+
+pytestmark = pytest.mark.skipif(
+    not CONNECTION_STRING, reason="NEO4J_TEST_CONNECTION_STRING is not set"
+)
+
+
+@pytest.fixture
+def driver():
+    driver = get_driver(CONNECTION_STRING)  # type: ignore
+    yield driver
+    driver.close()
+
+
+@pytest.fixture
+def portfolio(driver):
+    """A portfolio ID and a country unique to the test, deleted with everything in them"""
+    portfolio_id = uuid4().hex
+    country = f"Testland {portfolio_id}"
+    yield portfolio_id, country
+
+    country_key = hierarchy_levels(Address(country=country))["Country"][0]
+    with driver.session() as session:
+        session.run(
+            "MATCH (p:Portfolio {portfolio_id: $portfolio_id}) "
+            "OPTIONAL MATCH (p)-[:INCLUDES]->(n:Property) DETACH DELETE p, n",
+            portfolio_id=portfolio_id,
+        ).consume()
+        session.run(
+            "MATCH (n) WHERE n.key STARTS WITH $key DETACH DELETE n", key=country_key
+        ).consume()
+
+
+def write(driver, portfolio_id: str, rows: list[dict]) -> None:
+    writer = GraphWriter(driver, batch_size=2)
+    write_chunk = writer.portfolio_writer(portfolio_id, "Test", None)
+    write_chunk(range(len(rows)), [Address(**row) for row in rows])
+
+
+def levels_of(driver, property_id: str) -> dict[str, tuple[str, str]]:
+    """The name on each IN relationship of a property, and the key of its level"""
+    with driver.session() as session:
+        result = session.run(
+            "MATCH (:Property {property_id: $property_id})-[r:IN]->(level) "
+            "RETURN head(labels(level)) AS label, r.name AS name, level.key AS key",
+            property_id=property_id,
+        )
+        return {record["label"]: (record["name"], record["key"]) for record in result}
+
+
+def test_property_is_linked_to_every_level(driver, portfolio):
+    portfolio_id, country = portfolio
+    write(
+        driver,
+        portfolio_id,
+        [
+            {
+                "address_line": "1 Main St",
+                "neighborhood": "Old Town",
+                "city": "Springfield",
+                "county": "North",
+                "country": country,
+            }
+        ],
+    )
+
+    levels = levels_of(driver, f"{portfolio_id}:0")
+    assert set(levels) == {"Country", "County", "City", "Neighborhood", "Street"}
+    assert levels["Neighborhood"][0] == "Old Town"
+
+
+def test_cities_are_keyed_on_their_county(driver, portfolio):
+    portfolio_id, country = portfolio
+    write(
+        driver,
+        portfolio_id,
+        [
+            {"address_line": "1 Main St", "city": "Springfield", "county": "North", "country": country},
+            {"address_line": "2 Main St", "city": "SPRINGFIELD", "county": "South", "country": country},
+        ],
+    )
+
+    first, second = levels_of(driver, f"{portfolio_id}:0"), levels_of(driver, f"{portfolio_id}:1")
+    assert first["City"][1] != second["City"][1]
+    assert (first["County"][0], second["County"][0]) == ("North", "South")
+    # Each row keeps its own spelling of the places it shares with others
+    assert (first["City"][0], second["City"][0]) == ("Springfield", "SPRINGFIELD")
+
+    with driver.session() as session:
+        counties = session.run(
+            "MATCH (city:City)-[:IN]->(county:County) WHERE city.key IN $keys "
+            "RETURN collect(county.name) AS counties",
+            keys=[first["City"][1], second["City"][1]],
+        ).single()["counties"]  # type: ignore
+    assert sorted(counties) == ["North", "South"]
@@ -0,0 +1,89 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pfman.jobs import InProcessJobQueue
+from pfman.models import RowValidationCache
+from pfman.routes.dependencies import get_job_queue
+from pfman.routes.portfolio import portfolio_router
+
+CSV = b"Address,City,Country,Latitude\n1 Main St,Chicago,US,\n2 Elm St,Chicago,US,north\n"
+
+MAPPING = (
+    b'{"Address": "address_line", "City": "city", "Country": "country", "Latitude": "latitude"}'
+)
+
+
+@pytest.fixture
+def written() -> list:
+    return []
+
+
+@pytest.fixture
+def client(written) -> TestClient:
+    def writer(portfolio_id, title, description):
+        def write(rows, addresses):
+            written.extend((title, address) for address in addresses if address)
+            return len(addresses)
+
+        return write
+
+    queue = InProcessJobQueue(cache=RowValidationCache(100), writer=writer, chunk_size=1)
+    app = FastAPI()
+    app.include_router(portfolio_router)
+    app.dependency_overrides[get_job_queue] = lambda: queue
+    return TestClient(app)
+
+
+def post_import(client: TestClient, mapping: bytes, title: bytes = b"Offices", csv: bytes = CSV):
+    return client.post(
+        "/import",
+        files=[
+            ("title", (None, title)),
+            ("mapping", (None, mapping)),
+            ("file", ("portfolio.csv", csv, "text/csv")),
+        ],
+    )
+
+
+def test_import_writes_valid_rows(client: TestClient, written):
+    response = post_import(client, MAPPING)
+    assert response.status_code == 200
+    job = response.json()
+    assert job["status"] == "completed"
+    assert job["total_rows"] == 2
+    assert job["valid_rows"] == 1
+    assert job["errors"][0]["row"] == 1 and "latitude" in job["errors"][0]["errors"]
+    assert [(title, address.address_line) for title, address in written] == [
+        ("Offices", "1 Main St")
+    ]
+
+
+def test_same_file_returns_the_first_job(client: TestClient, written):
+    first = post_import(client, MAPPING).json()
+    second = post_import(client, MAPPING, title=b"Renamed").json()
+    assert second["id"] == first["id"]
+    assert len(written) == 1
+
+
+def test_mapping_is_part_of_the_import(client: TestClient):
+    first = post_import(client, MAPPING).json()
+    second = post_import(client, b'{"Address": "address_line", "Country": "country"}').json()
+    assert second["id"] != first["id"]
+
+
+def test_missing_column_is_rejected(client: TestClient):
+    response = post_import(client, b'{"Street": "address_line"}')
+    assert response.status_code == 400
+
+
+def test_malformed_mapping_is_rejected(client: TestClient):
+    response = post_import(client, b"{bad")
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "json_invalid"
+    assert "input" not in response.json()["detail"][0]
+
+
+def test_unknown_mapping_field_is_rejected(client: TestClient):
+    response = post_import(client, b'{"Address": "nowhere"}')
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["type"] == "literal_error"
@@ -0,0 +1,103 @@
+from datetime import timedelta
+from pfman.jobs import InProcessJobQueue
+from pfman.models import CreatePortfolioPayload, RowValidationCache
+from pfman.models.ImportJob import utcnow
+
+PAYLOAD = CreatePortfolioPayload(
+    title="Portfolio",
+    properties=[{"address_line": "1 Main St", "city": "Chicago", "country_code": "US"}],
+)
+
+
+def writer(portfolio_id, title, description):
+    return lambda rows, addresses: len(addresses)
+
+
+def test_invalid_rows_are_reported_by_the_job():
+    written = []
+
+    def writer(portfolio_id, title, description):
+        def write(rows, addresses):
+            written.extend(address for address in addresses if address)
+            return len(addresses)
+
+        return write
+
+    queue = InProcessJobQueue(cache=RowValidationCache(100), writer=writer)
+    payload = CreatePortfolioPayload(
+        title="Portfolio",
+        properties=[
+            {"address_line": "1 Main St", "city": "Chicago", "country_code": "US"},
+            {"address_line": "2 Main St", "latitude": "north"},
+        ],
+    )
+
+    job = queue.submit(payload, background=False)
+
+    assert job.status == "completed"
+    assert (job.valid_rows, job.invalid_rows) == (1, 1)
+    assert job.errors[0].row == 1 and "latitude" in job.errors[0].errors
+    assert len(written) == 1
+
+
+def test_identical_imports_share_a_job():
+    queue = InProcessJobQueue(cache=RowValidationCache(100), writer=writer)
+
+    first = queue.submit(PAYLOAD)
+    second = queue.submit(PAYLOAD)
+
+    assert second.id == first.id
+    # The job of the second submission is not left queued
+    assert list(queue._jobs) == [first.id]
+
+
+def test_waiting_for_an_identical_import_times_out():
+    queue = InProcessJobQueue(cache=RowValidationCache(100), writer=writer, wait_timeout=0)
+
+    # Workers are not started, so the first job stays queued
+    first = queue.submit(PAYLOAD)
+    second = queue.submit(PAYLOAD, background=False)
+
+    assert (second.id, second.status) == (first.id, "queued")
+
+
+def test_abandoned_imports_are_taken_over():
+    queue = InProcessJobQueue(cache=RowValidationCache(100), writer=writer, stale_after=60)
+    first = queue.submit(PAYLOAD)
+    first.status = "running"
+    first.updated_at = utcnow() - timedelta(seconds=61)
+    queue.save(first)
+
+    second = queue.submit(PAYLOAD, background=False)
+
+    assert second.id != first.id
+    assert second.status == "completed"
+    # The portfolio the abandoned job started is written again, not duplicated
+    assert second.portfolio_id == first.portfolio_id
+
+
+def test_failed_imports_are_retried_into_their_portfolio():
+    def failing_writer(portfolio_id, title, description):
+        raise RuntimeError("Graph unavailable")
+
+    queue = InProcessJobQueue(cache=RowValidationCache(100), writer=failing_writer)
+    first = queue.submit(PAYLOAD, background=False)
+    assert first.status == "failed"
+
+    queue.writer = writer
+    second = queue.submit(PAYLOAD, background=False)
+
+    assert second.id != first.id
+    assert (second.status, second.portfolio_id) == ("completed", first.portfolio_id)
+
+
+def test_import_key_leaves_out_title_and_description():
+    queue = InProcessJobQueue(cache=RowValidationCache(100), writer=writer)
+    first = queue.submit(PAYLOAD)
+    renamed = PAYLOAD.model_copy(update={"title": "Renamed", "description": "Again"})
+    reordered = PAYLOAD.model_copy(
+        update={"properties": [dict(reversed(PAYLOAD.properties[0].items()))]}
+    )
+
+    assert queue.submit(renamed).id == first.id
+    assert queue.submit(reordered).id == first.id
@@ -0,0 +1,27 @@
+from pfman.mapping import MappingSuggester
+
+
+def test_cached_suggestion_follows_request_header_order():
+    suggester = MappingSuggester(10)
+    first = suggester.suggest(["Lat", "Lon", "Addr Line 1", "City"])
+    second = suggester.suggest(["Addr Line 1", "City", "Lon", "Lat"])
+
+    assert second.cached
+    assert [column.header for column in second.columns] == ["Addr Line 1", "City", "Lon", "Lat"]
+    assert [column.field for column in second.columns] == [
+        "address_line",
+        "city",
+        "longitude",
+        "latitude",
+    ]
+    assert second.mapping == first.mapping
+
+
+def test_headers_are_normalized_like_the_import():
+    suggester = MappingSuggester(10)
+    first = suggester.suggest(["\ufeffCity", "Country "])
+    second = suggester.suggest(["City", "Country"])
+
+    assert [column.field for column in first.columns] == ["city", "country"]
+    assert second.cached
+    assert second.mapping == {"City": "city", "Country": "country"}
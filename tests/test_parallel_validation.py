@@ -0,0 +1,26 @@
+from pfman.models import RowValidationCache
+from pfman.validation import ParallelRowValidationCache
+
+ROWS = [
+    {"address_line": f"{number} Main St", "city": "Chicago", "country_code": "US"}
+    for number in range(1, 9)
+] + [{"address_line": "9 Main St", "latitude": "north"}]
+
+
+def test_sharded_rows_go_through_the_cache():
+    cache = ParallelRowValidationCache(100, min_rows=2)
+    cache.start(1)
+    assert cache.workers == 1
+    try:
+        first = cache.validate(ROWS)
+        second = cache.validate(ROWS)
+    finally:
+        cache.stop()
+
+    expected = RowValidationCache(0).validate(ROWS)
+    assert first.errors == second.errors == expected.errors
+    assert [a.model_dump() if a else None for a in first.addresses] == [
+        a.model_dump() if a else None for a in expected.addresses
+    ]
+    assert (first.cached_rows, second.cached_rows) == (0, len(ROWS))
+    assert cache.cache.info().hits == len(ROWS)
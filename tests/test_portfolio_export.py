@@ -0,0 +1,135 @@
+import asyncio
+import csv
+import os
+from pathlib import Path
+from uuid import uuid4
+import pytest
+from pfman.graph.Reader import (
+    property_address,
+    read_portfolio_properties,
+    stream_portfolio_addresses,
+)
+from pfman.graph.Writer import PROPERTY_FIELDS, GraphWriter, hierarchy_levels
+from pfman.models import Address, RowValidationCache
+from pfman.models.PortfolioImport import normalize_header
+from pfman.utils.neo4j import get_async_driver, get_driver
+
+DATA = Path(__file__).parent.parent / "data"
+
+MAPPINGS = {
+    "portfolio1.csv": {
+        "Addr Line 1": "address_line",
+        "City": "city",
+        "State": "state_code",
+        "Country": "country_code",
+    },
+    "portfolio3.csv": {
+        "house no.": "house_number",
+        "road": "street",
+        "locality": "city",
+        "county": "county",
+        "state": "state",
+        "country": "country_code",
+        "latitude": "latitude",
+        "longitude": "longitude",
+    },
+}
+
+
+def imported_addresses(name: str) -> list[Address]:
+    with open(DATA / name, newline="", encoding="utf-8-sig") as file:
+        records = list(csv.reader(file))
+    positions = {normalize_header(column): index for index, column in enumerate(records[0])}
+    rows = [
+        {field: record[positions[column]].strip() or None for column, field in MAPPINGS[name].items()}
+        for record in records[1:]
+    ]
+    addresses = [a for a in RowValidationCache(100).validate(rows).addresses if a]
+    assert addresses
+    return addresses
+
+
+def assert_same_address(exported: Address, imported: Address) -> None:
+    for field in Address.model_fields:
+        if field == "id":
+            continue
+        expected = getattr(imported, field)
+        if field == "house_number" and expected is not None:
+            expected = str(expected)
+        assert getattr(exported, field) == expected, field
+
+
+@pytest.mark.parametrize("name", MAPPINGS)
+def test_property_address_round_trips(name: str):
+    """Builds addresses back from what the writer stores for them, as the export does"""
+    for address in imported_addresses(name):
+        fields = {field: getattr(address, field) for field in PROPERTY_FIELDS}
+        if fields["house_number"] is not None:
+            fields["house_number"] = str(fields["house_number"])
+        levels = [
+            {"label": level, "name": values.get("name"), "code": values.get("code")}
+            for level, (_, values) in hierarchy_levels(address).items()
+        ]
+        assert_same_address(property_address(fields, levels), address)
+
+
+requires_neo4j = pytest.mark.skipif(
+    not os.getenv("NEO4J_TEST_CONNECTION_STRING"),
+    reason="NEO4J_TEST_CONNECTION_STRING is not set",
+)
+
+
+def read_back(name: str, read):
+    """Writes the addresses of a data file as a portfolio and reads it back with `read`"""
+    connection_string: str = os.getenv("NEO4J_TEST_CONNECTION_STRING")  # type: ignore
+    addresses = imported_addresses(name)
+    portfolio_id = uuid4().hex
+    driver = get_driver(connection_string)
+    try:
+        write = GraphWriter(driver).portfolio_writer(portfolio_id, "Test", None)
+        write(range(len(addresses)), addresses)
+
+        async def run():
+            async_driver = get_async_driver(connection_string)
+            try:
+                async with async_driver.session() as session:
+                    return await read(session, portfolio_id)
+            finally:
+                await async_driver.close()
+
+        return portfolio_id, addresses, asyncio.run(run())
+    finally:
+        with driver.session() as session:
+            session.run(
+                "MATCH (p:Portfolio {portfolio_id: $portfolio_id}) "
+                "OPTIONAL MATCH (p)-[:INCLUDES]->(n:Property) DETACH DELETE p, n",
+                portfolio_id=portfolio_id,
+            ).consume()
+        driver.close()
+
+
+@requires_neo4j
+@pytest.mark.parametrize("name", MAPPINGS)
+def test_export_round_trips(name: str):
+    async def export(session, portfolio_id):
+        return [a async for a in stream_portfolio_addresses(session, portfolio_id)]
+
+    portfolio_id, addresses, exported = read_back(name, export)
+    assert len(exported) == len(addresses)
+    for row, (address, imported) in enumerate(zip(exported, addresses)):
+        assert address.id == f"{portfolio_id}:{row}"
+        assert_same_address(address, imported)
+
+
+@requires_neo4j
+@pytest.mark.parametrize("name", MAPPINGS)
+def test_property_pages_read_hierarchy_fields(name: str):
+    fields = ("property_id", "street", "city", "state", "country")
+
+    async def read(session, portfolio_id):
+        return await read_portfolio_properties(session, portfolio_id, None, 100, fields)
+
+    _, addresses, (_, items) = read_back(name, read)
+    assert [{field: item[field] for field in fields[1:]} for item in items] == [
+        {field: getattr(address, field) for field in fields[1:]} for address in addresses
+    ]
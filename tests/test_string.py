@@ -0,0 +1,24 @@
+import pytest
+from pfman.utils.string import is_int, parse_float, parse_percentage
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [(" 40.5 ", 40.5), ("40.5\x1c", 40.5), ("1_000", 1000.0), ("4O.5", None), ("", None)],
+)
+def test_parse_float(value, expected):
+    assert parse_float(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value, expected", [("5%", 0.05), (" 5% ", 0.05), ("5\x1c%", None), ("5", None)]
+)
+def test_parse_percentage(value, expected):
+    assert parse_percentage(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value, expected", [(" 12 ", True), (" 1 ", True), ("0\x1c", False), ("1.0", False)]
+)
+def test_is_int_matches_int(value, expected):
+    assert is_int(value) is expected
@@ -0,0 +1,53 @@
+from pfman.models import RowValidationCache, ValidationReport
+from pfman.utils.row_sets import decode_bitmap, decode_runs
+
+
+def invalid_rows(report: ValidationReport, field: str) -> dict[str, list[int]]:
+    return {
+        report.messages[errors.message]: (
+            decode_runs(errors.runs)
+            if errors.runs is not None
+            else decode_bitmap(errors.bitmap or "")
+        )
+        for errors in report.columns[field]
+    }
+
+
+def test_consecutive_rows_are_encoded_as_runs():
+    errors = {row: {"latitude": "Bad latitude"} for row in [2, 3, 4, 9]}
+    report = ValidationReport.from_errors(100, errors)
+
+    assert report.invalid_rows == 4
+    assert report.messages == ["Bad latitude"]
+    assert report.columns["latitude"][0].runs == [2, 3, 9, 1]
+    assert report.columns["latitude"][0].bitmap is None
+
+
+def test_scattered_rows_are_encoded_as_a_bitmap():
+    rows = list(range(0, 1000, 2))
+    report = ValidationReport.from_errors(1000, {row: {"city": "Bad city"} for row in rows})
+
+    assert report.columns["city"][0].runs is None
+    assert invalid_rows(report, "city") == {"Bad city": rows}
+
+
+def test_messages_are_listed_once_per_column_and_message():
+    errors = {
+        0: {"latitude": "Bad coordinate", "longitude": "Bad coordinate"},
+        1: {"latitude": "Out of range"},
+        5: {"latitude": "Bad coordinate"},
+    }
+    report = ValidationReport.from_errors(6, errors)
+
+    assert report.messages == ["Bad coordinate", "Out of range"]
+    assert invalid_rows(report, "latitude") == {"Bad coordinate": [0, 5], "Out of range": [1]}
+    assert invalid_rows(report, "longitude") == {"Bad coordinate": [0]}
+
+
+def test_from_rows_offsets_the_rows_of_each_chunk():
+    rows = [{"address_line": f"{n} Main St", "country_code": "US"} for n in range(1, 6)]
+    rows[3]["latitude"] = "north"
+    report = ValidationReport.from_rows(rows, RowValidationCache(100), chunk_size=2)
+
+    assert (report.rows, report.invalid_rows) == (5, 1)
+    assert list(invalid_rows(report, "latitude").values()) == [[3]]